@@ -1,10 +1,17 @@
-import os
-from openai import OpenAI
 from dotenv import load_dotenv
 import traceback
 
+from utils.brief_cache import get_brief_cache, make_brief_cache_key, normalize_language
+from utils.llm_client import chat_completion
+from utils.rate_limiter import PRIORITY_INTERACTIVE
+from utils.token_budget import BRIEF_COMPLETION_TOKENS, estimate_usage
+
 load_dotenv()
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+
+BRIEF_MODEL = "gpt-3.5-turbo"
+BRIEF_TEMPERATURE = 0.4
+# Bump whenever SYSTEM_PROMPT_TEMPLATE changes so cached briefs are regenerated
+PROMPT_VERSION = 1
 
 SYSTEM_PROMPT_TEMPLATE = """
 You are a creative brief writer. Based on the following input, return a structured brief **in {language}**.
@@ -17,18 +24,89 @@ Include:
 - KPIs
 """
 
-def generate_brief(user_text: str, language: str = "English") -> str:
+def build_brief_messages(user_text: str, language: str = "English"):
+    system_prompt = SYSTEM_PROMPT_TEMPLATE.format(language=language)
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": user_text}
+    ]
+
+def estimate_brief_usage(user_text: str, language: str = "English"):
+    """
+    Estimated prompt and completion tokens for a brief request
+    """
+    language = normalize_language(language)
+    return estimate_usage(build_brief_messages(user_text, language), BRIEF_COMPLETION_TOKENS, BRIEF_MODEL)
+
+def stream_brief(user_text: str, language: str = "English", use_cache: bool = True):
+    """
+    Yield the brief in pieces as the model produces them.
+    A cached brief is yielded in one piece; errors are raised to the caller.
+    Closing the generator early closes the model's stream.
+    """
+    # One canonical language for both the cache key and the prompt
+    language = normalize_language(language)
+    brief_cache = get_brief_cache()
+    cache_key = None
+    if brief_cache is not None:
+        cache_key = make_brief_cache_key(user_text, language, BRIEF_MODEL, BRIEF_TEMPERATURE, PROMPT_VERSION)
+        cached_brief = brief_cache.get(cache_key) if use_cache else None
+        if cached_brief is not None:
+            yield cached_brief
+            return
+
+    stream = chat_completion(
+        model=BRIEF_MODEL,
+        messages=build_brief_messages(user_text, language),
+        temperature=BRIEF_TEMPERATURE,
+        stream=True,
+        priority=PRIORITY_INTERACTIVE,
+        completion_tokens=BRIEF_COMPLETION_TOKENS
+    )
+
+    pieces = []
     try:
-        system_prompt = SYSTEM_PROMPT_TEMPLATE.format(language=language)
-        response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_text}
-            ],
-            temperature=0.4
+        for chunk in stream:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if delta:
+                pieces.append(delta)
+                yield delta
+    finally:
+        # Also runs when the caller stops early, releasing the connection
+        stream.close()
+
+    if brief_cache is not None:
+        brief = "".join(pieces).strip()
+        if brief:
+            brief_cache.set(cache_key, brief)
+
+def generate_brief(user_text: str, language: str = "English", use_cache: bool = True) -> str:
+    try:
+        # One canonical language for both the cache key and the prompt
+        language = normalize_language(language)
+        # use_cache=False skips the lookup but still refreshes the stored brief
+        brief_cache = get_brief_cache()
+        cache_key = None
+        if brief_cache is not None:
+            cache_key = make_brief_cache_key(user_text, language, BRIEF_MODEL, BRIEF_TEMPERATURE, PROMPT_VERSION)
+            cached_brief = brief_cache.get(cache_key) if use_cache else None
+            if cached_brief is not None:
+                return cached_brief
+
+        response = chat_completion(
+            model=BRIEF_MODEL,
+            messages=build_brief_messages(user_text, language),
+            temperature=BRIEF_TEMPERATURE,
+            priority=PRIORITY_INTERACTIVE,
+            completion_tokens=BRIEF_COMPLETION_TOKENS
         )
-        return response.choices[0].message.content.strip()
+        brief = response.choices[0].message.content.strip()
+
+        if brief_cache is not None:
+            brief_cache.set(cache_key, brief)
+        return brief
     except Exception as e:
         traceback.print_exc()
         return f"Error generating brief: {str(e)}"
@@ -5,15 +5,17 @@ import json
 import uuid
 from dataclasses import dataclass, asdict
 
-import os
-from openai import OpenAI
 from dotenv import load_dotenv
 
+from utils.llm_client import chat_completion
+from utils.token_budget import SCHEDULER_COMPLETION_TOKENS, estimate_usage
+
 load_dotenv()
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
 logger = logging.getLogger(__name__)
 
+SCHEDULER_MODEL = "gpt-3.5-turbo"
+
 @dataclass
 class TeamMember:
     name: str
@@ -52,9 +54,9 @@ class MeetingSchedulerAgent:
     def __init__(self):
         self.mock_teams_domain = "https://teams.microsoft.com/l/meetup-join/"
     
-    def schedule_meetings_fast(self, brief_content: str, team_members: List[TeamMember]):
+    def build_prompt(self, brief_content: str, team_members: List[TeamMember]) -> str:
         """
-        Schedule meetings based off brief
+        Build the scheduler prompt for a brief and team
         """
         # Create team summary for AI
         team_summary = []
@@ -113,13 +115,27 @@ class MeetingSchedulerAgent:
         - Prioritize items that unblock other work
         - Consider content creation, approvals, and logistics
         """
+        return prompt
+
+    def estimate_usage(self, brief_content: str, team_members: List[TeamMember]):
+        """
+        Estimated prompt and completion tokens for a scheduling request
+        """
+        messages = [{"role": "system", "content": self.build_prompt(brief_content, team_members)}]
+        return estimate_usage(messages, SCHEDULER_COMPLETION_TOKENS, SCHEDULER_MODEL)
+
+    def schedule_meetings_fast(self, brief_content: str, team_members: List[TeamMember]):
+        """
+        Schedule meetings based off brief
+        """
+        prompt = self.build_prompt(brief_content, team_members)
         
         try:
-            response = client.chat.completions.create(
-                model="gpt-3.5-turbo",
+            response = chat_completion(
+                model=SCHEDULER_MODEL,
                 messages=[{"role": "system", "content": prompt}],
                 temperature=0.3,
-                max_tokens=1500  # Increased for full response
+                max_tokens=SCHEDULER_COMPLETION_TOKENS
             )
             
             # Parse response
@@ -173,10 +189,14 @@ class MeetingSchedulerAgent:
             return meetings, actions
             
         except Exception as e:
-            logging.error(f"Error in optimized scheduler: {e}")
-            fallback_meetings = self._create_fallback_meeting(team_members[:3], brief_content)
-            fallback_actions = []
-            return fallback_meetings, fallback_actions
+            logging.error(f"Error in optimized scheduler, using the fallback kickoff meeting: {e}")
+            return self.fallback_schedule(brief_content, team_members)
+
+    def fallback_schedule(self, brief_content: str, team_members: List[TeamMember]):
+        """Kickoff meeting with the first few team members and no actions"""
+        fallback_meetings = self._create_fallback_meeting(team_members[:3], brief_content)
+        fallback_actions = []
+        return fallback_meetings, fallback_actions
 
     
     def _calculate_time_fast(self, timing: str, priority: str) -> str:
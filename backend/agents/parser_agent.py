@@ -1,99 +1,88 @@
-import filetype
+import asyncio
 import logging
-from utils.file_loader import load_audio, load_pdf, load_image, load_text, load_csv, load_excel, load_video, normalize_text
+import os
+import time
+from utils.text import normalize_text
+from utils.executor import run_cpu, run_io, get_cpu_pool
+from utils.loader_registry import detect_loader, resolve_loader
+from utils.parse_cache import get_parse_cache
+from utils.uploads import read_upload
 
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-async def parse_file(uploaded_file):
+# How many files of one request are parsed at once, and how many parses run across all requests
+PARSE_FANOUT_PER_REQUEST = int(os.getenv("PARSE_FANOUT_PER_REQUEST", 4))
+PARSE_GLOBAL_CONCURRENCY = int(os.getenv("PARSE_GLOBAL_CONCURRENCY", 16))
+
+_global_parse_semaphore = asyncio.Semaphore(PARSE_GLOBAL_CONCURRENCY)
+
+async def run_fanout(loader, file_bytes):
+    """
+    Coordinate a loader from an I/O thread while its CPU-bound parts (PDF
+    page shards, OCR of PDF pages and video frames) run in the process pool
+    """
+    return await run_io(loader, file_bytes, executor=get_cpu_pool())
+
+# Executors named by the "pool" of each registered loader
+RUNNERS = {
+    "cpu": run_cpu,
+    "io": run_io,
+    "fanout": run_fanout,
+}
+
+async def parse_file(uploaded_file, max_bytes=None):
     """
-    Main parser agent that routes different file types to appropriate loaders
+    Main parser agent that routes different file types to appropriate loaders.
+    CPU-bound loaders run in the process pool, media loaders (ffmpeg + Whisper)
+    run in the I/O thread pool so the event loop stays responsive.
+    Uploads over max_bytes raise HTTPException(413) instead of returning an
+    error result; None accepts any size.
     """
+    # Read file bytes in chunks, stopping at the size limit
+    file_bytes = await read_upload(uploaded_file, max_bytes)
+
     try:
-        # Read file bytes
-        file_bytes = await uploaded_file.read()
         filename = uploaded_file.filename.lower()
         
         logger.info(f"Processing file: {filename}")
         
-        # Detect file type and route to appropriate loader
-        if filename.endswith('.pdf'):
-            logger.info("Detected PDF file")
-            raw_text = load_pdf(file_bytes)
-            
-        elif filename.endswith(('.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tiff')):
-            logger.info("Detected image file")
-            raw_text = load_image(file_bytes)
-            
-        elif filename.endswith(('.txt', '.md', '.rtf')):
-            logger.info("Detected text file")
-            raw_text = load_text(file_bytes)
+        # Detect file type from content first, then route to the registered loader
+        spec, mime = detect_loader(filename, file_bytes)
+        if spec is None:
+            return {
+                "success": False,
+                "error": f"Unsupported file type: {mime}" if mime else "Unknown file type",
+                "content": None
+            }
+        logger.info(f"Detected {spec.file_type} file" + (f" by MIME type: {mime}" if mime else ""))
+        loader, loader_version = resolve_loader(spec)
+        runner = RUNNERS[spec.pool]
         
-        elif filename.endswith('.csv'):
-            logger.info("Detected CSV file")
-            raw_text = load_csv(file_bytes)
-            
-        elif filename.endswith(('.xlsx', '.xls')):
-            logger.info("Detected Excel file")
-            raw_text = load_excel(file_bytes)
-
-        elif filename.endswith(('.mp4', '.avi', '.mov', '.mkv', '.webm', '.flv', '.wmv')):
-            logger.info("Detected video file")
-            raw_text = load_video(file_bytes)
+        # Re-uploads of identical content skip extraction entirely
+        parse_cache = get_parse_cache()
+        cache_key = None
+        raw_text = None
+        if parse_cache is not None:
+            # Hashing a large upload takes a while, so it runs in the thread pool with the lookup
+            cache_key, raw_text = await run_io(parse_cache.lookup, file_bytes, loader.__name__, loader_version)
 
-        elif filename.endswith(('.m4a', '.mp3', '.wav', '.aac', '.flac', '.ogg')):
-            logger.info("Detected audio file")
-            raw_text = load_audio(file_bytes)
-            
+        if raw_text is not None:
+            logger.info(f"Parse cache hit for {filename}")
         else:
-            # Fall back to filetype detection if extension doesn't match
-            kind = filetype.guess(file_bytes)
-            
-            if kind is None:
-                return {
-                    "success": False,
-                    "error": "Unknown file type",
-                    "content": None
-                }
-            
-            if kind.mime.startswith('image/'):
-                logger.info(f"Detected image file by MIME type: {kind.mime}")
-                raw_text = load_image(file_bytes)
-            elif kind.mime == 'application/pdf':
-                logger.info("Detected PDF file by MIME type")
-                raw_text = load_pdf(file_bytes)
-            elif kind.mime.startswith('text/'):
-                logger.info(f"Detected text file by MIME type: {kind.mime}")
-                raw_text = load_text(file_bytes)
-            elif kind.mime in ['application/vnd.ms-excel', 
-                              'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet']:
-                logger.info(f"Detected spreadsheet by MIME type: {kind.mime}")
-                raw_text = load_excel(file_bytes)
-            elif kind.mime == 'text/csv':
-                logger.info("Detected CSV by MIME type")
-                raw_text = load_csv(file_bytes)
-            elif kind.mime.startswith('video/'):
-                logger.info(f"Detected video file by MIME type: {kind.mime}")
-                raw_text = load_video(file_bytes)
-            elif kind.mime.startswith('audio/'):
-                logger.info(f"Detected audio file by MIME type: {kind.mime}")
-                raw_text = load_audio(file_bytes)
-            else:
-                return {
-                    "success": False,
-                    "error": f"Unsupported file type: {kind.mime}",
-                    "content": None
-                }
-        
+            raw_text = await runner(loader, file_bytes)
+            if parse_cache is not None and raw_text and not raw_text.startswith("Error"):
+                await run_io(parse_cache.set, cache_key, raw_text)
+
         # Normalize the extracted text
         normalized_text = normalize_text(raw_text)
         
         if not normalized_text or normalized_text.startswith("Error"):
             return {
                 "success": False,
-                "error": raw_text if raw_text.startswith("Error") else "No content extracted",
+                "error": raw_text if raw_text and raw_text.startswith("Error") else "No content extracted",
                 "content": None
             }
         
@@ -101,7 +90,7 @@ async def parse_file(uploaded_file):
             "success": True,
             "error": None,
             "content": normalized_text,
-            "file_type": get_file_type(filename),
+            "file_type": spec.file_type,
             "filename": uploaded_file.filename
         }
         
@@ -113,28 +102,22 @@ async def parse_file(uploaded_file):
             "content": None
         }
 
-def get_file_type(filename):
+async def parse_files(uploaded_files):
     """
-    Helper function to determine file type category
+    Parse several uploaded files concurrently.
+    Results come back in upload order, each with the time spent parsing it.
     """
-    filename = filename.lower()
-    
-    if filename.endswith('.pdf'):
-        return "pdf"
-    elif filename.endswith(('.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tiff')):
-        return "image"
-    elif filename.endswith(('.txt', '.md', '.rtf')):
-        return "text"
-    elif filename.endswith('.csv'):
-        return "csv"
-    elif filename.endswith(('.xlsx', '.xls')):
-        return "excel"
-    elif filename.endswith(('.mp4', '.avi', '.mov', '.mkv', '.webm', '.flv', '.wmv')):
-        return "video"
-    elif filename.endswith(('.m4a', '.mp3', '.wav', '.aac', '.flac', '.ogg')):
-        return "audio"
-    else:
-        return "unknown"
+    request_semaphore = asyncio.Semaphore(PARSE_FANOUT_PER_REQUEST)
+
+    async def parse_one(uploaded_file):
+        async with request_semaphore, _global_parse_semaphore:
+            start = time.perf_counter()
+            result = await parse_file(uploaded_file)
+            result["parse_seconds"] = round(time.perf_counter() - start, 3)
+        logger.info(f"Parsed {uploaded_file.filename} in {result['parse_seconds']}s")
+        return result
+
+    return await asyncio.gather(*(parse_one(f) for f in uploaded_files))
 
 # Test function for development
 async def test_parser():
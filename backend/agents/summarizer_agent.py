@@ -0,0 +1,157 @@
+import asyncio
+import json
+import logging
+import os
+from dotenv import load_dotenv
+
+from utils.brief_cache import get_brief_cache, make_brief_cache_key
+from utils.executor import run_io
+from utils.llm_client import chat_completion
+from utils.rate_limiter import PRIORITY_BATCH
+from utils.token_budget import count_tokens, fit_to_budget
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_MODEL = "gpt-3.5-turbo"
+# Inputs above this size are condensed before they reach the briefer
+BRIEF_INPUT_TOKEN_LIMIT = int(os.getenv("BRIEF_INPUT_TOKEN_LIMIT", 3000))
+SUMMARY_CHUNK_TOKENS = int(os.getenv("SUMMARY_CHUNK_TOKENS", 2500))
+SUMMARY_MAX_TOKENS = int(os.getenv("SUMMARY_MAX_TOKENS", 400))
+SUMMARY_MAX_CONCURRENCY = int(os.getenv("SUMMARY_MAX_CONCURRENCY", 4))
+SUMMARY_MAX_ROUNDS = 3
+SUMMARY_TEMPERATURE = 0.2
+# Bump whenever SUMMARY_PROMPT or the condensing steps change so cached inputs are rebuilt
+SUMMARY_PROMPT_VERSION = 1
+
+SUMMARY_PROMPT = """
+You are preparing source material for a creative brief writer.
+Summarize part {index} of {total} of the input below in {language}.
+Keep product names, audiences, goals, dates, budgets and every number that matters.
+Drop boilerplate, repeated table rows and formatting noise. Use short bullet points.
+"""
+
+
+def split_into_chunks(text: str, max_tokens: int = SUMMARY_CHUNK_TOKENS):
+    """
+    Pack whole lines into chunks of at most max_tokens, splitting lines
+    that are too long on their own
+    """
+    # Conservative for non-English text, where a token covers fewer characters
+    max_chars = max_tokens * 2
+    chunks = []
+    current = []
+    current_tokens = 0
+
+    for line in text.split("\n"):
+        pieces = [line[i:i + max_chars] for i in range(0, len(line), max_chars)] or [""]
+        for piece in pieces:
+            piece_tokens = count_tokens(piece, SUMMARY_MODEL)
+            if current and current_tokens + piece_tokens > max_tokens:
+                chunks.append("\n".join(current))
+                current = []
+                current_tokens = 0
+            current.append(piece)
+            current_tokens += piece_tokens
+
+    if current:
+        chunks.append("\n".join(current))
+    return [chunk for chunk in chunks if chunk.strip()]
+
+
+def summarize_chunk(chunk: str, index: int, total: int, language: str = "English") -> str:
+    """
+    Summarize one chunk. Falls back to the head of the chunk if the call fails.
+    """
+    try:
+        response = chat_completion(
+            model=SUMMARY_MODEL,
+            messages=[
+                {"role": "system", "content": SUMMARY_PROMPT.format(index=index, total=total, language=language)},
+                {"role": "user", "content": chunk}
+            ],
+            temperature=SUMMARY_TEMPERATURE,
+            max_tokens=SUMMARY_MAX_TOKENS,
+            # Condensing large uploads is bulk work; briefs go first
+            priority=PRIORITY_BATCH
+        )
+        return response.choices[0].message.content.strip()
+    except Exception as e:
+        logger.error(f"Error summarizing chunk {index}/{total}: {e}")
+        return chunk[:SUMMARY_MAX_TOKENS * 2]
+
+
+async def condense_for_brief(text: str, language: str = "English", token_limit: int = BRIEF_INPUT_TOKEN_LIMIT) -> str:
+    """
+    Map-reduce long inputs down to token_limit: summarize chunks concurrently
+    (at most SUMMARY_MAX_CONCURRENCY at a time), join the summaries in order
+    and repeat while the result is still too long. Short inputs pass through.
+    """
+    semaphore = asyncio.Semaphore(SUMMARY_MAX_CONCURRENCY)
+
+    async def summarize(chunk, index, total):
+        async with semaphore:
+            return await run_io(summarize_chunk, chunk, index, total, language)
+
+    for round_number in range(1, SUMMARY_MAX_ROUNDS + 1):
+        if await run_io(count_tokens, text, SUMMARY_MODEL) <= token_limit:
+            return text
+
+        chunks = await run_io(split_into_chunks, text)
+        logger.info(f"Condensing input: round {round_number}, {len(chunks)} chunks")
+        summaries = await asyncio.gather(*(
+            summarize(chunk, i + 1, len(chunks)) for i, chunk in enumerate(chunks)
+        ))
+        text = "\n\n".join(summaries)
+
+    # Still too long after the last round, keep what fits
+    return text[:token_limit * 2]
+
+
+def make_condensed_input_key(text: str, language: str, token_limit: int) -> str:
+    """
+    Key the condensed brief input by the raw text it was built from
+    """
+    return make_brief_cache_key(
+        text, language, SUMMARY_MODEL, SUMMARY_TEMPERATURE, f"condense-{SUMMARY_PROMPT_VERSION}-{token_limit}"
+    )
+
+
+def lookup_condensed_input(brief_cache, text: str, language: str, token_limit: int):
+    """
+    Hash the raw text and read the cache in one call, so both run off the event loop.
+    Returns (key, cached_entry) with cached_entry None on a miss.
+    """
+    key = make_condensed_input_key(text, language, token_limit)
+    return key, brief_cache.get(key)
+
+
+async def prepare_brief_input(text: str, language: str = "English", token_limit: int = BRIEF_INPUT_TOKEN_LIMIT,
+                              use_cache: bool = True):
+    """
+    Fit combined file text into the brief's input budget: trim low-value
+    sections such as sample tables first, then summarize whatever is still
+    too long. Returns the text and a token report. Tokenizing megabytes of
+    text takes a while, so it runs in the thread pool.
+
+    Summaries are sampled, so condensing the same upload twice gives a
+    different brief input and misses the brief cache. Condensed inputs are
+    therefore cached by the raw text; use_cache=False rebuilds and refreshes them.
+    """
+    brief_cache = get_brief_cache()
+    cache_key = None
+    if brief_cache is not None:
+        cache_key, cached = await run_io(lookup_condensed_input, brief_cache, text, language, token_limit)
+        if cached is not None and use_cache:
+            entry = json.loads(cached)
+            return entry["text"], entry["report"]
+
+    trimmed, report = await run_io(fit_to_budget, text, token_limit, SUMMARY_MODEL)
+    report["condensed"] = report["tokens_after"] > token_limit
+    if report["condensed"]:
+        trimmed = await condense_for_brief(trimmed, language, token_limit)
+        report["tokens_after"] = await run_io(count_tokens, trimmed, SUMMARY_MODEL)
+        if brief_cache is not None:
+            await run_io(brief_cache.set, cache_key, json.dumps({"text": trimmed, "report": report}))
+    return trimmed, report
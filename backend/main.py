@@ -1,15 +1,30 @@
 from fastapi import FastAPI, File, UploadFile, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 
+import asyncio
+import json
 import logging
 from dotenv import load_dotenv
 import os
-from fastapi.responses import FileResponse
+from fastapi.responses import Response, StreamingResponse
 from fastapi import Form
 
-from agents.parser_agent import parse_file
-from agents.briefer_agent import generate_brief
-from utils.pdf_generator import generate_pdf
+from agents.parser_agent import parse_file, parse_files
+from agents.briefer_agent import generate_brief, stream_brief, estimate_brief_usage
+from agents.summarizer_agent import prepare_brief_input
+from utils.pdf_generator import render_pdf
+from utils.artifact_store import get_artifact_store, ARTIFACT_TTL_SECONDS
+from utils.executor import run_io, iterate_in_thread, shutdown_pools
+from utils.pipeline import Stage, run_stages
+from utils.uploads import MAX_FILE_SIZE, UploadSizeLimitMiddleware, single_file_limit
+from utils.parse_cache import get_parse_cache
+from utils.llm_client import close_clients
+from utils.rate_limiter import get_rate_limiter
+from utils.loader_registry import PREWARM_LOADERS, prewarm_loaders
+from utils.transcription import TRANSCRIPTION_BACKEND, get_transcriber
+from utils.transcription_store import get_transcription_store
+from utils.brief_cache import get_brief_cache
+from utils.token_budget import preload_encodings
 
 from agents.meeting_scheduler_agent import MeetingSchedulerAgent, TeamMember, actions_to_dict, meetings_to_dict
 from mock_team_data import INFOSYS_TEAM, get_team_data_json
@@ -20,8 +35,21 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+PDF_FILENAME = "brief_output.pdf"
+
+# Per-stage timeouts (seconds) for the steps that run after the brief is written
+PDF_STAGE_TIMEOUT = float(os.getenv("PDF_STAGE_TIMEOUT", 30))
+SCHEDULE_STAGE_TIMEOUT = float(os.getenv("SCHEDULE_STAGE_TIMEOUT", 90))
+
 app = FastAPI(title="Creative Brief Generator API", version="1.0.0")
 
+# Single-file endpoints get the per-file limit, everything else the request limit.
+# Added before CORS so CORS wraps it and 413 responses still carry CORS headers.
+app.add_middleware(
+    UploadSizeLimitMiddleware,
+    limits={"/parse": single_file_limit(), "/brief": single_file_limit()},
+)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["http://localhost:3000"],
@@ -30,6 +58,62 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.on_event("startup")
+async def start_artifact_cleanup():
+    async def cleanup_loop():
+        while True:
+            await asyncio.sleep(max(60, ARTIFACT_TTL_SECONDS // 4))
+            try:
+                await run_io(get_artifact_store().cleanup)
+            except Exception as e:
+                logger.warning(f"Artifact cleanup failed: {e}")
+
+    app.state.artifact_cleanup = asyncio.create_task(cleanup_loop())
+
+@app.on_event("startup")
+async def warm_transcriber():
+    if TRANSCRIPTION_BACKEND != "local":
+        return
+
+    # Load the local model in the background so the first upload does not wait for it
+    async def load_model():
+        try:
+            await run_io(get_transcriber)
+        except Exception as e:
+            logger.error(f"Could not load local transcription model: {e}")
+
+    app.state.transcriber_warmup = asyncio.create_task(load_model())
+
+@app.on_event("startup")
+async def warm_loaders():
+    if not PREWARM_LOADERS:
+        return
+
+    # Parsing libraries load lazily; import them now, off the event loop, so startup is not delayed
+    app.state.loader_warmup = asyncio.create_task(run_io(prewarm_loaders))
+
+@app.on_event("startup")
+async def warm_tokenizer():
+    # The first tokenizer load can download its encoding file; do it now, off the event loop.
+    # Until it finishes, token counts fall back to estimates instead of waiting.
+    app.state.tokenizer_warmup = asyncio.create_task(run_io(preload_encodings))
+
+@app.on_event("shutdown")
+async def shutdown_executors():
+    app.state.artifact_cleanup.cancel()
+    shutdown_pools()
+    await close_clients()
+
+def pdf_response(pdf_bytes: bytes, filename: str = PDF_FILENAME, media_type: str = "application/pdf") -> Response:
+    """
+    Serve PDF bytes straight from memory as a download
+    """
+    return Response(
+        content=pdf_bytes,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
 @app.get("/")
 async def root():
     return {"message": "Creative Brief Generator API is running!"}
@@ -40,18 +124,8 @@ async def parse_uploaded_file(file: UploadFile = File(...)):
     Parse uploaded file and extract text content
     """
     try:
-        MAX_FILE_SIZE = 15 * 1024 * 1024  # 10MB
-        
-        file_size = 0
-        file_content = await file.read()
-        file_size = len(file_content)
-        
-        if file_size > MAX_FILE_SIZE:
-            raise HTTPException(status_code=413, detail="File too large")
-        
-        await file.seek(0)
-        
-        result = await parse_file(file)
+        # Size limits are enforced while the body streams in (see UploadSizeLimitMiddleware)
+        result = await parse_file(file, max_bytes=MAX_FILE_SIZE)
         
         if not result["success"]:
             raise HTTPException(status_code=400, detail=result["error"])
@@ -71,20 +145,17 @@ async def parse_uploaded_file(file: UploadFile = File(...)):
         raise HTTPException(status_code=500, detail="Internal server error")
 
 @app.post("/brief")
-async def create_brief(file: UploadFile = File(...)):
+async def create_brief(file: UploadFile = File(...), bypass_cache: bool = Form(False)):
     try:
-        parse_result = await parse_file(file)
+        parse_result = await parse_file(file, max_bytes=MAX_FILE_SIZE)
         if not parse_result["success"]:
             raise HTTPException(status_code=400, detail=parse_result["error"])
 
-        brief_result = generate_brief(parse_result["content"])
-        pdf_path = generate_pdf(brief_result, "brief_output.pdf")
+        brief_input, _ = await prepare_brief_input(parse_result["content"], use_cache=not bypass_cache)
+        brief_result = await run_io(generate_brief, brief_input, use_cache=not bypass_cache)
+        pdf_bytes = await run_io(render_pdf, brief_result)
 
-        return FileResponse(
-            path=pdf_path,
-            filename="brief_output.pdf",
-            media_type="application/pdf"
-        )
+        return pdf_response(pdf_bytes)
     except HTTPException:
         raise
     except Exception as e:
@@ -94,82 +165,203 @@ async def create_brief(file: UploadFile = File(...)):
 # Initialize the meeting scheduler
 meeting_scheduler = MeetingSchedulerAgent()
 
+async def combine_uploaded_files(files: List[UploadFile]):
+    """
+    Parse all uploads and join their text in upload order.
+    Returns the combined text and per-file parse timings.
+    """
+    combined_text = ""
+    file_timings = []
+
+    parsed_files = await parse_files(files)
+    for file, parsed in zip(files, parsed_files):
+        if not parsed["success"]:
+            raise HTTPException(400, parsed["error"])
+        combined_text += f"\n--- File: {file.filename} ---\n{parsed['content']}\n"
+        file_timings.append({
+            "filename": file.filename,
+            "file_type": parsed["file_type"],
+            "parse_seconds": parsed["parse_seconds"]
+        })
+
+    return combined_text, file_timings
+
+def build_team_members(custom_team: Optional[List[dict]]) -> List[TeamMember]:
+    """
+    Use the custom team if one was sent, otherwise the default roster
+    """
+    return INFOSYS_TEAM if not custom_team else [
+        TeamMember(
+            name=member["name"],
+            email=member["email"], 
+            role=member["role"],
+            department=member.get("department", "Unknown"),
+            specialties=member.get("specialties", [])
+        )
+        for member in custom_team
+    ]
+
+def post_brief_stages(team_members: List[TeamMember]) -> List[Stage]:
+    """
+    Stages that only need the brief, so they run in parallel:
+    PDF rendering and meeting scheduling
+    """
+    async def store_pdf(results):
+        pdf_bytes = await run_io(render_pdf, results["brief"])
+        # The download ID is unique per request, identical PDFs share one stored blob
+        return await run_io(get_artifact_store().put, pdf_bytes, PDF_FILENAME, "application/pdf")
+
+    async def schedule(results):
+        return await run_io(meeting_scheduler.schedule_meetings_fast, results["brief"], team_members)
+
+    return [
+        Stage("pdf", store_pdf, depends_on=["brief"], timeout=PDF_STAGE_TIMEOUT,
+              fallback=lambda results, error: None),
+        Stage("schedule", schedule, depends_on=["brief"], timeout=SCHEDULE_STAGE_TIMEOUT,
+              fallback=lambda results, error: meeting_scheduler.fallback_schedule(results["brief"], team_members)),
+    ]
+
+def build_token_usage(input_report: dict, brief_input: str, language: str, brief: str, team_members: List[TeamMember]) -> dict:
+    """
+    Token report for one request: input trimming plus estimates for both agents
+    """
+    token_usage = {
+        "input": input_report,
+        "brief": estimate_brief_usage(brief_input, language),
+        "scheduler": meeting_scheduler.estimate_usage(brief, team_members)
+    }
+    logger.info(
+        f"Token usage: input {input_report['tokens_before']} -> {input_report['tokens_after']}, "
+        f"brief prompt {token_usage['brief']['prompt_tokens']}, "
+        f"scheduler prompt {token_usage['scheduler']['prompt_tokens']}"
+    )
+    return token_usage
+
 @app.post("/brief-with-meetings")
 async def create_brief_with_meetings(
     files: List[UploadFile] = File(...), 
     language: str = Form("English"),
+    bypass_cache: bool = Form(False),
     custom_team: Optional[List[dict]] = None
 ):
     """
     Enhanced endpoint that generates both brief and meeting schedule
     """
     try:
-        combined_text = ""
-
-        for file in files:
-            parsed = await parse_file(file)
-            if not parsed["success"]:
-                raise HTTPException(400, parsed["error"])
-            combined_text += f"\n--- File: {file.filename} ---\n{parsed['content']}\n"
-            print(combined_text)
-
-        if len(combined_text) > 12000:
-            raise HTTPException(400, "Combined input too long for OpenAI.")
-        brief = generate_brief(combined_text, language)
-
-        pdf_path = generate_pdf(brief)
-
-        team_members = INFOSYS_TEAM if not custom_team else [
-            TeamMember(
-                name=member["name"],
-                email=member["email"], 
-                role=member["role"],
-                department=member.get("department", "Unknown"),
-                specialties=member.get("specialties", [])
-            )
-            for member in custom_team
-        ]
-
-        meetings, actions = meeting_scheduler.schedule_meetings_fast(brief, team_members)
+        combined_text, file_timings = await combine_uploaded_files(files)
+        brief_input, input_report = await prepare_brief_input(combined_text, language, use_cache=not bypass_cache)
+
+        team_members = build_team_members(custom_team)
+
+        async def write_brief(results):
+            return await run_io(generate_brief, brief_input, language, use_cache=not bypass_cache)
+
+        results, stage_timings = await run_stages(
+            [Stage("brief", write_brief)] + post_brief_stages(team_members)
+        )
+        brief = results["brief"]
+        download_id = results["pdf"]
+        meetings, actions = results["schedule"]
 
         return {
             "success": True,
             "brief": brief,
-            "pdf_path": pdf_path,
+            "pdf_path": download_id,
+            "download_id": download_id,
             "meetings": meetings_to_dict(meetings),
             "actions": actions_to_dict(actions),
             "team_used": len(team_members),
+            "token_usage": build_token_usage(input_report, brief_input, language, brief, team_members),
+            "stage_timings": stage_timings,
             "file_info": {
                 "filenames": [file.filename for file in files],
-                "total_files": len(files)
+                "total_files": len(files),
+                "timings": file_timings
             }
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error in brief_with_meetings: {e}")
         raise HTTPException(500, f"Failed to process: {str(e)}")
+
+def sse_event(event: str, data: dict) -> str:
+    """
+    Format one server-sent event
+    """
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+@app.post("/brief-with-meetings/stream")
+async def stream_brief_with_meetings(
+    files: List[UploadFile] = File(...),
+    language: str = Form("English"),
+    bypass_cache: bool = Form(False),
+    custom_team: Optional[List[dict]] = None
+):
+    """
+    Same pipeline as /brief-with-meetings, streamed as server-sent events:
+    files, token (repeated), brief, meetings, actions, token_usage, pdf_ready, done.
+    Failures after the stream has started are sent as an error event.
+    """
+    combined_text, file_timings = await combine_uploaded_files(files)
+    team_members = build_team_members(custom_team)
+
+    async def event_stream():
+        try:
+            yield sse_event("files", {
+                "filenames": [file.filename for file in files],
+                "total_files": len(files),
+                "timings": file_timings
+            })
+
+            brief_input, input_report = await prepare_brief_input(combined_text, language, use_cache=not bypass_cache)
+
+            pieces = []
+            async for piece in iterate_in_thread(stream_brief, brief_input, language, use_cache=not bypass_cache):
+                pieces.append(piece)
+                yield sse_event("token", {"text": piece})
+            brief = "".join(pieces).strip()
+            yield sse_event("brief", {"brief": brief})
+
+            results, stage_timings = await run_stages(post_brief_stages(team_members), initial={"brief": brief})
+            meetings, actions = results["schedule"]
+            yield sse_event("meetings", {"meetings": meetings_to_dict(meetings), "team_used": len(team_members)})
+            yield sse_event("actions", {"actions": actions_to_dict(actions)})
+            yield sse_event("token_usage", build_token_usage(input_report, brief_input, language, brief, team_members))
+            yield sse_event("pdf_ready", {
+                "pdf_path": results["pdf"],
+                "download_id": results["pdf"],
+                "stage_timings": stage_timings
+            })
+            yield sse_event("done", {"success": True})
+
+        except Exception as e:
+            logger.error(f"Error in stream_brief_with_meetings: {e}")
+            yield sse_event("error", {"detail": f"Failed to process: {str(e)}"})
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
     
 
-@app.get("/download-pdf/{filename}")
-async def download_pdf(filename: str):
+@app.get("/download-pdf/{download_id}")
+async def download_pdf(download_id: str):
     """
-    Download the generated PDF file
+    Download a generated PDF by the download ID returned with the brief
     """
     try:
-        # Security check - only allow specific filename
-        if filename != "brief_output.pdf":
-            raise HTTPException(404, "File not found")
-        
-        # Check if file exists
-        if not os.path.exists(filename):
+        artifact = await run_io(get_artifact_store().get, download_id)
+        if artifact is None:
             raise HTTPException(404, "PDF file not found")
-        
-        return FileResponse(
-            path=filename,
-            filename=filename,
-            media_type="application/pdf"
-        )
-        
+
+        pdf_bytes, record = artifact
+        return pdf_response(pdf_bytes, record["filename"], record["media_type"])
+
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error downloading PDF: {e}")
         raise HTTPException(500, "Failed to download PDF")
@@ -185,6 +377,26 @@ async def get_team_roster():
         "total_members": len(INFOSYS_TEAM)
     }
 
+@app.get("/cache-stats")
+async def get_cache_stats():
+    """
+    Hit/miss counters for the server-side caches
+    """
+    parse_cache = get_parse_cache()
+    brief_cache = get_brief_cache()
+    return {
+        "parse": parse_cache.stats() if parse_cache is not None else None,
+        "transcriptions": get_transcription_store().stats(),
+        "briefs": brief_cache.stats() if brief_cache is not None else None
+    }
+
+@app.get("/llm-stats")
+async def get_llm_stats():
+    """
+    Rate limiter queue depth, admissions and wait times per model
+    """
+    return get_rate_limiter().stats()
+
 @app.get("/health")
 async def health_check():
     """
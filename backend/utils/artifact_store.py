@@ -0,0 +1,133 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+ARTIFACT_DIR = os.getenv("ARTIFACT_DIR", os.path.join(tempfile.gettempdir(), "autobrief-artifacts"))
+ARTIFACT_TTL_SECONDS = int(os.getenv("ARTIFACT_TTL_SECONDS", 60 * 60))
+
+DOWNLOAD_ID_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+
+
+class ArtifactStore:
+    """
+    Content-addressed store for generated files. Each put() returns a
+    unique download ID that points at a blob named by its SHA-256, so
+    identical PDFs are stored once. Everything lives under one directory,
+    which several workers can share.
+    """
+
+    def __init__(self, root=ARTIFACT_DIR, ttl_seconds=ARTIFACT_TTL_SECONDS):
+        self.root = root
+        self.ttl_seconds = ttl_seconds
+        self.blob_dir = os.path.join(root, "blobs")
+        self.id_dir = os.path.join(root, "ids")
+        self._lock = threading.Lock()
+        os.makedirs(self.blob_dir, exist_ok=True)
+        os.makedirs(self.id_dir, exist_ok=True)
+
+    def _write_atomic(self, path, data, directory):
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def put(self, data, filename, media_type):
+        """
+        Store bytes and return a new download ID for them
+        """
+        digest = hashlib.sha256(data).hexdigest()
+        blob_path = os.path.join(self.blob_dir, digest)
+        if os.path.exists(blob_path):
+            # Refresh the blob so cleanup keeps it as long as its newest reference
+            os.utime(blob_path)
+        else:
+            self._write_atomic(blob_path, data, self.blob_dir)
+
+        download_id = uuid.uuid4().hex
+        record = {
+            "sha256": digest,
+            "filename": filename,
+            "media_type": media_type,
+            "size": len(data),
+            "created_at": time.time(),
+        }
+        self._write_atomic(os.path.join(self.id_dir, f"{download_id}.json"),
+                           json.dumps(record).encode("utf-8"), self.id_dir)
+        return download_id
+
+    def get(self, download_id):
+        """
+        Return (bytes, record) for a download ID, or None if it is unknown or expired
+        """
+        if not DOWNLOAD_ID_PATTERN.match(download_id):
+            return None
+        try:
+            with open(os.path.join(self.id_dir, f"{download_id}.json"), "r", encoding="utf-8") as f:
+                record = json.load(f)
+            if time.time() - record["created_at"] > self.ttl_seconds:
+                return None
+            with open(os.path.join(self.blob_dir, record["sha256"]), "rb") as f:
+                return f.read(), record
+        except FileNotFoundError:
+            return None
+
+    def cleanup(self):
+        """
+        Delete expired download IDs, then blobs no remaining ID points at.
+        Returns the number of files removed.
+        """
+        with self._lock:
+            now = time.time()
+            removed = 0
+            live_blobs = set()
+
+            for entry in os.scandir(self.id_dir):
+                if not entry.name.endswith(".json"):
+                    continue
+                try:
+                    with open(entry.path, "r", encoding="utf-8") as f:
+                        record = json.load(f)
+                    if now - record["created_at"] > self.ttl_seconds:
+                        os.unlink(entry.path)
+                        removed += 1
+                    else:
+                        live_blobs.add(record["sha256"])
+                except (FileNotFoundError, ValueError, KeyError):
+                    continue
+
+            for entry in os.scandir(self.blob_dir):
+                # Skip blobs written after this scan started, their IDs may not exist yet
+                if entry.name in live_blobs or now - entry.stat().st_mtime < 60:
+                    continue
+                try:
+                    os.unlink(entry.path)
+                    removed += 1
+                except FileNotFoundError:
+                    pass
+
+        if removed:
+            logger.info(f"Artifact cleanup removed {removed} files")
+        return removed
+
+
+_artifact_store = None
+_artifact_store_lock = threading.Lock()
+
+
+def get_artifact_store():
+    """
+    Process-wide artifact store
+    """
+    global _artifact_store
+    with _artifact_store_lock:
+        if _artifact_store is None:
+            _artifact_store = ArtifactStore()
+    return _artifact_store
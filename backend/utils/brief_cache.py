@@ -0,0 +1,201 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+# "memory", "sqlite" or "none"
+BRIEF_CACHE_BACKEND = os.getenv("BRIEF_CACHE_BACKEND", "memory")
+BRIEF_CACHE_MAX_ITEMS = int(os.getenv("BRIEF_CACHE_MAX_ITEMS", 512))
+BRIEF_CACHE_TTL_SECONDS = int(os.getenv("BRIEF_CACHE_TTL_SECONDS", 24 * 60 * 60))
+BRIEF_CACHE_SQLITE_PATH = os.getenv(
+    "BRIEF_CACHE_SQLITE_PATH", os.path.join(tempfile.gettempdir(), "autobrief-cache", "briefs.sqlite3")
+)
+
+
+def normalize_language(language):
+    """
+    Canonical form of a requested language ("brazilian  portuguese" -> "Brazilian Portuguese"),
+    used for both the prompt and the cache key
+    """
+    return " ".join(language.split()).title()
+
+
+def make_brief_cache_key(user_text, language, model, temperature, prompt_version):
+    """
+    Key a brief by everything that changes the completion: the input text
+    (with whitespace normalized), language, model, temperature and prompt version
+    """
+    normalized_text = " ".join(user_text.split())
+    payload = json.dumps({
+        "text": normalized_text,
+        "language": normalize_language(language),
+        "model": model,
+        "temperature": temperature,
+        "prompt_version": prompt_version,
+    }, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class BriefCache(ABC):
+    """
+    Interface for brief caches. Subclasses implement _get, _set and __len__;
+    a backend missing one of them cannot be instantiated.
+    """
+
+    def __init__(self, max_items=BRIEF_CACHE_MAX_ITEMS, ttl_seconds=BRIEF_CACHE_TTL_SECONDS):
+        self.max_items = max_items
+        self.ttl_seconds = ttl_seconds
+        self._stats_lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "writes": 0}
+
+    def get(self, key):
+        value = self._get(key)
+        with self._stats_lock:
+            self._stats["hits" if value is not None else "misses"] += 1
+        return value
+
+    def set(self, key, value):
+        self._set(key, value)
+        with self._stats_lock:
+            self._stats["writes"] += 1
+
+    def stats(self):
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats["backend"] = type(self).__name__
+        stats["items"] = len(self)
+        return stats
+
+    @abstractmethod
+    def _get(self, key):
+        """
+        Cached value for key, or None if missing or expired
+        """
+
+    @abstractmethod
+    def _set(self, key, value):
+        pass
+
+    @abstractmethod
+    def __len__(self):
+        pass
+
+
+class MemoryBriefCache(BriefCache):
+    """
+    In-process LRU cache with a time-to-live
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get(self, key):
+        with self._lock:
+            entry = self._items.get(key)
+            if entry is None:
+                return None
+            value, created_at = entry
+            if time.time() - created_at > self.ttl_seconds:
+                del self._items[key]
+                return None
+            self._items.move_to_end(key)
+            return value
+
+    def _set(self, key, value):
+        with self._lock:
+            self._items[key] = (value, time.time())
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_items:
+                self._items.popitem(last=False)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._items)
+
+
+class SQLiteBriefCache(BriefCache):
+    """
+    Persistent cache shared by every worker on the host, with TTL and LRU eviction
+    """
+
+    def __init__(self, path=BRIEF_CACHE_SQLITE_PATH, **kwargs):
+        super().__init__(**kwargs)
+        self.path = path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS briefs ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS briefs_accessed ON briefs (accessed_at)")
+
+    def _get(self, key):
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM briefs WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, created_at = row
+            if now - created_at > self.ttl_seconds:
+                self._conn.execute("DELETE FROM briefs WHERE key = ?", (key,))
+                return None
+            self._conn.execute("UPDATE briefs SET accessed_at = ? WHERE key = ?", (now, key))
+            return value
+
+    def _set(self, key, value):
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO briefs (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, value, now, now)
+            )
+            self._conn.execute("DELETE FROM briefs WHERE created_at < ?", (now - self.ttl_seconds,))
+            # Keep only the most recently used rows
+            self._conn.execute(
+                "DELETE FROM briefs WHERE key NOT IN "
+                "(SELECT key FROM briefs ORDER BY accessed_at DESC LIMIT ?)",
+                (self.max_items,)
+            )
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM briefs").fetchone()[0]
+
+
+_brief_cache = None
+_brief_cache_lock = threading.Lock()
+
+
+def get_brief_cache():
+    """
+    Process-wide brief cache selected by BRIEF_CACHE_BACKEND, or None when disabled
+    """
+    global _brief_cache
+    backend = BRIEF_CACHE_BACKEND.lower()
+    if backend == "none":
+        return None
+    with _brief_cache_lock:
+        if _brief_cache is None:
+            if backend == "sqlite":
+                _brief_cache = SQLiteBriefCache()
+            else:
+                if backend != "memory":
+                    logger.warning(f"Unknown BRIEF_CACHE_BACKEND '{BRIEF_CACHE_BACKEND}', using memory")
+                _brief_cache = MemoryBriefCache()
+    return _brief_cache
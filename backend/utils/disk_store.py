@@ -0,0 +1,86 @@
+import os
+import tempfile
+
+
+class SizeBoundedDirectory:
+    """
+    Text files stored by key in one directory. Writes are atomic, reads
+    mark an entry as recently used, and after each write the least recently
+    used entries are removed until the directory fits max_bytes (0 = no limit).
+    Files from other processes sharing the directory count toward the budget.
+    """
+
+    def __init__(self, directory, suffix, max_bytes=0):
+        self.directory = directory
+        self.suffix = suffix
+        self.max_bytes = max_bytes
+        os.makedirs(self.directory, exist_ok=True)
+
+    def path(self, key):
+        return os.path.join(self.directory, f"{key}{self.suffix}")
+
+    def read(self, key):
+        """
+        Stored text for key, or None if there is none. Other errors are raised.
+        """
+        path = self.path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                text = f.read()
+        except FileNotFoundError:
+            return None
+        # Touch the file so eviction treats it as recently used
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            # Evicted by another writer since it was read
+            pass
+        return text
+
+    def write(self, key, text):
+        """
+        Store text under key, then evict. Returns the number of entries evicted.
+        """
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(text)
+            os.replace(tmp_path, self.path(key))
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except FileNotFoundError:
+                pass
+            raise
+        return self.evict()
+
+    def evict(self):
+        """
+        Remove least recently used entries until the directory fits the size budget.
+        Returns the number of entries removed.
+        """
+        if self.max_bytes <= 0:
+            return 0
+        entries = []
+        total = 0
+        for entry in os.scandir(self.directory):
+            if entry.is_file() and entry.name.endswith(self.suffix):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total += stat.st_size
+
+        evicted = 0
+        if total <= self.max_bytes:
+            return evicted
+
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.unlink(path)
+                total -= size
+                evicted += 1
+            except FileNotFoundError:
+                pass
+        return evicted
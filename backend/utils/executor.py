@@ -0,0 +1,123 @@
+import asyncio
+import functools
+import logging
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+# Pool sizes can be tuned per deployment through environment variables
+CPU_POOL_WORKERS = int(os.getenv("CPU_POOL_WORKERS", max(1, min(4, (os.cpu_count() or 1)))))
+IO_POOL_WORKERS = int(os.getenv("IO_POOL_WORKERS", 16))
+
+_cpu_pool = None
+_io_pool = None
+
+
+def get_cpu_pool():
+    """
+    Bounded process pool for CPU-bound work (PDF parsing, OCR, spreadsheets)
+    """
+    global _cpu_pool
+    if _cpu_pool is None:
+        logger.info(f"Starting CPU process pool with {CPU_POOL_WORKERS} workers")
+        _cpu_pool = ProcessPoolExecutor(max_workers=CPU_POOL_WORKERS)
+    return _cpu_pool
+
+
+def get_io_pool():
+    """
+    Thread pool for blocking I/O (OpenAI calls, ffmpeg subprocesses, disk writes)
+    """
+    global _io_pool
+    if _io_pool is None:
+        logger.info(f"Starting I/O thread pool with {IO_POOL_WORKERS} workers")
+        _io_pool = ThreadPoolExecutor(max_workers=IO_POOL_WORKERS, thread_name_prefix="io")
+    return _io_pool
+
+
+async def run_cpu(fn, *args, **kwargs):
+    """
+    Run a picklable function in the process pool without blocking the event loop
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_cpu_pool(), functools.partial(fn, *args, **kwargs))
+
+
+async def run_io(fn, *args, **kwargs):
+    """
+    Run a blocking function in the I/O thread pool without blocking the event loop
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_io_pool(), functools.partial(fn, *args, **kwargs))
+
+
+def shutdown_pools():
+    """
+    Shut down both pools, called when the app stops
+    """
+    global _cpu_pool, _io_pool
+    if _cpu_pool is not None:
+        _cpu_pool.shutdown(wait=False, cancel_futures=True)
+        _cpu_pool = None
+    if _io_pool is not None:
+        _io_pool.shutdown(wait=False, cancel_futures=True)
+        _io_pool = None
+
+
+_STREAM_DONE = object()
+# How long a consumer that stops early waits for the generator thread to wind down
+ITERATE_STOP_TIMEOUT = 1.0
+
+
+async def iterate_in_thread(gen_fn, *args, **kwargs):
+    """
+    Drive a blocking generator in the I/O thread pool and yield its items
+    on the event loop as they are produced. If the consumer stops early
+    (e.g. the client disconnected), the generator is closed in its thread
+    as soon as its next item arrives, so its finally blocks can close
+    upstream streams; the consumer waits at most ITERATE_STOP_TIMEOUT for that.
+    """
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue()
+    stop = threading.Event()
+
+    def put(item, error=None):
+        try:
+            loop.call_soon_threadsafe(queue.put_nowait, (item, error))
+        except RuntimeError:
+            # The event loop is gone, nobody is listening
+            pass
+
+    def produce():
+        gen = gen_fn(*args, **kwargs)
+        try:
+            for item in gen:
+                # The consumer went away
+                if stop.is_set():
+                    return
+                put(item)
+        except BaseException as e:
+            put(_STREAM_DONE, e)
+            return
+        finally:
+            gen.close()
+        put(_STREAM_DONE)
+
+    producer = loop.run_in_executor(get_io_pool(), produce)
+    try:
+        while True:
+            item, error = await queue.get()
+            if item is _STREAM_DONE:
+                if error is not None:
+                    raise error
+                break
+            yield item
+    finally:
+        stop.set()
+        if not producer.done():
+            try:
+                await asyncio.wait_for(asyncio.shield(producer), ITERATE_STOP_TIMEOUT)
+            except asyncio.TimeoutError:
+                logger.info("Stopped stream is waiting for its next item, it is closed when that arrives")
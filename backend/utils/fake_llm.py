@@ -0,0 +1,272 @@
+import asyncio
+import hashlib
+import json
+import math
+import os
+import random
+import re
+import threading
+import time
+from types import SimpleNamespace
+
+from utils.token_budget import count_message_tokens, count_tokens
+
+# Median latency of a fake call and the spread of its lognormal distribution (0 = always the median)
+FAKE_LLM_LATENCY_MS = float(os.getenv("FAKE_LLM_LATENCY_MS", 300))
+FAKE_LLM_LATENCY_SIGMA = float(os.getenv("FAKE_LLM_LATENCY_SIGMA", 0.5))
+# Share of calls that fail, and the HTTP status they fail with
+FAKE_LLM_ERROR_RATE = float(os.getenv("FAKE_LLM_ERROR_RATE", 0))
+FAKE_LLM_ERROR_STATUS = int(os.getenv("FAKE_LLM_ERROR_STATUS", 429))
+# Seeds latency and error draws; responses are always a function of the request
+FAKE_LLM_SEED = os.getenv("FAKE_LLM_SEED")
+FAKE_TRANSCRIPT_TEXT = os.getenv("FAKE_TRANSCRIPT_TEXT", "Fake transcript of the recording.")
+
+STREAM_CHUNK_WORDS = 8
+# Share of the latency spent before the first streamed chunk
+FIRST_TOKEN_SHARE = 0.3
+MEETING_TYPES = ["kickoff", "creative_review", "approval", "status_update"]
+TEAM_LINE = re.compile(r"^\s*(\d+): ", re.MULTILINE)
+
+
+class FakeLLM:
+    """
+    Offline stand-in for the OpenAI API. Recognizes the agents' prompts
+    and answers in the shape they expect: a brief with every section,
+    scheduler JSON with valid team indices, or bullet summaries. Calls
+    take a random lognormal latency and fail at error_rate with the
+    same exceptions the SDK raises, so retries and rate limits run as
+    they would against the real API.
+    """
+
+    def __init__(self, latency_ms=FAKE_LLM_LATENCY_MS, latency_sigma=FAKE_LLM_LATENCY_SIGMA,
+                 error_rate=FAKE_LLM_ERROR_RATE, error_status=FAKE_LLM_ERROR_STATUS, seed=FAKE_LLM_SEED):
+        # Responses use the SDK's types; import them now rather than from racing worker threads
+        import openai.types.chat  # noqa: F401
+
+        self.latency_ms = latency_ms
+        self.latency_sigma = latency_sigma
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.calls = 0
+        self.errors = 0
+
+    def draw(self):
+        """
+        Latency in seconds of the next call and whether it fails
+        """
+        with self.lock:
+            self.calls += 1
+            latency = self.latency_ms / 1000 * math.exp(self.random.gauss(0, self.latency_sigma))
+            failed = self.random.random() < self.error_rate
+            if failed:
+                self.errors += 1
+        return latency, failed
+
+    def error(self):
+        import httpx
+        import openai
+
+        response = httpx.Response(self.error_status, request=httpx.Request("POST", "https://fake-llm.local/v1"))
+        if self.error_status == 429:
+            error_class = openai.RateLimitError
+        elif self.error_status >= 500:
+            error_class = openai.InternalServerError
+        else:
+            error_class = openai.APIStatusError
+        return error_class(f"Injected fake LLM error ({self.error_status})", response=response, body=None)
+
+    def reply(self, messages, max_tokens=None):
+        system = next((m["content"] for m in messages if m["role"] == "system"), "")
+        user = "\n".join(m["content"] for m in messages if m["role"] == "user")
+        digest = int(hashlib.sha256((system + user).encode("utf-8")).hexdigest(), 16)
+
+        if "meeting scheduler" in system:
+            return schedule_json(system, digest)
+        if "creative brief writer" in system:
+            language = re.search(r"\*\*in (.+?)\*\*", system)
+            return brief_text(user, language.group(1) if language else "English")
+        if "Summarize part" in system:
+            return summary_text(user, max_tokens)
+        return f"Fake response to: {first_sentence(user)}"
+
+    def completion(self, model, messages, max_tokens=None, **kwargs):
+        from openai.types import CompletionUsage
+        from openai.types.chat import ChatCompletion, ChatCompletionMessage
+        from openai.types.chat.chat_completion import Choice
+
+        text = self.reply(messages, max_tokens)
+        prompt_tokens = count_message_tokens(messages, model)
+        completion_tokens = count_tokens(text, model)
+        return ChatCompletion(
+            id=f"chatcmpl-fake-{self.calls}", object="chat.completion", created=int(time.time()), model=model,
+            choices=[Choice(index=0, finish_reason="stop", message=ChatCompletionMessage(role="assistant", content=text))],
+            usage=CompletionUsage(prompt_tokens=prompt_tokens, completion_tokens=completion_tokens,
+                                  total_tokens=prompt_tokens + completion_tokens),
+        )
+
+    def chunks(self, model, messages, max_tokens=None, **kwargs):
+        """
+        The reply as streaming chunks of a few words each
+        """
+        from openai.types.chat import ChatCompletionChunk
+        from openai.types.chat.chat_completion_chunk import Choice, ChoiceDelta
+
+        words = self.reply(messages, max_tokens).split(" ")
+        pieces = [" ".join(words[i:i + STREAM_CHUNK_WORDS]) for i in range(0, len(words), STREAM_CHUNK_WORDS)]
+        pieces = [piece + " " if i < len(pieces) - 1 else piece for i, piece in enumerate(pieces)]
+        return [
+            ChatCompletionChunk(
+                id=f"chatcmpl-fake-{self.calls}", object="chat.completion.chunk", created=int(time.time()), model=model,
+                choices=[Choice(index=0, delta=ChoiceDelta(role="assistant", content=piece), finish_reason=None)],
+            )
+            for piece in pieces
+        ]
+
+    def transcription(self):
+        from openai.types.audio import Transcription
+
+        return Transcription(text=FAKE_TRANSCRIPT_TEXT)
+
+
+def first_sentence(text, limit=160):
+    sentence = re.split(r"(?<=[.!?])\s", " ".join(text.split()), maxsplit=1)[0]
+    return sentence[:limit] or "the product launch"
+
+
+def brief_text(user_text, language):
+    topic = first_sentence(user_text)
+    return "\n\n".join([
+        f"**Objective**\nDrive awareness and adoption for: {topic}",
+        "**Audience**\nPeople described in the source material, prioritized by reach and intent.",
+        f"**Messaging**\nLead with the main benefit, backed by proof points from the input. Written in {language}.",
+        "**Content Suggestions**\n- Launch video\n- Social carousel\n- Email announcement",
+        "**KPIs**\n- Reach\n- Click-through rate\n- Conversions",
+    ])
+
+
+def summary_text(chunk, max_tokens=None):
+    lines = [line.strip() for line in chunk.split("\n") if line.strip()]
+    summary = "\n".join(f"- {line[:120]}" for line in lines[:8])
+    return summary[:(max_tokens or 400) * 4]
+
+
+def schedule_json(prompt, digest):
+    team_size = len(TEAM_LINE.findall(prompt.split("AVAILABLE TEAM:")[-1])) or 1
+    meetings = []
+    for i in range(2 + digest % 3):
+        meetings.append({
+            "type": MEETING_TYPES[i % len(MEETING_TYPES)],
+            "priority": ["high", "medium", "low"][i % 3],
+            "attendee_indices": sorted({(i + offset) % team_size for offset in range(3)}),
+            "title": f"{MEETING_TYPES[i % len(MEETING_TYPES)].replace('_', ' ').title()} Meeting",
+            "agenda_bullets": ["Review the brief", "Agree on owners", "Confirm next steps"],
+            "duration_minutes": [30, 60, 90][i % 3],
+            "timing": ["asap", "2_days", "1_week"][i % 3],
+        })
+    actions = [
+        {
+            "task": task,
+            "assignee_index": i % team_size,
+            "priority": ["high", "medium", "low"][i % 3],
+            "deadline": ["1_day", "3_days", "1_week", "2_weeks"][i % 4],
+            "category": category,
+            "dependencies": [],
+            "deliverable": deliverable,
+        }
+        for i, (task, category, deliverable) in enumerate([
+            ("Draft creative concepts", "design", "Concept deck"),
+            ("Write launch copy", "content", "Copy document"),
+            ("Approve budget", "approval", "Signed budget"),
+        ])
+    ]
+    return json.dumps({
+        "project_analysis": {"urgency": "medium", "complexity": "medium", "key_requirements": ["creative_design"]},
+        "meetings": meetings,
+        "actionable_items": actions,
+    })
+
+
+class _FakeStream:
+    def __init__(self, chunks, first_delay, chunk_delay):
+        self.chunks = chunks
+        self.first_delay = first_delay
+        self.chunk_delay = chunk_delay
+
+    def __iter__(self):
+        time.sleep(self.first_delay)
+        for i, chunk in enumerate(self.chunks):
+            if i:
+                time.sleep(self.chunk_delay)
+            yield chunk
+
+    async def __aiter__(self):
+        await asyncio.sleep(self.first_delay)
+        for i, chunk in enumerate(self.chunks):
+            if i:
+                await asyncio.sleep(self.chunk_delay)
+            yield chunk
+
+    def close(self):
+        pass
+
+
+def _stream(llm, latency, kwargs):
+    chunks = llm.chunks(**kwargs)
+    chunk_delay = latency * (1 - FIRST_TOKEN_SHARE) / max(1, len(chunks) - 1)
+    return _FakeStream(chunks, latency * FIRST_TOKEN_SHARE, chunk_delay)
+
+
+class FakeOpenAI:
+    """
+    Drop-in for openai.OpenAI covering the calls the agents make
+    """
+
+    def __init__(self, llm=None):
+        self.llm = llm or FakeLLM()
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create_completion))
+        self.audio = SimpleNamespace(transcriptions=SimpleNamespace(create=self._create_transcription))
+
+    def _create_completion(self, stream=False, timeout=None, **kwargs):
+        latency, failed = self.llm.draw()
+        if failed:
+            time.sleep(latency * FIRST_TOKEN_SHARE)
+            raise self.llm.error()
+        if stream:
+            return _stream(self.llm, latency, kwargs)
+        time.sleep(latency)
+        return self.llm.completion(**kwargs)
+
+    def _create_transcription(self, model, file, timeout=None, **kwargs):
+        latency, failed = self.llm.draw()
+        time.sleep(latency)
+        if failed:
+            raise self.llm.error()
+        return self.llm.transcription()
+
+    def close(self):
+        pass
+
+
+class AsyncFakeOpenAI:
+    """
+    Drop-in for openai.AsyncOpenAI
+    """
+
+    def __init__(self, llm=None):
+        self.llm = llm or FakeLLM()
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create_completion))
+
+    async def _create_completion(self, stream=False, timeout=None, **kwargs):
+        latency, failed = self.llm.draw()
+        if failed:
+            await asyncio.sleep(latency * FIRST_TOKEN_SHARE)
+            raise self.llm.error()
+        if stream:
+            return _stream(self.llm, latency, kwargs)
+        await asyncio.sleep(latency)
+        return self.llm.completion(**kwargs)
+
+    async def close(self):
+        pass
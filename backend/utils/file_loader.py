@@ -1,45 +1,210 @@
+import hashlib
 import io
-import pdfplumber
-from PIL import Image
-import pytesseract
 import logging
-import pandas as pd
-from moviepy.editor import VideoFileClip
-from pydub import AudioSegment
 import tempfile
-from openai import OpenAI
+from concurrent.futures import ThreadPoolExecutor
 import os
 
+from utils.image_preprocess import OCR_PREPROCESS, preprocess_for_ocr, split_into_tiles
+from utils.media_io import decode_audio, media_path
+from utils.parse_cache import get_parse_cache
+from utils.text import normalize_text
+from utils.transcription import TRANSCRIPTION_SEGMENT_SECONDS, get_transcriber, transcribe_audio, transcriber_name
+from utils.transcription_store import get_transcription_store
+from utils.video_frames import (
+    VIDEO_FRAME_INTERVAL, VIDEO_FRAME_MODE, VIDEO_FRAME_OCR, format_timestamp, merge_timeline, sample_frames,
+)
+
 from dotenv import load_dotenv
 load_dotenv()
 
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+# pdfplumber, pypdfium2, pytesseract, pandas (utils.tabular), moviepy,
+# pydub, numpy and PIL (utils.video_frames, utils.media_io and
+# utils.image_preprocess) are imported by the functions that use them, so
+# a worker that never sees a PDF or a video does not pay for them at startup
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def load_pdf(file_bytes):
+# Pages per process-pool task, an optional page cap, and text-layer-only extraction
+PDF_SHARD_PAGES = int(os.getenv("PDF_SHARD_PAGES", 16))
+PDF_MAX_PAGES = int(os.getenv("PDF_MAX_PAGES", 0))
+PDF_FAST_MODE = os.getenv("PDF_FAST_MODE", "0") == "1"
+# OCR for scanned pages without a text layer
+PDF_OCR_ENABLED = os.getenv("PDF_OCR_ENABLED", "1") == "1"
+PDF_OCR_DPI = int(os.getenv("PDF_OCR_DPI", 200))
+PDF_OCR_MAX_PAGES = int(os.getenv("PDF_OCR_MAX_PAGES", 20))
+# Larger PDFs reach the workers as a temp file path instead of pickled bytes
+PDF_SHARE_BY_PATH_BYTES = 8 * 1024 * 1024
+
+# Tesseract page segmentation mode and parallel tiles per image
+OCR_PSM = int(os.getenv("OCR_PSM", 3))
+OCR_TILE_WORKERS = int(os.getenv("OCR_TILE_WORKERS", 4))
+
+# Transcripts depend on the transcriber and how recordings are segmented, like transcript_key
+TRANSCRIBER_VERSION = f"{transcriber_name()}-seg{TRANSCRIPTION_SEGMENT_SECONDS}"
+
+# Bump a loader's version whenever its output format changes, so cached text is re-extracted
+LOADER_VERSIONS = {
+    # The PDF output also depends on the page cap and extraction mode
+    "load_pdf": (f"2{'-fast' if PDF_FAST_MODE else ''}{f'-max{PDF_MAX_PAGES}' if PDF_MAX_PAGES else ''}"
+                 f"{f'-ocr{PDF_OCR_DPI}x{PDF_OCR_MAX_PAGES}' if PDF_OCR_ENABLED else ''}"),
+    "load_image": f"2-psm{OCR_PSM}{'-pre' if OCR_PREPROCESS else ''}",
+    "load_text": 1,
+    "load_csv": 2,
+    "load_excel": 2,
+    # Frame OCR adds slide text to the output, so its settings are part of the version
+    "load_video": (f"3-frames-{VIDEO_FRAME_MODE}{VIDEO_FRAME_INTERVAL:g}-{TRANSCRIBER_VERSION}" if VIDEO_FRAME_OCR
+                   else f"2-{TRANSCRIBER_VERSION}"),
+    "load_audio": f"2-{TRANSCRIBER_VERSION}",
+}
+
+def _pdf_input(source):
     """
-    Extract text from PDF file bytes using pdfplumber
+    File-like or path input accepted by both pdfium and pdfplumber
     """
+    return io.BytesIO(source) if isinstance(source, (bytes, bytearray)) else source
+
+def count_pdf_pages(source):
+    """
+    Number of pages in a PDF given as bytes or a path
+    """
+    import pypdfium2 as pdfium
+
+    pdf = pdfium.PdfDocument(_pdf_input(source))
     try:
-        # Create a BytesIO object from the file bytes
-        pdf_file = io.BytesIO(file_bytes)
-        
-        text_content = []
-        
-        with pdfplumber.open(pdf_file) as pdf:
-            for page_num, page in enumerate(pdf.pages):
+        return len(pdf)
+    finally:
+        pdf.close()
+
+def extract_pdf_pages(source, start, stop, fast=False):
+    """
+    Extract text from pages [start, stop) of a PDF given as bytes or a path.
+    Returns (page_number, text) pairs; fast mode reads the raw text layer with
+    pdfium and skips pdfplumber's layout analysis.
+    """
+    import pdfplumber
+    import pypdfium2 as pdfium
+
+    pages = []
+    if fast:
+        pdf = pdfium.PdfDocument(_pdf_input(source))
+        try:
+            for page_num in range(start, stop):
                 try:
-                    # Extract text from each page
-                    page_text = page.extract_text()
-                    if page_text:
-                        text_content.append(f"--- Page {page_num + 1} ---")
-                        text_content.append(page_text.strip())
+                    page = pdf[page_num]
+                    textpage = page.get_textpage()
+                    pages.append((page_num + 1, textpage.get_text_range()))
+                    textpage.close()
+                    page.close()
                 except Exception as e:
                     logger.warning(f"Could not extract text from page {page_num + 1}: {e}")
-                    continue
+        finally:
+            pdf.close()
+        return pages
+
+    with pdfplumber.open(_pdf_input(source)) as pdf:
+        for page_num in range(start, stop):
+            try:
+                # Extract text from each page
+                page = pdf.pages[page_num]
+                pages.append((page_num + 1, page.extract_text()))
+                # Drop cached layout objects so long shards stay small
+                page.flush_cache()
+            except Exception as e:
+                logger.warning(f"Could not extract text from page {page_num + 1}: {e}")
+    return pages
+
+def ocr_pdf_page(source, page_index, dpi=PDF_OCR_DPI):
+    """
+    Rasterize one PDF page and OCR it through the same path as load_image.
+    Results are cached by a hash of the rendered page, so the same scan
+    is only OCR'd once.
+    """
+    import pypdfium2 as pdfium
+
+    try:
+        pdf = pdfium.PdfDocument(_pdf_input(source))
+        try:
+            page = pdf[page_index]
+            image = page.render(scale=dpi / 72, grayscale=True).to_pil()
+            page.close()
+        finally:
+            pdf.close()
+
+        parse_cache = get_parse_cache()
+        cache_key = None
+        if parse_cache is not None:
+            page_hash = hashlib.sha256(image.tobytes()).hexdigest()
+            cache_key = f"{page_hash}-ocr_pdf_page-{LOADER_VERSIONS['load_image']}-{dpi}dpi"
+            cached_text = parse_cache.get(cache_key)
+            if cached_text is not None:
+                return page_index + 1, cached_text
+
+        page_text = ocr_image(image, dpi=dpi)
+        if parse_cache is not None:
+            parse_cache.set(cache_key, page_text)
+        return page_index + 1, page_text
+
+    except Exception as e:
+        logger.warning(f"Could not OCR page {page_index + 1}: {e}")
+        return page_index + 1, ""
+
+def load_pdf(file_bytes, max_pages=PDF_MAX_PAGES, fast=PDF_FAST_MODE, executor=None, ocr=PDF_OCR_ENABLED):
+    """
+    Extract text from PDF file bytes using pdfplumber.
+    With an executor, page ranges are extracted in parallel shards (one
+    for short PDFs) in the executor's workers; the
+    output keeps the original page order. Pages without a text layer
+    (scans) are rasterized and OCR'd, up to PDF_OCR_MAX_PAGES of them.
+    """
+    temp_path = None
+    try:
+        page_count = count_pdf_pages(file_bytes)
+        if max_pages:
+            page_count = min(page_count, max_pages)
+
+        shards = [(start, min(start + PDF_SHARD_PAGES, page_count))
+                  for start in range(0, page_count, PDF_SHARD_PAGES)]
+
+        source = file_bytes
+        if executor is not None and len(file_bytes) > PDF_SHARE_BY_PATH_BYTES:
+            with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as temp_pdf:
+                temp_pdf.write(file_bytes)
+                temp_path = temp_pdf.name
+            source = temp_path
+
+        # Even a single shard goes to the executor, keeping pdfplumber out of the server process
+        if executor is not None:
+            futures = [executor.submit(extract_pdf_pages, source, start, stop, fast) for start, stop in shards]
+            page_results = [page for future in futures for page in future.result()]
+        else:
+            page_results = extract_pdf_pages(file_bytes, 0, page_count, fast)
+
+        page_texts = dict(page_results)
+
+        # OCR only the pages that came back without text
+        if ocr:
+            textless_pages = [number - 1 for number in range(1, page_count + 1)
+                              if not (page_texts.get(number) or "").strip()]
+            if len(textless_pages) > PDF_OCR_MAX_PAGES:
+                logger.warning(f"OCR limited to {PDF_OCR_MAX_PAGES} of {len(textless_pages)} pages without text")
+                textless_pages = textless_pages[:PDF_OCR_MAX_PAGES]
+            if textless_pages:
+                logger.info(f"Running OCR on {len(textless_pages)} scanned pages")
+                if executor is not None:
+                    futures = [executor.submit(ocr_pdf_page, source, index) for index in textless_pages]
+                    page_texts.update(future.result() for future in futures)
+                else:
+                    page_texts.update(ocr_pdf_page(source, index) for index in textless_pages)
+
+        text_content = []
+        for page_number in sorted(page_texts):
+            page_text = page_texts[page_number]
+            if page_text and page_text.strip():
+                text_content.append(f"--- Page {page_number} ---")
+                text_content.append(page_text.strip())
         
         if not text_content:
             return "No text content found in PDF"
@@ -50,23 +215,54 @@ def load_pdf(file_bytes):
         logger.error(f"Error processing PDF: {e}")
         return f"Error processing PDF: {str(e)}"
 
+    finally:
+        if temp_path is not None:
+            try:
+                os.unlink(temp_path)
+            except Exception as cleanup_error:
+                logger.warning(f"Could not clean up temporary files: {cleanup_error}")
+
+def ocr_image(image, dpi=None, preprocess=OCR_PREPROCESS):
+    """
+    Run OCR on a PIL image and return the cleaned text.
+    With preprocessing the image is cleaned up for Tesseract first, and
+    tall images are OCR'd as tiles in parallel.
+    """
+    import pytesseract
+
+    config = f"--psm {OCR_PSM}"
+
+    if preprocess:
+        tiles = split_into_tiles(preprocess_for_ocr(image, dpi))
+    else:
+        # Convert to RGB if necessary (some formats might be RGBA or grayscale)
+        if image.mode not in ('RGB', 'L'):
+            image = image.convert('RGB')
+        tiles = [image]
+
+    # Use pytesseract to extract text
+    if len(tiles) == 1:
+        extracted_text = pytesseract.image_to_string(tiles[0], config=config)
+    else:
+        # Tesseract runs as a subprocess, so threads OCR tiles in parallel
+        with ThreadPoolExecutor(max_workers=min(OCR_TILE_WORKERS, len(tiles))) as pool:
+            tile_texts = pool.map(lambda tile: pytesseract.image_to_string(tile, config=config).strip(), tiles)
+            extracted_text = "\n".join(text for text in tile_texts if text)
+
+    # Clean up the extracted text
+    return extracted_text.strip()
+
 def load_image(file_bytes):
     """
     Extract text from image file bytes using OCR (pytesseract)
     """
+    from PIL import Image
+
     try:
         # Create PIL Image from bytes
         image = Image.open(io.BytesIO(file_bytes))
         
-        # Convert to RGB if necessary (some formats might be RGBA or grayscale)
-        if image.mode != 'RGB':
-            image = image.convert('RGB')
-        
-        # Use pytesseract to extract text
-        extracted_text = pytesseract.image_to_string(image)
-        
-        # Clean up the extracted text
-        cleaned_text = extracted_text.strip()
+        cleaned_text = ocr_image(image)
         
         if not cleaned_text:
             return "No text found in image"
@@ -102,37 +298,34 @@ def load_text(file_bytes):
     
 def load_csv(file_bytes):
     """
-    Extract data from CSV file bytes and convert to readable text
+    Extract data from CSV file bytes and convert to readable text.
+    The file is read in chunks, so memory stays flat for large exports.
     """
+    from utils.tabular import profile_header, profile_lines, summarize_csv_stream
+
     try:
-        # Create StringIO from bytes
-        csv_data = io.StringIO(file_bytes.decode('utf-8'))
-        
-        # Read CSV with pandas
-        df = pd.read_csv(csv_data)
+        summary, sample = summarize_csv_stream(file_bytes)
         
         # Convert to a readable text format
         text_content = []
         
         # Add basic info about the data
         text_content.append(f"CSV Data Summary:")
-        text_content.append(f"Rows: {len(df)}, Columns: {len(df.columns)}")
-        text_content.append(f"Column Names: {', '.join(df.columns.tolist())}")
+        text_content.append(f"Rows: {summary.rows}, Columns: {len(summary.columns)}")
+        text_content.append(f"Column Names: {', '.join(summary.columns)}")
         text_content.append("")
         
         # Add sample of the data (first 10 rows)
         text_content.append("Sample Data (first 10 rows):")
-        sample_data = df.head(10).to_string(index=False)
+        sample_data = sample.to_string(index=False)
         text_content.append(sample_data)
         
-        # Add summary statistics for numeric columns
-        numeric_cols = df.select_dtypes(include=['number']).columns
-        if len(numeric_cols) > 0:
+        # Add a profile of every column
+        profile = profile_lines(summary)
+        if profile:
             text_content.append("")
-            text_content.append("Numeric Column Summary:")
-            for col in numeric_cols:
-                stats = df[col].describe()
-                text_content.append(f"{col}: Mean={stats['mean']:.2f}, Min={stats['min']:.2f}, Max={stats['max']:.2f}")
+            text_content.append(profile_header(summary))
+            text_content.extend(profile)
         
         return "\n".join(text_content)
     
@@ -142,41 +335,37 @@ def load_csv(file_bytes):
 
 def load_excel(file_bytes):
     """
-    Extract data from Excel file bytes and convert to readable text
+    Extract data from Excel file bytes and convert to readable text.
+    Sheets are streamed in openpyxl's read-only mode, a chunk of rows at a time.
     """
+    from utils.tabular import profile_header, profile_lines, summarize_excel_stream
+
     try:
-        # Create BytesIO object
-        excel_file = io.BytesIO(file_bytes)
-        
-        # Read all sheets
-        excel_data = pd.read_excel(excel_file, sheet_name=None)  # None reads all sheets
+        sheets = list(summarize_excel_stream(file_bytes))
         
         text_content = []
         text_content.append("Excel File Summary:")
-        text_content.append(f"Number of sheets: {len(excel_data)}")
+        text_content.append(f"Number of sheets: {len(sheets)}")
         text_content.append("")
         
         # Process each sheet
-        for sheet_name, df in excel_data.items():
+        for sheet_name, summary, sample in sheets:
             text_content.append(f"=== Sheet: {sheet_name} ===")
-            text_content.append(f"Rows: {len(df)}, Columns: {len(df.columns)}")
-            text_content.append(f"Column Names: {', '.join(df.columns.astype(str).tolist())}")
+            text_content.append(f"Rows: {summary.rows}, Columns: {len(summary.columns)}")
+            text_content.append(f"Column Names: {', '.join(str(col) for col in summary.columns)}")
             text_content.append("")
             
             # Add sample data (first 5 rows per sheet to avoid too much text)
             text_content.append("Sample Data (first 5 rows):")
-            sample_data = df.head(5).to_string(index=False)
+            sample_data = sample.to_string(index=False)
             text_content.append(sample_data)
             
-            # Add summary for numeric columns
-            numeric_cols = df.select_dtypes(include=['number']).columns
-            if len(numeric_cols) > 0:
+            # Add a profile of every column
+            profile = profile_lines(summary)
+            if profile:
                 text_content.append("")
-                text_content.append("Numeric Summary:")
-                for col in numeric_cols:
-                    if not df[col].isna().all():  # Skip if all values are NaN
-                        stats = df[col].describe()
-                        text_content.append(f"{col}: Mean={stats['mean']:.2f}, Min={stats['min']:.2f}, Max={stats['max']:.2f}")
+                text_content.append(profile_header(summary))
+                text_content.extend(profile)
             
             text_content.append("")  # Space between sheets
         
@@ -184,152 +373,161 @@ def load_excel(file_bytes):
     
     except Exception as e:
         logger.error(f"Error processing Excel: {e}")
-    
+        return f"Error processing Excel: {str(e)}"
+
+def transcript_key(file_bytes):
+    """
+    Transcription store key: the media, the transcriber and how it was segmented
+    """
+    transcriber = get_transcriber()
+    return get_transcription_store().make_key(file_bytes, f"{transcriber.name}-seg{TRANSCRIPTION_SEGMENT_SECONDS}")
 
-def load_video(file_bytes):
-    pass
+def format_transcript(segments):
     """
-    Extract audio from video file bytes and transcribe to text using OpenAI Whisper
+    One "[mm:ss] text" line per transcribed segment
+    """
+    return "\n".join(f"[{format_timestamp(segment['start'])}] {segment['text']}" for segment in segments)
+
+def _transcribe_video(file_bytes, video_path=None):
+    """
+    Decode the audio track of a video and transcribe it.
+    Returns {"text", "duration", "segments"}, or None if the video has no audio track.
+    video_path reuses a copy of the video that is already on disk.
+    """
+    logger.info("Extracting audio from video...")
+    audio = decode_audio(file_bytes, path=video_path)
+    if audio is None:
+        return None
+
+    logger.info(f"Video duration: {len(audio) / 1000.0:.2f} seconds")
+    return transcribe_audio(audio)
+
+def ocr_video_frame(image):
+    """
+    Text of one video frame, or "" if OCR fails
     """
     try:
-        # Create temporary files for video processing
-        with tempfile.NamedTemporaryFile(suffix='.mp4', delete=False) as temp_video:
-            temp_video.write(file_bytes)
-            temp_video_path = temp_video.name
-        
-        with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as temp_audio:
-            temp_audio_path = temp_audio.name
-        
-        try:
-            # Extract audio from video using moviepy
-            logger.info("Extracting audio from video...")
-            with VideoFileClip(temp_video_path) as video:
-                # Extract audio and save as WAV
-                audio = video.audio
-                if audio is None:
-                    return "No audio track found in video"
-                
-                audio.write_audiofile(temp_audio_path, verbose=False, logger=None)
-                
-                # Get video duration for context
-                duration = video.duration
-                logger.info(f"Video duration: {duration:.2f} seconds")
-            
-            # Transcribe audio using OpenAI Whisper
-            logger.info("Transcribing audio to text...")
-            with open(temp_audio_path, "rb") as f:
-                transcript = client.audio.transcriptions.create(
-                    model="whisper-1",
-                    file=f
-                )
-            
-            if not transcript or not transcript.text.strip():
-                return "No speech detected in video audio"
-            
-            # Format the output with metadata
-            result = [
-                f"--- Video Transcription ---",
-                f"Duration: {duration:.2f} seconds",
-                f"Transcript:",
-                transcript.text.strip()
-            ]
-            
-            return "\n\n".join(result)
-            
-        except Exception as e:
-            logger.error(f"Error during video/audio processing: {e}")
-            return f"Error processing video: {str(e)}"
-        
-        finally:
-            # Clean up temporary files
+        return normalize_text(ocr_image(image))
+    except Exception as e:
+        logger.warning(f"Could not OCR video frame: {e}")
+        return ""
+
+def _ocr_video_frames(video_path, executor=None):
+    """
+    OCR the distinct frames of a video, in the executor's workers when
+    one is given, like PDF pages.
+    Returns [{"start", "text"}] in playback order, one entry per slide.
+    """
+    frames = sample_frames(video_path)
+    logger.info(f"OCR on {len(frames)} distinct video frames")
+    if not frames:
+        return []
+    if executor is not None:
+        futures = [executor.submit(ocr_video_frame, image) for _, image in frames]
+        texts = [future.result() for future in futures]
+    else:
+        with ThreadPoolExecutor(max_workers=OCR_TILE_WORKERS) as pool:
+            texts = list(pool.map(lambda frame: ocr_video_frame(frame[1]), frames))
+
+    slides = []
+    for (seconds, _), text in zip(frames, texts):
+        # Frames that differ only in the picture (e.g. a speaker inset) often read the same
+        if text and (not slides or slides[-1]["text"] != text):
+            slides.append({"start": seconds, "text": text})
+    return slides
+
+def _load_video_with_frames(file_bytes, store, key, executor=None):
+    """
+    Transcribe the audio and OCR sampled frames in parallel from one copy
+    of the video in MEDIA_TEMP_DIR. Returns (transcription, slides).
+    """
+    # moviepy opens videos by path
+    with media_path(file_bytes, suffix=".mp4") as video_path:
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            slides_future = pool.submit(_ocr_video_frames, video_path, executor)
+            transcription = store.get_or_transcribe(key, lambda: _transcribe_video(file_bytes, video_path))
             try:
-                os.unlink(temp_video_path)
-                os.unlink(temp_audio_path)
-            except Exception as cleanup_error:
-                logger.warning(f"Could not clean up temporary files: {cleanup_error}")
-    
+                slides = slides_future.result()
+            except Exception as e:
+                logger.warning(f"Could not OCR video frames: {e}")
+                slides = []
+        return transcription, slides
+
+def load_video(file_bytes, executor=None):
+    """
+    Extract audio from video file bytes and transcribe it in timestamped segments.
+    With VIDEO_FRAME_OCR, on-screen text is merged into a timeline with the
+    speech; frames are OCR'd in the executor when one is given.
+    """
+    try:
+        # Identical uploads share one transcription, stored with its duration
+        store = get_transcription_store()
+        key = transcript_key(file_bytes)
+        if VIDEO_FRAME_OCR:
+            transcription, slides = _load_video_with_frames(file_bytes, store, key, executor)
+        else:
+            transcription = store.get_or_transcribe(key, lambda: _transcribe_video(file_bytes))
+            slides = []
+
+        if not slides:
+            if transcription is None:
+                return "No audio track found in video"
+
+            if not transcription["text"]:
+                return "No speech detected in video audio"
+
+        # Format the output with metadata
+        result = [f"--- Video Transcription ---"]
+        if transcription is not None:
+            result.append(f"Duration: {transcription['duration']:.2f} seconds")
+
+        if slides:
+            speech = transcription["segments"] if transcription else []
+            result += [f"Timeline:", merge_timeline(speech, slides)]
+        else:
+            result += [f"Transcript:", format_transcript(transcription["segments"])]
+
+        return "\n\n".join(result)
+
     except Exception as e:
         logger.error(f"Error processing video: {e}")
         return f"Error processing video: {str(e)}"
-    
+
+def _transcribe_audio(file_bytes):
+    """
+    Decode an audio file in memory and transcribe it in segments.
+    Returns {"text", "duration", "segments"}.
+    """
+    logger.info("Decoding audio...")
+    audio = decode_audio(file_bytes)
+    if audio is None:
+        raise ValueError("No audio stream found in file")
+
+    logger.info(f"Audio duration: {len(audio) / 1000.0:.2f} seconds")
+    return transcribe_audio(audio)
+
 def load_audio(file_bytes):
     """
-    Process audio files (m4a, mp3, wav, etc.) and transcribe to text using OpenAI Whisper
+    Process audio files (m4a, mp3, wav, etc.) and transcribe them in timestamped segments
     """
     try:
-        # Create temporary files for audio processing
-        with tempfile.NamedTemporaryFile(suffix='.m4a', delete=False) as temp_input:
-            temp_input.write(file_bytes)
-            temp_input_path = temp_input.name
-        
-        with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as temp_output:
-            temp_output_path = temp_output.name
-        
-        try:
-            # Convert audio to WAV format for better compatibility with Whisper
-            logger.info("Converting audio to WAV format...")
-            audio = AudioSegment.from_file(temp_input_path)
-            
-            # Convert to mono and set sample rate for optimal Whisper performance
-            audio = audio.set_channels(1).set_frame_rate(16000)
-            audio.export(temp_output_path, format="wav")
-            
-            # Get audio duration for context
-            duration = len(audio) / 1000.0  # Convert milliseconds to seconds
-            logger.info(f"Audio duration: {duration:.2f} seconds")
-            
-            # Transcribe audio using OpenAI Whisper
-            logger.info("Transcribing audio to text...")
-            with open(temp_output_path, 'rb') as f:
-                transcript = client.audio.transcriptions.create(
-                    model="whisper-1",
-                    file=f
-                )
-            
-            if not transcript or not transcript.text.strip():
-                return "No speech detected in audio file"
-            
-            # Format the output with metadata
-            result = [
-                f"--- Audio Transcription ---",
-                f"Duration: {duration:.2f} seconds",
-                f"Transcript:",
-                transcript.text.strip()
-            ]
-            
-            return "\n\n".join(result)
-            
-        except Exception as e:
-            logger.error(f"Error during audio processing: {e}")
-            return f"Error processing audio: {str(e)}"
-        
-        finally:
-            # Clean up temporary files
-            try:
-                os.unlink(temp_input_path)
-                os.unlink(temp_output_path)
-            except Exception as cleanup_error:
-                logger.warning(f"Could not clean up temporary files: {cleanup_error}")
-    
+        # Identical uploads share one transcription, stored with its duration
+        store = get_transcription_store()
+        transcription = store.get_or_transcribe(transcript_key(file_bytes), lambda: _transcribe_audio(file_bytes))
+
+        if not transcription["text"]:
+            return "No speech detected in audio file"
+
+        # Format the output with metadata
+        result = [
+            f"--- Audio Transcription ---",
+            f"Duration: {transcription['duration']:.2f} seconds",
+            f"Transcript:",
+            format_transcript(transcription["segments"])
+        ]
+
+        return "\n\n".join(result)
+
     except Exception as e:
         logger.error(f"Error processing audio: {e}")
         return f"Error processing audio: {str(e)}"
-
-
-def normalize_text(text):
-    """
-    Helper function to clean and normalize extracted text
-    """
-    if not text:
-        return ""
-    
-    # Remove excessive whitespace
-    lines = text.split('\n')
-    cleaned_lines = []
-    
-    for line in lines:
-        cleaned_line = line.strip()
-        if cleaned_line:  # Only keep non-empty lines
-            cleaned_lines.append(cleaned_line)
-    
-    return '\n'.join(cleaned_lines)
\ No newline at end of file
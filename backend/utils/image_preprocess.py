@@ -0,0 +1,149 @@
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+OCR_PREPROCESS = os.getenv("OCR_PREPROCESS", "1") == "1"
+# Tesseract works best around 300 DPI; images are never upscaled
+OCR_TARGET_DPI = int(os.getenv("OCR_TARGET_DPI", 300))
+# Resolution assumed for images without DPI metadata (phone photos, screenshots)
+OCR_ASSUMED_DPI = int(os.getenv("OCR_ASSUMED_DPI", 300))
+# Hard cap on pixels handed to Tesseract after scaling
+OCR_MAX_MEGAPIXELS = float(os.getenv("OCR_MAX_MEGAPIXELS", 12))
+# Images taller than this are OCR'd as horizontal tiles in parallel
+OCR_TILE_HEIGHT = int(os.getenv("OCR_TILE_HEIGHT", 1200))
+OCR_DESKEW_MAX_ANGLE = float(os.getenv("OCR_DESKEW_MAX_ANGLE", 5))
+DESKEW_STEP = 0.5
+DESKEW_SAMPLE_WIDTH = 800
+
+
+def downscale(image, dpi=None):
+    """
+    Shrink the image to OCR_TARGET_DPI and at most OCR_MAX_MEGAPIXELS
+    """
+    from PIL import Image
+
+    if dpi is None:
+        dpi = image.info.get("dpi", (OCR_ASSUMED_DPI,))[0] or OCR_ASSUMED_DPI
+    scale = min(1.0, OCR_TARGET_DPI / float(dpi))
+
+    megapixels = image.width * image.height / 1_000_000
+    if megapixels * scale * scale > OCR_MAX_MEGAPIXELS:
+        scale = (OCR_MAX_MEGAPIXELS / megapixels) ** 0.5
+
+    if scale >= 0.99:
+        return image
+    size = (max(1, int(image.width * scale)), max(1, int(image.height * scale)))
+    return image.resize(size, Image.LANCZOS)
+
+
+def otsu_threshold(pixels):
+    """
+    Threshold that best separates dark text from the background (Otsu's method)
+    """
+    import numpy as np
+
+    histogram = np.bincount(pixels.ravel(), minlength=256).astype(np.float64)
+    total = pixels.size
+    levels = np.arange(256)
+
+    weight_background = np.cumsum(histogram)
+    weight_foreground = total - weight_background
+    cumulative_mean = np.cumsum(histogram * levels)
+    mean_background = cumulative_mean / np.maximum(weight_background, 1)
+    mean_foreground = (cumulative_mean[-1] - cumulative_mean) / np.maximum(weight_foreground, 1)
+
+    between_variance = weight_background * weight_foreground * (mean_background - mean_foreground) ** 2
+    return int(np.argmax(between_variance))
+
+
+def binarize(image):
+    """
+    Stretch contrast and convert a grayscale image to black text on white
+    """
+    import numpy as np
+    from PIL import Image, ImageOps
+
+    image = ImageOps.autocontrast(image, cutoff=1)
+    pixels = np.asarray(image)
+    threshold = otsu_threshold(pixels)
+    binary = np.where(pixels > threshold, 255, 0).astype(np.uint8)
+    # Light text on a dark slide: invert so text is dark
+    if (binary == 0).mean() > 0.5:
+        binary = 255 - binary
+    return Image.fromarray(binary)
+
+
+def estimate_skew(binary):
+    """
+    Angle (degrees) that makes text lines most horizontal, found by
+    maximizing the variance of the row ink profile on a small copy
+    """
+    import numpy as np
+    from PIL import Image, ImageOps
+
+    sample = binary
+    if sample.width > DESKEW_SAMPLE_WIDTH:
+        ratio = DESKEW_SAMPLE_WIDTH / sample.width
+        sample = sample.resize((DESKEW_SAMPLE_WIDTH, max(1, int(sample.height * ratio))), Image.BOX)
+    ink = ImageOps.invert(sample)
+
+    best_angle, best_score = 0.0, -1.0
+    for angle in np.arange(-OCR_DESKEW_MAX_ANGLE, OCR_DESKEW_MAX_ANGLE + DESKEW_STEP, DESKEW_STEP):
+        rotated = np.asarray(ink.rotate(float(angle), resample=Image.NEAREST, fillcolor=0), dtype=np.float32)
+        score = rotated.sum(axis=1).var()
+        if score > best_score:
+            best_angle, best_score = float(angle), score
+    return best_angle
+
+
+def deskew(binary):
+    from PIL import Image
+
+    angle = estimate_skew(binary)
+    if abs(angle) < DESKEW_STEP:
+        return binary
+    logger.info(f"Deskewing image by {angle:.1f} degrees")
+    return binary.rotate(angle, resample=Image.BICUBIC, expand=True, fillcolor=255)
+
+
+def preprocess_for_ocr(image, dpi=None):
+    """
+    Grayscale, downscale, binarize and deskew an image for Tesseract
+    """
+    from PIL import ImageOps
+
+    image = ImageOps.exif_transpose(image)
+    image = image.convert("L")
+    image = downscale(image, dpi)
+    image = binarize(image)
+    return deskew(image)
+
+
+def split_into_tiles(image, tile_height=OCR_TILE_HEIGHT):
+    """
+    Cut a tall image into horizontal bands, moving each cut to the nearest
+    blank row so no text line is split between two tiles
+    """
+    import numpy as np
+
+    if image.height <= tile_height * 1.5:
+        return [image]
+
+    pixels = np.asarray(image.convert("L"))
+    blank_rows = (pixels.min(axis=1) > 128)
+    search = tile_height // 4
+
+    tiles = []
+    top = 0
+    while image.height - top > tile_height * 1.5:
+        cut = top + tile_height
+        window = blank_rows[cut - search:cut + search]
+        blank = np.flatnonzero(window)
+        if blank.size:
+            # Blank row closest to the nominal cut
+            cut = cut - search + int(blank[np.argmin(np.abs(blank - search))])
+        tiles.append(image.crop((0, top, image.width, cut)))
+        top = cut
+    tiles.append(image.crop((0, top, image.width, image.height)))
+    return tiles
@@ -0,0 +1,241 @@
+import asyncio
+import logging
+import os
+import random
+import threading
+import time
+
+from dotenv import load_dotenv
+
+from utils.rate_limiter import PRIORITY_NORMAL, get_rate_limiter
+from utils.token_budget import count_message_tokens
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# "openai" calls the OpenAI API, "fake" answers in-process for offline runs and load tests (see utils.fake_llm)
+LLM_PROVIDER = os.getenv("LLM_PROVIDER", "openai")
+# Default per-call timeout and connect timeout (seconds); calls can pass their own timeout
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", 60))
+LLM_CONNECT_TIMEOUT = float(os.getenv("LLM_CONNECT_TIMEOUT", 5))
+# Keep-alive pool shared by every agent, so calls reuse TLS connections
+LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", 20))
+LLM_MAX_KEEPALIVE = int(os.getenv("LLM_MAX_KEEPALIVE", 10))
+LLM_KEEPALIVE_EXPIRY = float(os.getenv("LLM_KEEPALIVE_EXPIRY", 30))
+# HTTP/2 multiplexes concurrent calls over one connection; needs the h2 package
+LLM_HTTP2 = os.getenv("LLM_HTTP2", "0") == "1"
+# Retries on 429, 5xx and connection errors, with full-jitter exponential backoff
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", 4))
+LLM_BACKOFF_BASE = float(os.getenv("LLM_BACKOFF_BASE", 0.5))
+LLM_BACKOFF_MAX = float(os.getenv("LLM_BACKOFF_MAX", 20))
+
+_client = None
+_async_client = None
+_async_client_loop = None
+_client_lock = threading.Lock()
+
+
+def _http_options():
+    import httpx
+
+    http2 = LLM_HTTP2
+    if http2:
+        try:
+            import h2  # noqa: F401
+        except ImportError:
+            logger.warning("LLM_HTTP2=1 but the h2 package is not installed, using HTTP/1.1")
+            http2 = False
+    return {
+        "http2": http2,
+        "timeout": httpx.Timeout(LLM_TIMEOUT, connect=LLM_CONNECT_TIMEOUT),
+        "limits": httpx.Limits(max_connections=LLM_MAX_CONNECTIONS, max_keepalive_connections=LLM_MAX_KEEPALIVE,
+                               keepalive_expiry=LLM_KEEPALIVE_EXPIRY),
+    }
+
+
+def make_client(transport=None):
+    """
+    OpenAI client on a pooled httpx client. Retries are left to
+    with_retries, so the SDK's own are turned off. LLM_PROVIDER=fake
+    returns the offline fake instead, unless a transport is given.
+    """
+    if LLM_PROVIDER == "fake" and transport is None:
+        from utils.fake_llm import FakeOpenAI
+        return FakeOpenAI()
+
+    import httpx
+    from openai import OpenAI
+
+    http_client = httpx.Client(transport=transport, **_http_options())
+    return OpenAI(api_key=os.getenv("OPENAI_API_KEY"), http_client=http_client, max_retries=0)
+
+
+def make_async_client(transport=None):
+    if LLM_PROVIDER == "fake" and transport is None:
+        from utils.fake_llm import AsyncFakeOpenAI
+        return AsyncFakeOpenAI()
+
+    import httpx
+    from openai import AsyncOpenAI
+
+    http_client = httpx.AsyncClient(transport=transport, **_http_options())
+    return AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"), http_client=http_client, max_retries=0)
+
+
+def get_client():
+    """
+    Process-wide synchronous client, safe to share between threads
+    """
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = make_client()
+    return _client
+
+
+def get_async_client():
+    """
+    Async client for the running event loop. Its connections belong to
+    the loop, so a new loop (a new asyncio.run) gets a new client.
+    """
+    global _async_client, _async_client_loop
+    loop = asyncio.get_running_loop()
+    if _async_client is None or _async_client_loop is not loop:
+        _async_client = make_async_client()
+        _async_client_loop = loop
+    return _async_client
+
+
+async def close_clients():
+    """
+    Close the shared clients and their connections, called when the app stops
+    """
+    global _client, _async_client, _async_client_loop
+    with _client_lock:
+        client, _client = _client, None
+    if client is not None:
+        client.close()
+    if _async_client is not None and _async_client_loop is asyncio.get_running_loop():
+        await _async_client.close()
+    _async_client = _async_client_loop = None
+
+
+def retry_delay(attempt, error=None):
+    """
+    Seconds to wait before retry number attempt (1-based): the server's
+    Retry-After when it sends one, otherwise a random delay up to
+    LLM_BACKOFF_BASE * 2^(attempt - 1), capped at LLM_BACKOFF_MAX
+    """
+    response = getattr(error, "response", None)
+    retry_after = response.headers.get("retry-after") if response is not None else None
+    if retry_after:
+        try:
+            return min(float(retry_after), LLM_BACKOFF_MAX)
+        except ValueError:
+            pass
+    return random.uniform(0, min(LLM_BACKOFF_MAX, LLM_BACKOFF_BASE * 2 ** (attempt - 1)))
+
+
+def is_retryable(error):
+    """
+    Rate limits, server errors, timeouts and dropped connections
+    """
+    import openai
+
+    if isinstance(error, openai.APIConnectionError):
+        return True
+    if isinstance(error, openai.APIStatusError):
+        return error.status_code == 429 or error.status_code >= 500
+    return False
+
+
+def with_retries(call, *args, max_retries=None, **kwargs):
+    """
+    Call an SDK method, retrying retryable errors with backoff. The last
+    error is raised once the retries are used up.
+    """
+    max_retries = LLM_MAX_RETRIES if max_retries is None else max_retries
+    attempt = 0
+    while True:
+        try:
+            return call(*args, **kwargs)
+        except Exception as e:
+            attempt += 1
+            if attempt > max_retries or not is_retryable(e):
+                raise
+            delay = retry_delay(attempt, e)
+            logger.warning(f"LLM call failed ({e.__class__.__name__}), retry {attempt}/{max_retries} in {delay:.1f}s")
+            time.sleep(delay)
+
+
+async def with_retries_async(call, *args, max_retries=None, **kwargs):
+    max_retries = LLM_MAX_RETRIES if max_retries is None else max_retries
+    attempt = 0
+    while True:
+        try:
+            return await call(*args, **kwargs)
+        except Exception as e:
+            attempt += 1
+            if attempt > max_retries or not is_retryable(e):
+                raise
+            delay = retry_delay(attempt, e)
+            logger.warning(f"LLM call failed ({e.__class__.__name__}), retry {attempt}/{max_retries} in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+
+def call_timeout(timeout=None):
+    """
+    Per-call timeout that keeps the short connect timeout
+    """
+    import httpx
+
+    return httpx.Timeout(timeout or LLM_TIMEOUT, connect=LLM_CONNECT_TIMEOUT)
+
+
+def estimate_request_tokens(kwargs, completion_tokens=None):
+    """
+    Tokens a chat call is charged against the TPM budget before it runs:
+    the prompt plus max_tokens, or the caller's completion estimate
+    """
+    prompt_tokens = count_message_tokens(kwargs.get("messages", []), kwargs.get("model", "gpt-3.5-turbo"))
+    return prompt_tokens + (kwargs.get("max_tokens") or completion_tokens or 0)
+
+
+def _settle_usage(model, estimated_tokens, response):
+    usage = getattr(response, "usage", None)
+    if usage is not None and usage.total_tokens:
+        get_rate_limiter().settle(model, estimated_tokens, usage.total_tokens)
+
+
+def chat_completion(timeout=None, priority=PRIORITY_NORMAL, completion_tokens=None, **kwargs):
+    """
+    client.chat.completions.create on the shared client, with retries and
+    a per-call timeout (LLM_TIMEOUT by default). Each attempt first waits
+    for the model's rate limit budget at the given priority.
+    stream=True returns the stream once the response has started.
+    """
+    model = kwargs["model"]
+    estimated_tokens = estimate_request_tokens(kwargs, completion_tokens)
+
+    def attempt():
+        get_rate_limiter().acquire(model, estimated_tokens, priority)
+        return get_client().chat.completions.create(timeout=call_timeout(timeout), **kwargs)
+
+    response = with_retries(attempt)
+    _settle_usage(model, estimated_tokens, response)
+    return response
+
+
+async def chat_completion_async(timeout=None, priority=PRIORITY_NORMAL, completion_tokens=None, **kwargs):
+    model = kwargs["model"]
+    estimated_tokens = estimate_request_tokens(kwargs, completion_tokens)
+    client = get_async_client()
+
+    async def attempt():
+        await get_rate_limiter().acquire_async(model, estimated_tokens, priority)
+        return await client.chat.completions.create(timeout=call_timeout(timeout), **kwargs)
+
+    response = await with_retries_async(attempt)
+    _settle_usage(model, estimated_tokens, response)
+    return response
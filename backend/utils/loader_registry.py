@@ -0,0 +1,217 @@
+import csv
+import importlib
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional
+
+import filetype
+
+logger = logging.getLogger(__name__)
+
+# Bytes inspected when sniffing content; magic numbers all sit in the first few KB
+SNIFF_BYTES = 8192
+# File types whose parsing libraries are imported in the background after
+# startup: "all", or a comma-separated list such as "pdf,csv". Empty loads them on first use.
+PREWARM_LOADERS = os.getenv("PREWARM_LOADERS", "")
+
+
+# Control bytes that do not appear in text files
+BINARY_BYTES = bytes(range(0, 9)) + bytes(range(14, 27)) + bytes(range(28, 32))
+
+
+def looks_like_text(head):
+    """
+    Whether the first bytes of a file look like text in any common
+    encoding: UTF-16 with a BOM, or no NUL and few control bytes
+    """
+    if head.startswith((b"\xff\xfe", b"\xfe\xff")):
+        return True
+    if not head or b"\x00" in head:
+        return not head
+    control = len(head) - len(head.translate(None, BINARY_BYTES))
+    return control / len(head) < 0.01
+
+
+def looks_like_csv(head):
+    """
+    Text whose first lines share a delimiter
+    """
+    if not looks_like_text(head):
+        return False
+    sample = head.decode("utf-8", errors="ignore")
+    lines = sample.splitlines()[:20]
+    if len(lines) < 2:
+        return False
+    try:
+        dialect = csv.Sniffer().sniff("\n".join(lines), delimiters=",;\t|")
+    except csv.Error:
+        return False
+    return lines[0].count(dialect.delimiter) > 0
+
+
+@dataclass
+class LoaderSpec:
+    """
+    One supported file type. loader is a "module:function" path imported
+    on first use, so heavy parsing libraries load only when a file needs
+    them. pool names the executor the loader runs in: "cpu", "io", or
+    "fanout" for loaders that run in an I/O thread and take the process
+    pool as their executor argument. mime_types may end in "/*". Text formats have no magic number
+    and declare sniff(head) to recognize their content instead.
+    container_types are MIME types this format also arrives in, accepted
+    only when the file name says it is this type. warm_imports lists the
+    heavy modules the loader imports on first use, for prewarm_loaders.
+    """
+    file_type: str
+    loader: str
+    pool: str
+    extensions: List[str] = field(default_factory=list)
+    mime_types: List[str] = field(default_factory=list)
+    sniff: Optional[Callable] = None
+    container_types: List[str] = field(default_factory=list)
+    warm_imports: List[str] = field(default_factory=list)
+
+    def accepts_mime(self, mime, containers=False):
+        patterns = self.mime_types + self.container_types if containers else self.mime_types
+        return any(mime == pattern or (pattern.endswith("/*") and mime.startswith(pattern[:-1]))
+                   for pattern in patterns)
+
+    def accepts_name(self, filename):
+        return os.path.splitext(filename.lower())[1] in self.extensions
+
+
+_specs: List[LoaderSpec] = []
+_resolved = {}
+
+
+def register_loader(spec):
+    """
+    Add a file type. Specs registered earlier win when several accept the same content.
+    """
+    _specs.append(spec)
+    return spec
+
+
+def resolve_loader(spec):
+    """
+    Import the loader function of a spec. Returns (function, cache version),
+    the version coming from the loader module's LOADER_VERSIONS.
+    """
+    if spec.loader not in _resolved:
+        module_name, function_name = spec.loader.split(":")
+        module = importlib.import_module(module_name)
+        version = getattr(module, "LOADER_VERSIONS", {}).get(function_name, 1)
+        _resolved[spec.loader] = (getattr(module, function_name), version)
+    return _resolved[spec.loader]
+
+
+def prewarm_loaders(file_types=PREWARM_LOADERS):
+    """
+    Import the loaders of the given file types ("all" or a comma-separated
+    list) and the libraries they load lazily, so the first upload of each
+    type does not wait for them. Returns the seconds spent.
+    """
+    wanted = {name.strip() for name in file_types.split(",") if name.strip()}
+    start = time.perf_counter()
+    for spec in _specs:
+        if "all" not in wanted and spec.file_type not in wanted:
+            continue
+        try:
+            resolve_loader(spec)
+            for module_name in spec.warm_imports:
+                importlib.import_module(module_name)
+        except Exception as e:
+            logger.warning(f"Could not prewarm the {spec.file_type} loader: {e}")
+    elapsed = time.perf_counter() - start
+    logger.info(f"Prewarmed loaders for {', '.join(sorted(wanted))} in {elapsed:.2f}s")
+    return elapsed
+
+
+def spec_for_name(filename):
+    for spec in _specs:
+        if spec.accepts_name(filename):
+            return spec
+    return None
+
+
+def detect_loader(filename, file_bytes):
+    """
+    Pick the spec for an upload. Returns (spec, detected MIME type or None).
+
+    Content wins over the name: magic bytes are checked first, and the
+    extension only breaks ties between types sharing a container (an .m4a
+    is an MP4 file) or covers files without a magic number. Text formats
+    are confirmed with their sniffers, so a binary file named .csv is
+    rejected instead of reaching the CSV parser.
+    """
+    head = bytes(file_bytes[:SNIFF_BYTES])
+    by_name = spec_for_name(filename)
+
+    kind = filetype.guess(head)
+    if kind is not None:
+        if by_name is not None and by_name.accepts_mime(kind.mime, containers=True):
+            return by_name, kind.mime
+        for spec in _specs:
+            if spec.accepts_mime(kind.mime):
+                if by_name is not None:
+                    logger.info(f"{filename} looks like {kind.mime}, using the {spec.file_type} loader")
+                return spec, kind.mime
+        # Magic number of a format we do not parse
+        return None, kind.mime
+
+    # A named text file only has to look like text; a CSV may have one column
+    if by_name is not None and (by_name.sniff is None or looks_like_text(head)):
+        return by_name, None
+
+    for spec in _specs:
+        if spec.sniff is not None and spec.sniff(head):
+            return spec, None
+    return None, None
+
+
+def get_file_type(filename):
+    """
+    File type category of a filename, from the registered extensions
+    """
+    spec = spec_for_name(filename)
+    return spec.file_type if spec else "unknown"
+
+
+register_loader(LoaderSpec(
+    "pdf", "utils.file_loader:load_pdf", "fanout",
+    extensions=[".pdf"], mime_types=["application/pdf"],
+    warm_imports=["pdfplumber", "pypdfium2", "pytesseract"],
+))
+register_loader(LoaderSpec(
+    "image", "utils.file_loader:load_image", "cpu",
+    extensions=[".jpg", ".jpeg", ".png", ".gif", ".bmp", ".tiff"], mime_types=["image/*"],
+    warm_imports=["pytesseract"],
+))
+register_loader(LoaderSpec(
+    "csv", "utils.file_loader:load_csv", "cpu",
+    extensions=[".csv"], mime_types=["text/csv"], sniff=looks_like_csv,
+    warm_imports=["utils.tabular"],
+))
+register_loader(LoaderSpec(
+    "text", "utils.file_loader:load_text", "io",
+    extensions=[".txt", ".md", ".rtf"], mime_types=["text/*", "application/rtf"], sniff=looks_like_text,
+))
+register_loader(LoaderSpec(
+    "excel", "utils.file_loader:load_excel", "cpu",
+    extensions=[".xlsx", ".xls"],
+    mime_types=["application/vnd.ms-excel", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"],
+    container_types=["application/zip"],
+    warm_imports=["utils.tabular", "openpyxl"],
+))
+register_loader(LoaderSpec(
+    "audio", "utils.file_loader:load_audio", "io",
+    extensions=[".m4a", ".mp3", ".wav", ".aac", ".flac", ".ogg"],
+    mime_types=["audio/*"], container_types=["video/mp4", "video/webm", "video/x-matroska"],
+))
+register_loader(LoaderSpec(
+    "video", "utils.file_loader:load_video", "fanout",
+    extensions=[".mp4", ".avi", ".mov", ".mkv", ".webm", ".flv", ".wmv"], mime_types=["video/*"],
+    warm_imports=["moviepy.editor"],
+))
@@ -0,0 +1,162 @@
+import io
+import logging
+import mmap
+import os
+import shutil
+import struct
+import subprocess
+import tempfile
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+
+def _find_ffmpeg():
+    path = shutil.which("ffmpeg")
+    if path:
+        return path
+    try:
+        # Bundled with moviepy's imageio-ffmpeg dependency
+        import imageio_ffmpeg
+        return imageio_ffmpeg.get_ffmpeg_exe()
+    except Exception as e:
+        logger.warning(f"ffmpeg not found, media decoding will fail: {e}")
+        return "ffmpeg"
+
+
+FFMPEG_BINARY = _find_ffmpeg()
+
+# Where media goes when a library needs a file path; RAM-backed tmpfs when available
+MEDIA_TEMP_DIR = os.getenv("MEDIA_TEMP_DIR") or (
+    "/dev/shm" if os.path.isdir("/dev/shm") and os.access("/dev/shm", os.W_OK) else tempfile.gettempdir()
+)
+# Inputs larger than this are decoded into a memory-mapped file instead of a pipe buffer
+MEDIA_MMAP_BYTES = int(os.getenv("MEDIA_MMAP_MB", 32)) * 1024 * 1024
+
+SAMPLE_WIDTH = 2
+NO_AUDIO_MESSAGES = ("matches no streams", "does not contain any stream")
+
+
+def audio_segment_class():
+    """
+    pydub's AudioSegment, imported on first use. pydub shells out to
+    ffmpeg as well, so it is pointed at FFMPEG_BINARY.
+    """
+    from pydub import AudioSegment
+
+    AudioSegment.converter = FFMPEG_BINARY
+    return AudioSegment
+
+
+@contextmanager
+def media_path(file_bytes, suffix=""):
+    """
+    Yield a path to a copy of file_bytes in MEDIA_TEMP_DIR, for libraries
+    that only open files by name. The copy is removed on exit.
+    """
+    with tempfile.NamedTemporaryFile(suffix=suffix, dir=MEDIA_TEMP_DIR, delete=False) as temp_media:
+        temp_media.write(file_bytes)
+        path = temp_media.name
+    try:
+        yield path
+    finally:
+        try:
+            os.unlink(path)
+        except Exception as cleanup_error:
+            logger.warning(f"Could not clean up temporary files: {cleanup_error}")
+
+
+def is_streamable(file_bytes):
+    """
+    Whether ffmpeg can decode the bytes from a pipe. MP4/MOV/M4A files
+    need seeking unless their index (moov box) comes before the media
+    data (mdat box); other containers stream.
+    """
+    if bytes(file_bytes[4:8]) != b"ftyp":
+        return True
+
+    offset = 0
+    while offset + 8 <= len(file_bytes):
+        size, box_type = struct.unpack(">I4s", bytes(file_bytes[offset:offset + 8]))
+        if box_type == b"moov":
+            return True
+        if box_type == b"mdat":
+            return False
+        if size == 1 and offset + 16 <= len(file_bytes):
+            size = struct.unpack(">Q", bytes(file_bytes[offset + 8:offset + 16]))[0]
+        if size < 8:
+            return False
+        offset += size
+    return False
+
+
+def decode_audio(file_bytes, sample_rate=16000, path=None):
+    """
+    Decode the first audio stream of any media ffmpeg reads into a 16-bit
+    mono AudioSegment, without writing the input to disk when it can be
+    piped. Large results are memory-mapped rather than held in a pipe
+    buffer. Returns None if the media has no audio stream.
+    """
+    if path is None and not is_streamable(file_bytes):
+        with media_path(file_bytes) as temp_path:
+            return decode_audio(file_bytes, sample_rate, path=temp_path)
+
+    source = path or "pipe:0"
+    spool = len(file_bytes) > MEDIA_MMAP_BYTES
+    if spool:
+        output = tempfile.NamedTemporaryFile(suffix=".pcm", dir=MEDIA_TEMP_DIR, delete=False)
+        output.close()
+        target = output.name
+    else:
+        target = "pipe:1"
+
+    command = [FFMPEG_BINARY, "-hide_banner", "-loglevel", "error", "-y", "-i", source, "-map", "0:a:0",
+               "-ac", "1", "-ar", str(sample_rate), "-f", "s16le", target]
+    try:
+        result = subprocess.run(command, input=None if path else memoryview(file_bytes),
+                                stdin=subprocess.DEVNULL if path else None, capture_output=True)
+        if result.returncode != 0:
+            error = result.stderr.decode("utf-8", "replace").strip()
+            if any(message in error for message in NO_AUDIO_MESSAGES):
+                return None
+            raise RuntimeError(f"ffmpeg could not decode media: {error[-500:]}")
+
+        if not spool:
+            data = result.stdout
+        elif os.path.getsize(target) == 0:
+            data = b""
+        else:
+            with open(target, "rb") as f:
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return audio_segment_class()(data=data, sample_width=SAMPLE_WIDTH, frame_rate=sample_rate, channels=1)
+
+    finally:
+        if spool:
+            # The mapping keeps the data readable after the name is gone
+            os.unlink(target)
+
+
+def encode_audio(audio, audio_format, codec=None, bitrate=None):
+    """
+    Encode an AudioSegment through ffmpeg pipes. Returns a BytesIO with a
+    file name, which upload clients and decoders accept like an open file.
+    """
+    buffer = io.BytesIO()
+    if audio_format == "wav":
+        audio.export(buffer, format="wav")
+    else:
+        command = [FFMPEG_BINARY, "-hide_banner", "-loglevel", "error",
+                   "-f", "s16le", "-ar", str(audio.frame_rate), "-ac", str(audio.channels), "-i", "pipe:0"]
+        if codec:
+            command += ["-c:a", codec]
+        if bitrate:
+            command += ["-b:a", bitrate]
+        command += ["-f", audio_format, "pipe:1"]
+        result = subprocess.run(command, input=audio.raw_data, capture_output=True)
+        if result.returncode != 0:
+            raise RuntimeError(f"ffmpeg could not encode audio: {result.stderr.decode('utf-8', 'replace')[-500:]}")
+        buffer.write(result.stdout)
+
+    buffer.seek(0)
+    buffer.name = f"segment.{audio_format}"
+    return buffer
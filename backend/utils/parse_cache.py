@@ -0,0 +1,125 @@
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+from utils.disk_store import SizeBoundedDirectory
+
+logger = logging.getLogger(__name__)
+
+PARSE_CACHE_ENABLED = os.getenv("PARSE_CACHE_ENABLED", "1") == "1"
+PARSE_CACHE_MEMORY_ITEMS = int(os.getenv("PARSE_CACHE_MEMORY_ITEMS", 256))
+PARSE_CACHE_DISK_MB = int(os.getenv("PARSE_CACHE_DISK_MB", 512))
+PARSE_CACHE_DIR = os.getenv("PARSE_CACHE_DIR", os.path.join(tempfile.gettempdir(), "autobrief-cache", "parse"))
+
+
+class ParseCache:
+    """
+    Two-tier cache for extracted file text: an in-memory LRU in front of a
+    size-bounded directory on disk. Keys are content hashes, so any worker
+    process sharing the directory benefits from the disk tier.
+    """
+
+    def __init__(self, cache_dir=PARSE_CACHE_DIR, memory_items=PARSE_CACHE_MEMORY_ITEMS,
+                 disk_bytes=PARSE_CACHE_DISK_MB * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.memory_items = memory_items
+        self.disk_bytes = disk_bytes
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "writes": 0, "evictions": 0}
+
+        self._disk = SizeBoundedDirectory(self.cache_dir, ".txt", self.disk_bytes) if self.disk_bytes > 0 else None
+
+    @staticmethod
+    def make_key(file_bytes, loader_name, loader_version):
+        """
+        Build a cache key from the content hash plus the loader that produced the text
+        """
+        digest = hashlib.sha256(file_bytes).hexdigest()
+        return f"{digest}-{loader_name}-v{loader_version}"
+
+    def _path(self, key):
+        return self._disk.path(key)
+
+    def get(self, key):
+        """
+        Return cached text for key, or None on a miss
+        """
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self._stats["memory_hits"] += 1
+                return self._memory[key]
+
+        text = None
+        if self._disk is not None:
+            try:
+                text = self._disk.read(key)
+            except Exception as e:
+                logger.warning(f"Could not read parse cache entry {key}: {e}")
+
+        with self._lock:
+            if text is None:
+                self._stats["misses"] += 1
+                return None
+            self._stats["disk_hits"] += 1
+            self._remember(key, text)
+        return text
+
+    def lookup(self, file_bytes, loader_name, loader_version):
+        """
+        Hash the upload and read the cache in one call, so both run off the
+        event loop. Returns (key, text) with text None on a miss.
+        """
+        key = self.make_key(file_bytes, loader_name, loader_version)
+        return key, self.get(key)
+
+    def set(self, key, text):
+        """
+        Store text in both tiers
+        """
+        with self._lock:
+            self._remember(key, text)
+            self._stats["writes"] += 1
+
+        if self._disk is None:
+            return
+        try:
+            evicted = self._disk.write(key, text)
+        except Exception as e:
+            logger.warning(f"Could not write parse cache entry {key}: {e}")
+            return
+        with self._lock:
+            self._stats["evictions"] += evicted
+
+    def _remember(self, key, text):
+        self._memory[key] = text
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_items:
+            self._memory.popitem(last=False)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats["memory_items"] = len(self._memory)
+        lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+        stats["hit_rate"] = round((stats["memory_hits"] + stats["disk_hits"]) / lookups, 3) if lookups else 0.0
+        return stats
+
+
+_parse_cache = None
+
+
+def get_parse_cache():
+    """
+    Process-wide parse cache, or None when caching is disabled
+    """
+    global _parse_cache
+    if not PARSE_CACHE_ENABLED:
+        return None
+    if _parse_cache is None:
+        _parse_cache = ParseCache()
+    return _parse_cache
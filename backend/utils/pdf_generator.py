@@ -1,13 +1,26 @@
-from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import letter
 import textwrap
+import io
 
 
 def generate_pdf(text, filename="brief_output.pdf"):
     """
-    Generate pdf with nice spacing and formatting - fixed for multi-page
+    Generate pdf file on disk and return its path
     """
-    c = canvas.Canvas(filename, pagesize=letter)
+    with open(filename, "wb") as f:
+        f.write(render_pdf(text))
+    return filename
+
+
+def render_pdf(text):
+    """
+    Generate pdf with nice spacing and formatting - fixed for multi-page.
+    Renders into memory and returns the PDF bytes.
+    """
+    from reportlab.lib.pagesizes import letter
+    from reportlab.pdfgen import canvas
+
+    buffer = io.BytesIO()
+    c = canvas.Canvas(buffer, pagesize=letter)
     width, height = letter
     
     # Page settings
@@ -84,4 +97,4 @@ def generate_pdf(text, filename="brief_output.pdf"):
             y -= line_height
     
     c.save()
-    return filename
\ No newline at end of file
+    return buffer.getvalue()
\ No newline at end of file
@@ -0,0 +1,84 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Stage:
+    """
+    One step of a pipeline. run is an async function that receives the
+    results of earlier stages by name. fallback(results, error) supplies a
+    result when the stage fails or times out.
+    """
+    name: str
+    run: Callable
+    depends_on: List[str] = field(default_factory=list)
+    timeout: Optional[float] = None
+    fallback: Optional[Callable] = None
+
+
+class StageError(Exception):
+    def __init__(self, stage_name, error):
+        super().__init__(f"Stage '{stage_name}' failed: {error}")
+        self.stage_name = stage_name
+        self.error = error
+
+
+async def run_stages(stages: List[Stage], initial: Optional[Dict[str, Any]] = None):
+    """
+    Run stages as soon as their dependencies finish, so independent stages
+    run in parallel. Returns (results, timings) keyed by stage name.
+    Raises StageError for a failed stage without a fallback.
+    """
+    results = dict(initial or {})
+    timings = {}
+    by_name = {stage.name: stage for stage in stages}
+
+    for stage in stages:
+        missing = [dep for dep in stage.depends_on if dep not in by_name and dep not in results]
+        if missing:
+            raise ValueError(f"Stage '{stage.name}' depends on unknown stages: {missing}")
+
+    async def execute(stage):
+        start = time.perf_counter()
+        try:
+            value = await asyncio.wait_for(stage.run(results), timeout=stage.timeout)
+            status = "ok"
+        except Exception as e:
+            if isinstance(e, asyncio.TimeoutError):
+                e = TimeoutError(f"timed out after {stage.timeout}s")
+            if stage.fallback is None:
+                timings[stage.name] = {"seconds": round(time.perf_counter() - start, 3), "status": "failed"}
+                raise StageError(stage.name, e) from e
+            logger.warning(f"Stage '{stage.name}' failed, using fallback: {e}")
+            value = stage.fallback(results, e)
+            status = "fallback"
+        timings[stage.name] = {"seconds": round(time.perf_counter() - start, 3), "status": status}
+        return stage.name, value
+
+    pending = {stage.name: stage for stage in stages}
+    running = {}
+    try:
+        while pending or running:
+            for name, stage in list(pending.items()):
+                if all(dep in results for dep in stage.depends_on):
+                    running[asyncio.ensure_future(execute(stage))] = name
+                    del pending[name]
+
+            if not running:
+                raise ValueError(f"Stages have circular dependencies: {sorted(pending)}")
+
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                del running[task]
+                name, value = task.result()
+                results[name] = value
+    finally:
+        for task in running:
+            task.cancel()
+
+    return results, timings
@@ -0,0 +1,291 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import os
+import threading
+import time
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+# Requests and tokens per minute allowed for each model (0 = no limit).
+# LLM_RATE_LIMITS overrides them per model, e.g. "gpt-3.5-turbo=3500/90000,whisper-1=50/0".
+LLM_RPM_LIMIT = int(os.getenv("LLM_RPM_LIMIT", 0))
+LLM_TPM_LIMIT = int(os.getenv("LLM_TPM_LIMIT", 0))
+LLM_RATE_LIMITS = os.getenv("LLM_RATE_LIMITS", "")
+# Bursts may use this many seconds of budget at once; providers enforce limits over short windows
+LLM_RATE_BURST_SECONDS = float(os.getenv("LLM_RATE_BURST_SECONDS", 10))
+# Longest a call waits in the queue before giving up
+LLM_QUEUE_TIMEOUT = float(os.getenv("LLM_QUEUE_TIMEOUT", 120))
+
+# Lower numbers are served first
+PRIORITY_INTERACTIVE = 0
+PRIORITY_NORMAL = 1
+PRIORITY_BATCH = 2
+PRIORITY_NAMES = {PRIORITY_INTERACTIVE: "interactive", PRIORITY_NORMAL: "normal", PRIORITY_BATCH: "batch"}
+
+WAIT_SAMPLES = 500
+ASYNC_POLL_SECONDS = 0.05
+
+
+class QueueTimeout(Exception):
+    pass
+
+
+def parse_rate_limits(spec):
+    """
+    {"model": (rpm, tpm)} from "model=rpm/tpm,..."
+    """
+    limits = {}
+    for item in spec.split(","):
+        if not item.strip():
+            continue
+        model, _, values = item.partition("=")
+        rpm, _, tpm = values.partition("/")
+        limits[model.strip()] = (int(rpm or 0), int(tpm or 0))
+    return limits
+
+
+class TokenBucket:
+    """
+    Refills at rate_per_minute, holding at most LLM_RATE_BURST_SECONDS of
+    it. A take larger than the bucket waits for a full bucket and leaves
+    it in debt, so the long-run rate still holds. clock returns seconds
+    (time.monotonic by default).
+    """
+
+    def __init__(self, rate_per_minute, burst_seconds=LLM_RATE_BURST_SECONDS, clock=time.monotonic):
+        self.rate = rate_per_minute / 60
+        self.capacity = max(1.0, self.rate * burst_seconds)
+        self.level = self.capacity
+        self.updated = clock()
+
+    def refill(self, now):
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount):
+        """
+        Seconds until amount can be taken, after a refill
+        """
+        needed = min(amount, self.capacity) - self.level
+        return max(0.0, needed / self.rate)
+
+    def take(self, amount):
+        self.level -= amount
+
+    def give_back(self, amount):
+        self.level = min(self.capacity, self.level + amount)
+
+
+class ModelLimiter:
+    """
+    Requests-per-minute and tokens-per-minute buckets for one model, with
+    a priority queue in front of them. Only the head of the queue may
+    take from the buckets, so a large interactive request is not starved
+    by a stream of small batch ones. Refills and waits are measured with
+    clock; tests pass a manual one.
+    """
+
+    def __init__(self, model, rpm, tpm, clock=time.monotonic):
+        self.model = model
+        self.rpm = rpm
+        self.tpm = tpm
+        self.clock = clock
+        self.requests = TokenBucket(rpm, clock=clock) if rpm else None
+        self.tokens = TokenBucket(tpm, clock=clock) if tpm else None
+        self.condition = threading.Condition()
+        self.queue = []
+        self.order = itertools.count()
+        self.admitted = 0
+        self.timeouts = 0
+        self.waits = deque(maxlen=WAIT_SAMPLES)
+
+    def _wait_time(self, tokens):
+        now = self.clock()
+        wait = 0.0
+        if self.requests is not None:
+            self.requests.refill(now)
+            wait = max(wait, self.requests.wait_time(1))
+        if self.tokens is not None and tokens:
+            self.tokens.refill(now)
+            wait = max(wait, self.tokens.wait_time(tokens))
+        return wait
+
+    def _try_admit(self, entry, tokens):
+        """
+        Take from the buckets if entry heads the queue and the budget is
+        there. Returns 0 when admitted, otherwise how long to wait (None
+        until the entry reaches the head). Called with the condition held.
+        """
+        if self.queue[0] is not entry:
+            return None
+        wait = self._wait_time(tokens)
+        if wait > 0:
+            return wait
+        if self.requests is not None:
+            self.requests.take(1)
+        if self.tokens is not None:
+            self.tokens.take(tokens)
+        heapq.heappop(self.queue)
+        self.condition.notify_all()
+        return 0
+
+    def _leave(self, entry, timed_out=True):
+        self.queue.remove(entry)
+        heapq.heapify(self.queue)
+        if timed_out:
+            self.timeouts += 1
+        self.condition.notify_all()
+
+    def _record(self, waited):
+        self.admitted += 1
+        self.waits.append(waited)
+        return waited
+
+    def wait_time(self, tokens=0):
+        """
+        Seconds until a call of tokens would have the budget, ignoring the queue
+        """
+        with self.condition:
+            return self._wait_time(tokens)
+
+    def admit_unlimited(self):
+        with self.condition:
+            return self._record(0.0)
+
+    def acquire(self, tokens=0, priority=PRIORITY_NORMAL, timeout=LLM_QUEUE_TIMEOUT):
+        """
+        Block until the call may go out. Returns the seconds spent waiting;
+        raises QueueTimeout after timeout seconds.
+        """
+        start = self.clock()
+        with self.condition:
+            entry = [priority, next(self.order)]
+            heapq.heappush(self.queue, entry)
+            while True:
+                wait = self._try_admit(entry, tokens)
+                if wait == 0:
+                    return self._record(self.clock() - start)
+                remaining = timeout - (self.clock() - start)
+                if remaining <= 0:
+                    self._leave(entry)
+                    raise QueueTimeout(f"Waited {timeout:.0f}s for {self.model} rate limit budget")
+                self.condition.wait(remaining if wait is None else min(wait, remaining))
+
+    async def acquire_async(self, tokens=0, priority=PRIORITY_NORMAL, timeout=LLM_QUEUE_TIMEOUT):
+        """
+        acquire for coroutines. Shares the queue with threads, polling
+        instead of blocking the event loop.
+        """
+        start = self.clock()
+        with self.condition:
+            entry = [priority, next(self.order)]
+            heapq.heappush(self.queue, entry)
+        while True:
+            with self.condition:
+                wait = self._try_admit(entry, tokens)
+                if wait == 0:
+                    return self._record(self.clock() - start)
+                remaining = timeout - (self.clock() - start)
+                if remaining <= 0:
+                    self._leave(entry)
+                    raise QueueTimeout(f"Waited {timeout:.0f}s for {self.model} rate limit budget")
+            try:
+                await asyncio.sleep(min(ASYNC_POLL_SECONDS if wait is None else wait, remaining))
+            except asyncio.CancelledError:
+                with self.condition:
+                    self._leave(entry, timed_out=False)
+                raise
+
+    def settle(self, estimated_tokens, actual_tokens):
+        """
+        Correct the token bucket once the real usage of a call is known
+        """
+        if self.tokens is None:
+            return
+        with self.condition:
+            if actual_tokens < estimated_tokens:
+                self.tokens.give_back(estimated_tokens - actual_tokens)
+            else:
+                self.tokens.take(actual_tokens - estimated_tokens)
+            self.condition.notify_all()
+
+    def stats(self):
+        with self.condition:
+            waits = sorted(self.waits)
+            waiting = {}
+            for priority, _ in self.queue:
+                name = PRIORITY_NAMES.get(priority, str(priority))
+                waiting[name] = waiting.get(name, 0) + 1
+            return {
+                "rpm_limit": self.rpm,
+                "tpm_limit": self.tpm,
+                "queue_depth": len(self.queue),
+                "waiting": waiting,
+                "admitted": self.admitted,
+                "timeouts": self.timeouts,
+                "wait_seconds": {
+                    "p50": round(waits[len(waits) // 2], 3) if waits else 0.0,
+                    "p95": round(waits[int(len(waits) * 0.95)], 3) if waits else 0.0,
+                    "max": round(waits[-1], 3) if waits else 0.0,
+                },
+            }
+
+
+class RateLimiter:
+    """
+    One ModelLimiter per model, created on first use
+    """
+
+    def __init__(self, default_rpm=LLM_RPM_LIMIT, default_tpm=LLM_TPM_LIMIT, limits=None):
+        self.default_limits = (default_rpm, default_tpm)
+        self.limits = parse_rate_limits(LLM_RATE_LIMITS) if limits is None else limits
+        self.models = {}
+        self.lock = threading.Lock()
+
+    def for_model(self, model):
+        with self.lock:
+            if model not in self.models:
+                rpm, tpm = self.limits.get(model, self.default_limits)
+                self.models[model] = ModelLimiter(model, rpm, tpm)
+            return self.models[model]
+
+    def acquire(self, model, tokens=0, priority=PRIORITY_NORMAL, timeout=LLM_QUEUE_TIMEOUT):
+        limiter = self.for_model(model)
+        if limiter.requests is None and limiter.tokens is None:
+            return limiter.admit_unlimited()
+        waited = limiter.acquire(tokens, priority, timeout)
+        if waited > 1:
+            logger.info(f"Waited {waited:.1f}s for {model} rate limit budget")
+        return waited
+
+    async def acquire_async(self, model, tokens=0, priority=PRIORITY_NORMAL, timeout=LLM_QUEUE_TIMEOUT):
+        limiter = self.for_model(model)
+        if limiter.requests is None and limiter.tokens is None:
+            return limiter.admit_unlimited()
+        return await limiter.acquire_async(tokens, priority, timeout)
+
+    def settle(self, model, estimated_tokens, actual_tokens):
+        self.for_model(model).settle(estimated_tokens, actual_tokens)
+
+    def stats(self):
+        with self.lock:
+            limiters = list(self.models.values())
+        return {limiter.model: limiter.stats() for limiter in limiters}
+
+
+_rate_limiter = None
+_rate_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter():
+    """
+    Process-wide limiter shared by every LLM call
+    """
+    global _rate_limiter
+    with _rate_limiter_lock:
+        if _rate_limiter is None:
+            _rate_limiter = RateLimiter()
+    return _rate_limiter
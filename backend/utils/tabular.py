@@ -0,0 +1,403 @@
+import io
+import logging
+import os
+
+import numpy as np
+import pandas as pd
+from pandas.io.parsers import TextParser
+
+logger = logging.getLogger(__name__)
+
+# Rows read per pass; memory stays bounded by one chunk regardless of file size
+CSV_CHUNK_ROWS = int(os.getenv("CSV_CHUNK_ROWS", 50_000))
+EXCEL_CHUNK_ROWS = int(os.getenv("EXCEL_CHUNK_ROWS", 10_000))
+
+# Tall tables are profiled from a uniform sample of rows, wide ones up to a column limit
+PROFILE_SAMPLE_ROWS = int(os.getenv("PROFILE_SAMPLE_ROWS", 20_000))
+PROFILE_MAX_COLUMNS = int(os.getenv("PROFILE_MAX_COLUMNS", 40))
+PROFILE_TOP_VALUES = 3
+
+NUMERIC_KINDS = {"i", "u", "f"}
+ISO_DATE = r"^\d{4}-\d{2}-\d{2}"
+
+
+class BufferReader(io.RawIOBase):
+    """
+    Read-only file over bytes or a bytearray without copying it
+    """
+
+    def __init__(self, data):
+        self._view = memoryview(data)
+        self._position = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self._position, io.SEEK_END: len(self._view)}[whence]
+        self._position = max(0, base + offset)
+        return self._position
+
+    def tell(self):
+        return self._position
+
+    def readinto(self, buffer):
+        size = max(0, min(len(buffer), len(self._view) - self._position))
+        buffer[:size] = self._view[self._position:self._position + size]
+        self._position += size
+        return size
+
+
+def open_buffer(data):
+    return io.BufferedReader(BufferReader(data))
+
+
+class TableSummary:
+    """
+    Running statistics over a table read in chunks: row count, the dtype
+    each column would get if the whole table were read at once, null
+    counts, count/sum/min/max of numeric columns, date ranges and a
+    uniform sample of rows for quantiles and categories. Every statistic
+    is updated for all columns at once, and memory does not grow with rows.
+    """
+
+    def __init__(self, sample_size=PROFILE_SAMPLE_ROWS, max_columns=PROFILE_MAX_COLUMNS, seed=0):
+        self.columns = []
+        self.rows = 0
+        self.sample_size = sample_size
+        self.max_columns = max_columns
+        self.sample = None
+        self._sample_keys = np.empty(0)
+        self._rng = np.random.default_rng(seed)
+        self._kinds = {}
+        self._nulls = pd.Series(dtype="float64")
+        self._count = pd.Series(dtype="float64")
+        self._sum = pd.Series(dtype="float64")
+        self._min = pd.Series(dtype="float64")
+        self._max = pd.Series(dtype="float64")
+        self._date_columns = None
+        self._date_ranges = {}
+
+    def add_columns(self, names):
+        for name in names:
+            self.columns.append(name)
+            # Earlier rows have no value in a late column, which reads as NaN
+            self._kinds[name] = {"f"} if self.rows else set()
+            self._nulls[name] = self.rows
+
+    def add(self, chunk):
+        if not self.columns:
+            self.add_columns(list(chunk.columns))
+        if len(chunk) == 0:
+            return
+        self.rows += len(chunk)
+
+        for name, dtype in chunk.dtypes.items():
+            self._kinds[name].add(dtype.kind)
+        self._nulls = self._nulls.add(chunk.isna().sum(), fill_value=0)
+
+        numeric = chunk.select_dtypes(include=["number"])
+        if len(numeric.columns):
+            self._count = self._count.add(numeric.count(), fill_value=0)
+            self._sum = self._sum.add(numeric.sum().astype("float64"), fill_value=0)
+            self._min = pd.concat([self._min, numeric.min().astype("float64")], axis=1).min(axis=1)
+            self._max = pd.concat([self._max, numeric.max().astype("float64")], axis=1).max(axis=1)
+
+        profiled = chunk[[name for name in self.columns[:self.max_columns] if name in chunk.columns]]
+        self._add_dates(profiled)
+        self._add_to_sample(profiled)
+
+    def _add_dates(self, chunk):
+        if self._date_columns is None:
+            self._date_columns = [name for name in chunk.columns if looks_like_dates(chunk[name])]
+        for name in self._date_columns:
+            dates = chunk[name]
+            if dates.dtype.kind != "M":
+                dates = pd.to_datetime(dates, errors="coerce", format="ISO8601")
+            earliest, latest = dates.min(), dates.max()
+            if pd.isna(earliest):
+                continue
+            current = self._date_ranges.get(name)
+            if current is not None:
+                earliest, latest = min(current[0], earliest), max(current[1], latest)
+            self._date_ranges[name] = (earliest, latest)
+
+    def _add_to_sample(self, chunk):
+        """
+        Keep the rows with the smallest random keys seen so far, which is a
+        uniform sample of every row read
+        """
+        keys = self._rng.random(len(chunk))
+        if self.sample is not None and len(self.sample) >= self.sample_size:
+            candidates = keys < self._sample_keys.max()
+            chunk, keys = chunk[candidates], keys[candidates]
+            if len(chunk) == 0:
+                return
+
+        sample = chunk if self.sample is None else pd.concat([self.sample, chunk], ignore_index=True)
+        keys = np.concatenate([self._sample_keys, keys])
+        if len(sample) > self.sample_size:
+            keep = np.argpartition(keys, self.sample_size)[:self.sample_size]
+            sample, keys = sample.iloc[keep].reset_index(drop=True), keys[keep]
+        self.sample, self._sample_keys = sample, keys
+
+    def final_dtype(self, name):
+        """
+        The dtype pandas infers for the column across every chunk
+        """
+        kinds = self._kinds[name]
+        if kinds and kinds <= {"i", "u"}:
+            return np.dtype("int64")
+        if kinds and kinds <= NUMERIC_KINDS:
+            return np.dtype("float64")
+        if kinds == {"b"}:
+            return np.dtype("bool")
+        if kinds == {"M"}:
+            return np.dtype("datetime64[ns]")
+        return np.dtype("object")
+
+    def numeric_columns(self):
+        return [name for name in self.columns if self.final_dtype(name).kind in NUMERIC_KINDS]
+
+    def describe(self, name):
+        """
+        (count, mean, min, max) of a numeric column
+        """
+        count = int(self._count.get(name, 0))
+        mean = self._sum[name] / count if count else np.nan
+        return count, mean, self._min.get(name, np.nan), self._max.get(name, np.nan)
+
+    def null_rate(self, name):
+        return self._nulls.get(name, 0) / self.rows if self.rows else 0.0
+
+    def date_range(self, name):
+        return self._date_ranges.get(name)
+
+
+def looks_like_dates(series):
+    """
+    Whether a column holds dates: datetimes, or text that is almost all ISO dates
+    """
+    if series.dtype.kind == "M":
+        return True
+    if series.dtype.kind != "O":
+        return False
+    values = series.dropna().head(200)
+    if len(values) == 0:
+        return False
+    return values.astype(str).str.match(ISO_DATE).mean() >= 0.9
+
+
+def _number(value):
+    if pd.isna(value):
+        return "n/a"
+    if abs(value) >= 100 or float(value).is_integer():
+        return f"{value:,.0f}"
+    if abs(value) >= 1:
+        return f"{value:.2f}"
+    return f"{value:.3g}"
+
+
+def _percent(rate):
+    if 0 < rate < 0.01:
+        return "<1%"
+    return f"{rate:.0%}"
+
+
+def profile_lines(summary, top_values=PROFILE_TOP_VALUES):
+    """
+    One line of facts per column: quantiles for numbers, range for dates,
+    cardinality and most common values for text, and null rates. Quantiles
+    and categories come from the row sample, computed for all columns at once.
+    """
+    columns = summary.columns[:summary.max_columns]
+    if summary.rows == 0 or not columns:
+        return []
+    sample = summary.sample.reindex(columns=columns)
+    sampled = summary.rows > len(sample)
+
+    numeric = [name for name in summary.numeric_columns() if name in columns]
+    booleans = [name for name in columns if summary.final_dtype(name).kind == "b"]
+    dates = [name for name in columns if summary.date_range(name) is not None]
+    text = [name for name in columns if name not in numeric and name not in booleans and name not in dates]
+
+    quantiles = sample[numeric].astype("float64").quantile([0.25, 0.5, 0.75]) if numeric else None
+    true_rates = sample[booleans].astype("float64").mean() if booleans else None
+    if text:
+        values = sample[text]
+        unique = values.nunique()
+        non_null = values.count()
+        # Value counts of every text column in one pass
+        counts = values.melt().dropna().groupby(["variable", "value"], sort=False).size()
+        # Values seen once are not worth listing
+        top = counts[counts > 1].sort_values(ascending=False, kind="stable").groupby(level=0, sort=False).head(top_values)
+
+    lines = []
+    for name in columns:
+        null_rate = summary.null_rate(name)
+        if null_rate == 1:
+            lines.append(f"{name}: empty")
+            continue
+
+        if name in numeric:
+            _, mean, minimum, maximum = summary.describe(name)
+            q = quantiles[name]
+            facts = [f"mean {_number(mean)}", f"min {_number(minimum)}", f"p25 {_number(q[0.25])}",
+                     f"median {_number(q[0.5])}", f"p75 {_number(q[0.75])}", f"max {_number(maximum)}"]
+            kind = "number"
+        elif name in dates:
+            earliest, latest = summary.date_range(name)
+            facts = [f"{earliest.date()} to {latest.date()}"]
+            kind = "date"
+        elif name in booleans:
+            facts = [f"{_percent(true_rates[name])} true"]
+            kind = "yes/no"
+        else:
+            approximate = "~" if sampled else ""
+            facts = [f"{approximate}{unique[name]:,} unique"]
+            if name in top.index.get_level_values(0) and non_null[name]:
+                shares = top.loc[name] / non_null[name]
+                facts.append("top: " + ", ".join(f"{value} ({_percent(share)})" for value, share in shares.items()))
+            kind = "text"
+
+        if null_rate:
+            facts.append(f"{_percent(null_rate)} null")
+        lines.append(f"{name} ({kind}): " + ", ".join(facts))
+
+    if len(summary.columns) > len(columns):
+        lines.append(f"... {len(summary.columns) - len(columns)} more columns not profiled")
+    return lines
+
+
+def profile_header(summary):
+    if summary.sample is not None and summary.rows > len(summary.sample):
+        return f"Column Profile (quantiles and top values from {len(summary.sample):,} sampled rows):"
+    return "Column Profile:"
+
+
+def summarize_csv_stream(file_bytes, chunk_rows=CSV_CHUNK_ROWS, sample_rows=10):
+    """
+    Read a UTF-8 CSV in chunks. Returns (summary, sample DataFrame) with
+    the sample typed as a full read would type it.
+    """
+    summary = TableSummary()
+    with pd.read_csv(open_buffer(file_bytes), encoding="utf-8", chunksize=chunk_rows) as reader:
+        for chunk in reader:
+            summary.add(chunk)
+
+    # Re-read the first rows with the dtypes of the whole file, so numbers in
+    # columns that turned out to hold text print as written
+    dtypes = {}
+    for name in summary.columns:
+        dtype = summary.final_dtype(name)
+        if dtype.kind == "O":
+            dtypes[name] = str
+        elif dtype.kind == "f":
+            dtypes[name] = dtype
+    sample = pd.read_csv(open_buffer(file_bytes), encoding="utf-8", nrows=sample_rows, dtype=dtypes or None)
+    if not summary.columns:
+        summary.add_columns(list(sample.columns))
+    return summary, sample
+
+
+def _excel_cell_value(cell):
+    """
+    Cell value as pandas' openpyxl reader converts it
+    """
+    from openpyxl.cell.cell import TYPE_ERROR, TYPE_NUMERIC
+
+    if cell.value is None:
+        return ""
+    if cell.data_type == TYPE_ERROR:
+        return np.nan
+    if cell.data_type == TYPE_NUMERIC:
+        value = int(cell.value)
+        if value == cell.value:
+            return value
+        return float(cell.value)
+    return cell.value
+
+
+def summarize_sheet_stream(sheet, chunk_rows=EXCEL_CHUNK_ROWS, sample_rows=5):
+    """
+    Stream the rows of a read-only openpyxl sheet through pandas' parser
+    a chunk at a time, trimming empty cells and rows the way read_excel
+    does. Returns (summary, sample DataFrame).
+    """
+    sheet.reset_dimensions()
+    summary = TableSummary()
+    head = []
+    chunk = []
+    pending_empty_rows = 0
+    state = {"width": 0, "parsed": False}
+
+    def parse(rows):
+        width = max([state["width"]] + [len(row) for row in rows])
+        padded = [row + [""] * (width - len(row)) for row in rows]
+        if not state["parsed"]:
+            frame = TextParser(padded, header=0).read()
+            state["parsed"] = True
+        else:
+            if width > state["width"]:
+                # A row wider than the header: read_excel names the extra columns "Unnamed: n"
+                logger.warning("Sheet has rows wider than its header")
+                summary.add_columns([f"Unnamed: {i}" for i in range(state["width"], width)])
+            frame = TextParser(padded, header=None, names=summary.columns).read()
+        state["width"] = width
+        summary.add(frame)
+
+    for row in sheet.rows:
+        values = [_excel_cell_value(cell) for cell in row]
+        while values and values[-1] == "":
+            values.pop()
+        if not values:
+            # Kept only if a row with data follows, read_excel drops trailing empty rows
+            pending_empty_rows += 1
+            continue
+
+        chunk.extend([] for _ in range(pending_empty_rows))
+        pending_empty_rows = 0
+        chunk.append(values)
+        if len(chunk) >= chunk_rows:
+            if not head:
+                head = [list(row) for row in chunk[:sample_rows + 1]]
+            parse(chunk)
+            chunk = []
+
+    if chunk:
+        if not head:
+            head = [list(row) for row in chunk[:sample_rows + 1]]
+        parse(chunk)
+
+    if not head:
+        return summary, pd.DataFrame()
+
+    # Parse the first rows again with the dtypes of the whole sheet; text
+    # columns keep the cell values as they are
+    width = state["width"]
+    dtypes = {name: object for name in summary.columns if summary.final_dtype(name).kind == "O"}
+    sample = TextParser([row + [""] * (width - len(row)) for row in head], header=0, dtype=dtypes or None).read()
+    for name in sample.columns:
+        dtype = summary.final_dtype(name)
+        if dtype.kind == "f" and sample[name].dtype != dtype:
+            sample[name] = sample[name].astype(dtype)
+    return summary, sample
+
+
+def summarize_excel_stream(file_bytes, chunk_rows=EXCEL_CHUNK_ROWS, sample_rows=5):
+    """
+    Yield (sheet name, summary, sample) for every sheet of a workbook
+    opened in openpyxl's read-only streaming mode
+    """
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(open_buffer(file_bytes), read_only=True, data_only=True, keep_links=False)
+    try:
+        for sheet in workbook.worksheets:
+            summary, sample = summarize_sheet_stream(sheet, chunk_rows, sample_rows)
+            yield sheet.title, summary, sample
+    finally:
+        workbook.close()
@@ -0,0 +1,17 @@
+def normalize_text(text):
+    """
+    Helper function to clean and normalize extracted text
+    """
+    if not text:
+        return ""
+    
+    # Remove excessive whitespace
+    lines = text.split('\n')
+    cleaned_lines = []
+    
+    for line in lines:
+        cleaned_line = line.strip()
+        if cleaned_line:  # Only keep non-empty lines
+            cleaned_lines.append(cleaned_line)
+    
+    return '\n'.join(cleaned_lines)
@@ -0,0 +1,164 @@
+import logging
+import os
+import re
+import threading
+
+logger = logging.getLogger(__name__)
+
+MODEL_CONTEXT_TOKENS = {
+    "gpt-3.5-turbo": 16385,
+}
+DEFAULT_CONTEXT_TOKENS = 4096
+# Completion budgets used when estimating a request before it is sent
+BRIEF_COMPLETION_TOKENS = int(os.getenv("BRIEF_COMPLETION_TOKENS", 1000))
+SCHEDULER_COMPLETION_TOKENS = int(os.getenv("SCHEDULER_COMPLETION_TOKENS", 1500))
+# Per-message framing the chat format adds on top of the content
+MESSAGE_OVERHEAD_TOKENS = 4
+REPLY_PRIMER_TOKENS = 3
+
+_encodings = {}
+_encodings_lock = threading.Lock()
+
+
+def _get_encoding(model, wait=False):
+    """
+    Local tokenizer for model, or None if tiktoken or its encoding files are unavailable.
+    The first load may download the BPE file with no timeout, so unless wait is set,
+    callers that find another thread loading it get None and fall back to estimates.
+    """
+    if model in _encodings:
+        return _encodings[model]
+    if not _encodings_lock.acquire(blocking=wait):
+        return None
+    try:
+        if model not in _encodings:
+            try:
+                # Imported on first use; optional dependency
+                import tiktoken
+                _encodings[model] = tiktoken.encoding_for_model(model)
+            except ImportError:
+                _encodings[model] = None
+            except Exception as e:
+                logger.warning(f"Tokenizer for {model} unavailable, using estimates: {e}")
+                _encodings[model] = None
+        return _encodings[model]
+    finally:
+        _encodings_lock.release()
+
+
+def preload_encodings(models=tuple(MODEL_CONTEXT_TOKENS)):
+    """
+    Load the tokenizers up front (blocking), so requests do not pay for the first load
+    """
+    for model in models:
+        _get_encoding(model, wait=True)
+
+
+def count_tokens(text, model="gpt-3.5-turbo"):
+    """
+    Count tokens with the model's tokenizer. Without one, estimate four
+    ASCII characters per token and one token per non-ASCII character,
+    which keeps non-English text from being undercounted.
+    """
+    if not text:
+        return 0
+    encoding = _get_encoding(model)
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    non_ascii = sum(1 for ch in text if ord(ch) > 127)
+    return (len(text) - non_ascii) // 4 + non_ascii + 1
+
+
+def count_message_tokens(messages, model="gpt-3.5-turbo"):
+    """
+    Estimate prompt tokens for a list of chat messages
+    """
+    return sum(count_tokens(m["content"], model) + MESSAGE_OVERHEAD_TOKENS for m in messages) + REPLY_PRIMER_TOKENS
+
+
+def context_limit(model):
+    return MODEL_CONTEXT_TOKENS.get(model, DEFAULT_CONTEXT_TOKENS)
+
+
+def estimate_usage(messages, completion_tokens, model="gpt-3.5-turbo"):
+    """
+    Prompt/completion estimate for one chat call
+    """
+    prompt_tokens = count_message_tokens(messages, model)
+    return {
+        "model": model,
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "total_tokens": prompt_tokens + completion_tokens,
+        "context_limit": context_limit(model),
+    }
+
+
+# Section headers produced by the loaders, with how much each section is worth to the brief.
+# Lower values are trimmed first.
+SECTION_VALUES = [
+    (re.compile(r"^Sample Data"), 0),
+    (re.compile(r"^(Numeric (Column )?Summary|Column Profile.*):"), 1),
+]
+SECTION_START = re.compile(
+    r"^(--- File: .* ---|--- Page \d+ ---|=== Sheet: .* ===|CSV Data Summary:|Excel File Summary:"
+    r"|Sample Data.*:|Numeric (Column )?Summary:|Column Profile.*:)$"
+)
+SAMPLE_ROWS_KEPT = 3
+
+
+def _split_sections(text):
+    sections = []
+    for line in text.split("\n"):
+        if not sections or SECTION_START.match(line.strip()):
+            sections.append([line])
+        else:
+            sections[-1].append(line)
+    return sections
+
+
+def _section_value(section):
+    header = section[0].strip()
+    for pattern, value in SECTION_VALUES:
+        if pattern.match(header):
+            return value
+    return 2
+
+
+def fit_to_budget(text, max_tokens, model="gpt-3.5-turbo"):
+    """
+    Trim the lowest-value sections until text fits max_tokens:
+    first shorten every "Sample Data" table to a few rows, then drop the
+    sample tables, then the column profiles. Anything still over budget
+    is left for summarization. Returns (text, report).
+    """
+    tokens_before = count_tokens(text, model)
+    report = {"tokens_before": tokens_before, "tokens_after": tokens_before, "sections_trimmed": 0, "sections_dropped": 0}
+    if tokens_before <= max_tokens:
+        return text, report
+
+    sections = _split_sections(text)
+    section_tokens = [count_tokens("\n".join(s), model) for s in sections]
+
+    # Shorten sample tables to the header plus a few rows
+    for i, section in enumerate(sections):
+        if sum(section_tokens) <= max_tokens:
+            break
+        if _section_value(section) == 0 and len(section) > SAMPLE_ROWS_KEPT + 2:
+            sections[i] = section[:SAMPLE_ROWS_KEPT + 2]
+            section_tokens[i] = count_tokens("\n".join(sections[i]), model)
+            report["sections_trimmed"] += 1
+
+    # Drop whole sections, least valuable first, last ones first
+    for value in (0, 1):
+        for i in range(len(sections) - 1, -1, -1):
+            if sum(section_tokens) <= max_tokens:
+                break
+            if sections[i] and _section_value(sections[i]) == value:
+                sections[i] = []
+                section_tokens[i] = 0
+                report["sections_dropped"] += 1
+
+    trimmed = "\n".join("\n".join(s) for s in sections if s)
+    report["tokens_after"] = count_tokens(trimmed, model)
+    return trimmed, report
@@ -0,0 +1,316 @@
+import bisect
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from utils.llm_client import call_timeout, get_client, with_retries
+from utils.media_io import encode_audio
+from utils.rate_limiter import PRIORITY_BATCH, get_rate_limiter
+
+logger = logging.getLogger(__name__)
+
+# "openai" sends segments to Whisper, "local" runs faster-whisper in-process,
+# "stub" returns canned text for offline runs
+TRANSCRIPTION_BACKEND = os.getenv("TRANSCRIPTION_BACKEND", "openai")
+WHISPER_MODEL = "whisper-1"
+# Longest segment sent in one call; cuts are moved back to the nearest pause
+TRANSCRIPTION_SEGMENT_SECONDS = int(os.getenv("TRANSCRIPTION_SEGMENT_SECONDS", 300))
+TRANSCRIPTION_CONCURRENCY = int(os.getenv("TRANSCRIPTION_CONCURRENCY", 4))
+# A pause is at least this long and this many dB below the recording's average loudness
+TRANSCRIPTION_MIN_SILENCE_MS = int(os.getenv("TRANSCRIPTION_MIN_SILENCE_MS", 500))
+TRANSCRIPTION_SILENCE_DB = float(os.getenv("TRANSCRIPTION_SILENCE_DB", 16))
+# Segments are uploaded as 16 kHz mono in this format
+TRANSCRIPTION_AUDIO_FORMAT = os.getenv("TRANSCRIPTION_AUDIO_FORMAT", "ogg")
+TRANSCRIPTION_AUDIO_BITRATE = os.getenv("TRANSCRIPTION_AUDIO_BITRATE", "24k")
+TRANSCRIPTION_STUB_TEXT = os.getenv("TRANSCRIPTION_STUB_TEXT", "Stub transcript.")
+# Local backend: model size or path, quantization, CPU threads (0 = all) and request batching
+LOCAL_WHISPER_MODEL = os.getenv("LOCAL_WHISPER_MODEL", "small")
+LOCAL_WHISPER_COMPUTE_TYPE = os.getenv("LOCAL_WHISPER_COMPUTE_TYPE", "int8")
+LOCAL_WHISPER_THREADS = int(os.getenv("LOCAL_WHISPER_THREADS", 0))
+LOCAL_WHISPER_MODEL_DIR = os.getenv("LOCAL_WHISPER_MODEL_DIR")
+LOCAL_WHISPER_BATCH_SIZE = int(os.getenv("LOCAL_WHISPER_BATCH_SIZE", 8))
+LOCAL_WHISPER_BATCH_WAIT_MS = int(os.getenv("LOCAL_WHISPER_BATCH_WAIT_MS", 50))
+
+SAMPLE_RATE = 16000
+SILENCE_WINDOW_MS = 20
+AUDIO_CODECS = {"ogg": "libopus", "mp3": "libmp3lame", "wav": None}
+# Silence between the recordings of one local batch, so no segment spans two of them
+BATCH_GAP_SECONDS = 2
+
+SAMPLE_DTYPES = {1: "int8", 2: "int16", 4: "int32"}
+RMS_BLOCK_WINDOWS = 3000
+
+
+class OpenAITranscriber:
+    """
+    Transcribes audio with the OpenAI Whisper API
+    """
+
+    def __init__(self, model=WHISPER_MODEL):
+        self.name = model
+        self.client = get_client()
+
+    def transcribe(self, audio_file):
+        def attempt():
+            get_rate_limiter().acquire(self.name, priority=PRIORITY_BATCH)
+            # Sent as bytes so a retry uploads the whole file again
+            return self.client.audio.transcriptions.create(model=self.name, file=(audio_file.name, audio_file.getvalue()),
+                                                           timeout=call_timeout())
+
+        transcript = with_retries(attempt)
+        return transcript.text.strip() if transcript and transcript.text else ""
+
+
+class StubTranscriber:
+    """
+    Returns fixed text after an optional delay, for tests and benchmarks
+    that must not call a real service
+    """
+
+    def __init__(self, text=TRANSCRIPTION_STUB_TEXT, delay=0.0):
+        self.name = "stub"
+        self.text = text
+        self.delay = delay
+
+    def transcribe(self, audio_file):
+        if self.delay:
+            time.sleep(self.delay)
+        return self.text
+
+
+class MicroBatcher:
+    """
+    Groups calls from concurrent threads into batches. submit() blocks
+    until process_batch(items) has returned the result for its item; a
+    batch is run once it has max_batch items or the first one has waited
+    max_wait seconds.
+    """
+
+    def __init__(self, process_batch, max_batch, max_wait):
+        self.process_batch = process_batch
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self._queue = queue.Queue()
+        self._worker = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+        self._worker.start()
+
+    def submit(self, item):
+        future = Future()
+        self._queue.put((item, future))
+        return future.result()
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+
+            try:
+                results = self.process_batch([item for item, _ in batch])
+                for (_, future), result in zip(batch, results):
+                    future.set_result(result)
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+
+
+def local_whisper_name(model, compute_type):
+    return f"local-{os.path.basename(model.rstrip('/'))}-{compute_type}"
+
+
+class LocalWhisperTranscriber:
+    """
+    Transcribes in-process with faster-whisper (a quantized CTranslate2
+    Whisper). The model is loaded once and shared; segments transcribed
+    at the same time are batched into one pass.
+    """
+
+    def __init__(self, model=LOCAL_WHISPER_MODEL, compute_type=LOCAL_WHISPER_COMPUTE_TYPE,
+                 batch_size=LOCAL_WHISPER_BATCH_SIZE, batch_wait_ms=LOCAL_WHISPER_BATCH_WAIT_MS):
+        try:
+            import faster_whisper
+        except ImportError as e:
+            raise RuntimeError("TRANSCRIPTION_BACKEND=local needs the faster-whisper package "
+                               "(pip install faster-whisper)") from e
+
+        self.name = local_whisper_name(model, compute_type)
+        self.batch_size = batch_size
+        start = time.perf_counter()
+        self.model = faster_whisper.WhisperModel(model, device="cpu", compute_type=compute_type,
+                                                 cpu_threads=LOCAL_WHISPER_THREADS,
+                                                 download_root=LOCAL_WHISPER_MODEL_DIR)
+        logger.info(f"Loaded local Whisper model '{model}' in {time.perf_counter() - start:.1f}s")
+        # Batched inference is available from faster-whisper 1.1
+        pipeline_class = getattr(faster_whisper, "BatchedInferencePipeline", None)
+        self.pipeline = pipeline_class(model=self.model) if pipeline_class else None
+        self._decode_audio = faster_whisper.decode_audio
+        self.batcher = MicroBatcher(self._transcribe_batch, batch_size, batch_wait_ms / 1000)
+
+    def transcribe(self, audio_file):
+        return self.batcher.submit(audio_file)
+
+    def _transcribe_one(self, audio):
+        segments, _ = self.model.transcribe(audio, beam_size=1, vad_filter=True)
+        return " ".join(segment.text.strip() for segment in segments)
+
+    def _transcribe_batch(self, audio_files):
+        import numpy as np
+
+        audios = [self._decode_audio(audio_file, sampling_rate=SAMPLE_RATE) for audio_file in audio_files]
+        if self.pipeline is None or len(audios) == 1:
+            return [self._transcribe_one(audio) for audio in audios]
+
+        # Join the batch with silence and run one batched pass, then hand each
+        # decoded segment back to the recording its start time falls in
+        gap = np.zeros(SAMPLE_RATE * BATCH_GAP_SECONDS, dtype=np.float32)
+        offsets = []
+        parts = []
+        position = 0
+        for audio in audios:
+            offsets.append(position / SAMPLE_RATE)
+            parts += [audio, gap]
+            position += len(audio) + len(gap)
+
+        segments, _ = self.pipeline.transcribe(np.concatenate(parts), batch_size=self.batch_size)
+        texts = [[] for _ in audios]
+        for segment in segments:
+            index = max(0, bisect.bisect_right(offsets, segment.start) - 1)
+            texts[index].append(segment.text.strip())
+        logger.info(f"Transcribed a batch of {len(audios)} segments locally")
+        return [" ".join(text) for text in texts]
+
+
+TRANSCRIBERS = {
+    "openai": OpenAITranscriber,
+    "local": LocalWhisperTranscriber,
+    "stub": StubTranscriber,
+}
+
+_transcriber = None
+_transcriber_lock = threading.Lock()
+
+
+def transcriber_name(backend=None):
+    """
+    Name of the transcriber a backend (TRANSCRIPTION_BACKEND by default)
+    creates, known without loading its model
+    """
+    backend = backend or TRANSCRIPTION_BACKEND
+    if backend == "local":
+        return local_whisper_name(LOCAL_WHISPER_MODEL, LOCAL_WHISPER_COMPUTE_TYPE)
+    if backend == "stub":
+        return "stub"
+    return WHISPER_MODEL
+
+
+def get_transcriber():
+    """
+    Process-wide transcriber chosen by TRANSCRIPTION_BACKEND
+    """
+    global _transcriber
+    with _transcriber_lock:
+        if _transcriber is None:
+            if TRANSCRIPTION_BACKEND not in TRANSCRIBERS:
+                raise ValueError(f"Unknown TRANSCRIPTION_BACKEND '{TRANSCRIPTION_BACKEND}', "
+                                 f"expected one of {sorted(TRANSCRIBERS)}")
+            _transcriber = TRANSCRIBERS[TRANSCRIPTION_BACKEND]()
+    return _transcriber
+
+
+def find_pauses(audio, min_silence_ms=TRANSCRIPTION_MIN_SILENCE_MS, silence_db=TRANSCRIPTION_SILENCE_DB):
+    """
+    Return [(start_ms, end_ms)] of pauses, measured as runs of quiet
+    20 ms windows relative to the recording's average loudness
+    """
+    import numpy as np
+
+    # A view of the raw samples, so memory-mapped audio is not copied
+    samples = np.frombuffer(audio.raw_data, dtype=SAMPLE_DTYPES[audio.sample_width])
+    window = max(1, int(audio.frame_rate * SILENCE_WINDOW_MS / 1000)) * audio.channels
+    windows = len(samples) // window
+    if windows == 0:
+        return []
+
+    # Loudness per window, a block at a time to keep float copies small
+    framed = samples[:windows * window].reshape(windows, window)
+    rms = np.concatenate([
+        np.sqrt(np.mean(framed[i:i + RMS_BLOCK_WINDOWS].astype(np.float64) ** 2, axis=1))
+        for i in range(0, windows, RMS_BLOCK_WINDOWS)
+    ])
+    average = np.sqrt(np.mean(rms ** 2))
+    if average == 0:
+        return [(0, len(audio))]
+    quiet = rms < average * 10 ** (-silence_db / 20)
+
+    # Starts and ends of quiet runs
+    edges = np.diff(np.concatenate(([0], quiet.astype(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    min_windows = max(1, min_silence_ms // SILENCE_WINDOW_MS)
+    return [(int(start * SILENCE_WINDOW_MS), int(end * SILENCE_WINDOW_MS))
+            for start, end in zip(starts, ends) if end - start >= min_windows]
+
+
+def plan_segments(duration_ms, pauses, max_ms=TRANSCRIPTION_SEGMENT_SECONDS * 1000):
+    """
+    Split [0, duration_ms) into segments of at most max_ms, cutting in the
+    middle of the last pause before each limit, or at the limit if there is none
+    """
+    segments = []
+    start = 0
+    while duration_ms - start > max_ms:
+        limit = start + max_ms
+        cuts = [(pause_start + pause_end) // 2 for pause_start, pause_end in pauses
+                if start < (pause_start + pause_end) // 2 <= limit]
+        cut = cuts[-1] if cuts else limit
+        segments.append((start, cut))
+        start = cut
+    if duration_ms > start:
+        segments.append((start, duration_ms))
+    return segments
+
+
+def transcribe_audio(audio, transcriber=None, concurrency=TRANSCRIPTION_CONCURRENCY,
+                     segment_seconds=TRANSCRIPTION_SEGMENT_SECONDS):
+    """
+    Transcribe a pydub AudioSegment as concurrent segments split on pauses.
+    Returns {"text", "duration", "segments": [{"start", "end", "text"}]}
+    with times in seconds.
+    """
+    transcriber = transcriber or get_transcriber()
+    audio = audio.set_channels(1).set_frame_rate(SAMPLE_RATE)
+    duration = len(audio) / 1000.0
+    spans = plan_segments(len(audio), find_pauses(audio), max_ms=segment_seconds * 1000)
+    logger.info(f"Transcribing {duration:.1f}s of audio in {len(spans)} segments")
+    upload_bytes = []
+
+    def transcribe_span(span):
+        audio_file = encode_audio(audio[span[0]:span[1]], TRANSCRIPTION_AUDIO_FORMAT,
+                                  AUDIO_CODECS.get(TRANSCRIPTION_AUDIO_FORMAT), TRANSCRIPTION_AUDIO_BITRATE)
+        upload_bytes.append(len(audio_file.getvalue()))
+        return transcriber.transcribe(audio_file)
+
+    if len(spans) == 1:
+        texts = [transcribe_span(spans[0])]
+    else:
+        with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(spans)))) as pool:
+            texts = list(pool.map(transcribe_span, spans))
+    logger.info(f"Uploaded {sum(upload_bytes)} bytes of audio for transcription")
+
+    segments = [{"start": start / 1000.0, "end": end / 1000.0, "text": text.strip()}
+                for (start, end), text in zip(spans, texts) if text and text.strip()]
+    return {
+        "text": " ".join(segment["text"] for segment in segments),
+        "duration": duration,
+        "segments": segments,
+    }
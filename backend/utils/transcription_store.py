@@ -0,0 +1,150 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+
+from utils.disk_store import SizeBoundedDirectory
+
+logger = logging.getLogger(__name__)
+
+TRANSCRIPTION_STORE_MEMORY_ITEMS = int(os.getenv("TRANSCRIPTION_STORE_MEMORY_ITEMS", 128))
+TRANSCRIPTION_STORE_DIR = os.getenv(
+    "TRANSCRIPTION_STORE_DIR", os.path.join(tempfile.gettempdir(), "autobrief-cache", "transcripts")
+)
+# Size budget of the stored transcripts; least recently used ones are removed first (0 = no limit)
+TRANSCRIPT_STORE_MAX_MB = int(os.getenv("TRANSCRIPT_STORE_MAX_MB", 256))
+
+
+class TranscriptionStore:
+    """
+    Stores transcripts by media content hash, in memory and in a
+    size-bounded directory. Concurrent requests for the same media share
+    a single disk read or transcription call (single-flight).
+    """
+
+    def __init__(self, store_dir=TRANSCRIPTION_STORE_DIR, memory_items=TRANSCRIPTION_STORE_MEMORY_ITEMS,
+                 disk_bytes=TRANSCRIPT_STORE_MAX_MB * 1024 * 1024):
+        self.store_dir = store_dir
+        self.memory_items = memory_items
+        self.disk_bytes = disk_bytes
+        self._memory = OrderedDict()
+        self._in_flight = {}
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "deduplicated": 0, "evictions": 0}
+
+        self._disk = SizeBoundedDirectory(self.store_dir, ".json", self.disk_bytes) if self.store_dir else None
+
+    @staticmethod
+    def make_key(file_bytes, model):
+        """
+        Key a transcript by the media content and the model that produced it
+        """
+        return f"{hashlib.sha256(file_bytes).hexdigest()}-{model}"
+
+    def _path(self, key):
+        return self._disk.path(key)
+
+    def _read(self, key):
+        """
+        Stored record from disk, or None. Called without the lock held.
+        """
+        if self._disk is None:
+            return None
+        try:
+            text = self._disk.read(key)
+            return json.loads(text) if text is not None else None
+        except Exception as e:
+            logger.warning(f"Could not read transcript {key}: {e}")
+            return None
+
+    def _write(self, key, record):
+        if self._disk is None:
+            return
+        try:
+            evicted = self._disk.write(key, json.dumps(record))
+        except Exception as e:
+            logger.warning(f"Could not store transcript {key}: {e}")
+            return
+        with self._lock:
+            self._stats["evictions"] += evicted
+
+    def _remember(self, key, record):
+        self._memory[key] = record
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_items:
+            self._memory.popitem(last=False)
+
+    def get_or_transcribe(self, key, transcribe):
+        """
+        Return the stored record for key, calling transcribe() at most once
+        across concurrent callers. transcribe() returns a dict with "text"
+        and "duration", or None when there is nothing to store.
+        """
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self._stats["hits"] += 1
+                return self._memory[key]
+
+            future = self._in_flight.get(key)
+            if future is not None:
+                self._stats["deduplicated"] += 1
+                owner = False
+            else:
+                future = Future()
+                self._in_flight[key] = future
+                owner = True
+
+        if not owner:
+            logger.info("Waiting for in-flight transcription of identical media")
+            return future.result()
+
+        # The key is claimed, so the disk read and transcription happen outside the lock
+        try:
+            record = self._read(key)
+            if record is not None:
+                with self._lock:
+                    self._stats["hits"] += 1
+                    self._remember(key, record)
+            else:
+                with self._lock:
+                    self._stats["misses"] += 1
+                record = transcribe()
+                if record is not None:
+                    with self._lock:
+                        self._remember(key, record)
+                    self._write(key, record)
+            future.set_result(record)
+            return record
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats["in_flight"] = len(self._in_flight)
+            stats["memory_items"] = len(self._memory)
+        return stats
+
+
+_transcription_store = None
+_store_lock = threading.Lock()
+
+
+def get_transcription_store():
+    """
+    Process-wide transcription store
+    """
+    global _transcription_store
+    with _store_lock:
+        if _transcription_store is None:
+            _transcription_store = TranscriptionStore()
+    return _transcription_store
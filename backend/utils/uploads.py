@@ -0,0 +1,98 @@
+import json
+import logging
+import os
+
+from fastapi import HTTPException
+
+logger = logging.getLogger(__name__)
+
+MAX_FILE_SIZE = int(os.getenv("MAX_FILE_SIZE_MB", 15)) * 1024 * 1024
+# Multi-file endpoints (meeting recordings, decks) are not capped unless set; 0 = no limit
+MAX_REQUEST_SIZE = int(os.getenv("MAX_REQUEST_SIZE_MB", 0)) * 1024 * 1024
+UPLOAD_CHUNK_BYTES = 1024 * 1024
+# Room for multipart boundaries and form fields around a single file
+MULTIPART_OVERHEAD = 64 * 1024
+
+
+async def read_upload(uploaded_file, max_bytes=None):
+    """
+    Read an upload in chunks into a single buffer, rejecting it with 413 as
+    soon as it crosses max_bytes (None reads it whole). Returns a bytearray
+    so the loaders get the one in-memory copy.
+    """
+    if max_bytes is not None and uploaded_file.size is not None and uploaded_file.size > max_bytes:
+        raise HTTPException(status_code=413, detail="File too large")
+
+    buffer = bytearray()
+    while True:
+        chunk = await uploaded_file.read(UPLOAD_CHUNK_BYTES)
+        if not chunk:
+            break
+        buffer += chunk
+        if max_bytes is not None and len(buffer) > max_bytes:
+            raise HTTPException(status_code=413, detail="File too large")
+    return buffer
+
+
+class UploadSizeLimitMiddleware:
+    """
+    Reject oversized request bodies before they are buffered. Requests
+    declaring a Content-Length over the limit are refused without reading
+    the body; chunked bodies are cut off as soon as they cross it. Paths
+    whose limit is 0 pass through untouched.
+    """
+
+    def __init__(self, app, limits, default_limit=MAX_REQUEST_SIZE):
+        self.app = app
+        self.limits = limits
+        self.default_limit = default_limit
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in ("POST", "PUT", "PATCH"):
+            await self.app(scope, receive, send)
+            return
+
+        limit = self.limits.get(scope["path"], self.default_limit)
+        if not limit:
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        content_length = headers.get(b"content-length")
+        if content_length is not None and content_length.isdigit() and int(content_length) > limit:
+            logger.info(f"Rejected {scope['path']} upload of {int(content_length)} bytes from Content-Length")
+            await self._reject(send)
+            return
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    raise HTTPException(status_code=413, detail="File too large")
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+    async def _reject(self, send):
+        body = json.dumps({"detail": "File too large"}).encode("utf-8")
+        await send({
+            "type": "http.response.start",
+            "status": 413,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"connection", b"close"),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+
+def single_file_limit(max_bytes=MAX_FILE_SIZE):
+    """
+    Request size limit for endpoints that take exactly one file
+    """
+    return max_bytes + MULTIPART_OVERHEAD
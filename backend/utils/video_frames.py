@@ -0,0 +1,125 @@
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+# OCR on-screen text (slides, captions) in videos; off by default
+VIDEO_FRAME_OCR = os.getenv("VIDEO_FRAME_OCR", "0") == "1"
+# "scene" keeps frames where the picture changes, "interval" one frame every VIDEO_FRAME_INTERVAL seconds
+VIDEO_FRAME_MODE = os.getenv("VIDEO_FRAME_MODE", "scene")
+VIDEO_FRAME_INTERVAL = float(os.getenv("VIDEO_FRAME_INTERVAL", 5))
+# Frames per second inspected for scene changes
+VIDEO_SCENE_SAMPLE_FPS = float(os.getenv("VIDEO_SCENE_SAMPLE_FPS", 1))
+# Mean thumbnail difference (0-1) that counts as a new scene
+VIDEO_SCENE_THRESHOLD = float(os.getenv("VIDEO_SCENE_THRESHOLD", 0.08))
+# Frames whose perceptual hashes differ by at most this many bits are the same slide
+VIDEO_HASH_DISTANCE = int(os.getenv("VIDEO_HASH_DISTANCE", 6))
+VIDEO_MAX_FRAMES = int(os.getenv("VIDEO_MAX_FRAMES", 30))
+
+THUMBNAIL_SIZE = (32, 32)
+
+
+def thumbnail(frame):
+    """
+    Small grayscale copy of a frame for cheap comparisons
+    """
+    import numpy as np
+    from PIL import Image
+
+    return np.asarray(Image.fromarray(frame).convert("L").resize(THUMBNAIL_SIZE, Image.BILINEAR), dtype=np.float32) / 255
+
+
+def dhash(image, hash_size=8):
+    """
+    Difference hash: one bit per horizontal brightness gradient of a
+    (hash_size + 1) x hash_size grayscale copy
+    """
+    import numpy as np
+    from PIL import Image
+
+    small = np.asarray(image.convert("L").resize((hash_size + 1, hash_size), Image.BILINEAR), dtype=np.int16)
+    bits = (small[:, 1:] > small[:, :-1]).ravel()
+    return int("".join("1" if bit else "0" for bit in bits), 2)
+
+
+def hamming(a, b):
+    return bin(a ^ b).count("1")
+
+
+def candidate_frames(video_path, mode=VIDEO_FRAME_MODE, interval=VIDEO_FRAME_INTERVAL):
+    """
+    Decode the video at a low frame rate and yield (seconds, PIL image) for
+    the frames worth OCRing: scene changes, or one per interval. Closing
+    the generator stops decoding and closes the video.
+    """
+    import numpy as np
+    from PIL import Image
+    # moviepy.editor takes about half a second to import
+    from moviepy.editor import VideoFileClip
+
+    with VideoFileClip(video_path, audio=False) as clip:
+        fps = 1 / interval if mode == "interval" else VIDEO_SCENE_SAMPLE_FPS
+        previous = None
+        for index, frame in enumerate(clip.iter_frames(fps=fps, dtype="uint8")):
+            seconds = index / fps
+            if mode != "interval":
+                current = thumbnail(frame)
+                changed = previous is None or np.abs(current - previous).mean() > VIDEO_SCENE_THRESHOLD
+                previous = current
+                if not changed:
+                    continue
+            yield seconds, Image.fromarray(frame)
+
+
+def sample_frames(video_path, mode=VIDEO_FRAME_MODE, interval=VIDEO_FRAME_INTERVAL,
+                  max_distance=VIDEO_HASH_DISTANCE, max_frames=VIDEO_MAX_FRAMES):
+    """
+    Distinct frames of a video as [(seconds, PIL image)]. Near-duplicates
+    are dropped as frames are decoded and decoding stops at max_frames,
+    so memory is bounded by the frames kept, not the video's length.
+    """
+    frames = candidate_frames(video_path, mode, interval)
+    try:
+        return unique_frames(frames, max_distance, max_frames)
+    finally:
+        frames.close()
+
+
+def unique_frames(frames, max_distance=VIDEO_HASH_DISTANCE, max_frames=VIDEO_MAX_FRAMES):
+    """
+    Drop frames that look like one already kept (a slide shown twice, or
+    a speaker moving in front of the same slide), keeping the first time
+    each one appears. frames may be a generator; it is read only until
+    max_frames are kept.
+    """
+    kept = []
+    hashes = []
+    for seconds, image in frames:
+        frame_hash = dhash(image)
+        if any(hamming(frame_hash, seen) <= max_distance for seen in hashes):
+            continue
+        hashes.append(frame_hash)
+        kept.append((seconds, image))
+        if len(kept) >= max_frames:
+            logger.info(f"Reached VIDEO_MAX_FRAMES ({max_frames}), skipping later frames")
+            break
+    return kept
+
+
+def format_timestamp(seconds):
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    if hours:
+        return f"{hours}:{minutes:02d}:{seconds:02d}"
+    return f"{minutes:02d}:{seconds:02d}"
+
+
+def merge_timeline(speech_segments, slides):
+    """
+    Interleave speech segments and slide text by start time. Both are
+    lists of {"start", "text"}; speech comes first on equal timestamps.
+    """
+    entries = [(segment["start"], 0, "Speech", segment["text"]) for segment in speech_segments if segment["text"]]
+    entries += [(slide["start"], 1, "Slide", slide["text"]) for slide in slides if slide["text"]]
+    entries.sort(key=lambda entry: (entry[0], entry[1]))
+    return "\n".join(f"[{format_timestamp(start)}] {kind}: {text}" for start, _, kind, text in entries)
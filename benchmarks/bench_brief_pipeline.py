@@ -0,0 +1,103 @@
+"""
+Throughput and latency of /brief-with-meetings against the fake LLM provider.
+
+Usage (from the repo root):
+    python benchmarks/bench_brief_pipeline.py --requests 40 --concurrency 8 --latency-ms 800 --error-rate 0.05
+
+Runs the whole endpoint in-process (parsing, summarizing, brief,
+schedule and PDF) with LLM_PROVIDER=fake, so no key or network is
+needed. The fake's latency distribution and injected error rate are set
+from the command line; the rate limiter can be enabled with --rpm.
+Reports requests per second, latency percentiles, fallback schedules,
+and the limiter's view from /llm-stats.
+"""
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+
+parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+parser.add_argument("--requests", type=int, default=40)
+parser.add_argument("--concurrency", type=int, default=8)
+parser.add_argument("--latency-ms", type=float, default=800)
+parser.add_argument("--latency-sigma", type=float, default=0.5)
+parser.add_argument("--error-rate", type=float, default=0.0)
+parser.add_argument("--rpm", type=int, default=0)
+parser.add_argument("--seed", default="1")
+args = parser.parse_args()
+
+# The provider and limiter read their settings at import
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+os.environ.update({
+    "LLM_PROVIDER": "fake",
+    "FAKE_LLM_LATENCY_MS": str(args.latency_ms),
+    "FAKE_LLM_LATENCY_SIGMA": str(args.latency_sigma),
+    "FAKE_LLM_ERROR_RATE": str(args.error_rate),
+    "FAKE_LLM_SEED": args.seed,
+    "LLM_RPM_LIMIT": str(args.rpm),
+    "LLM_BACKOFF_BASE": "0.2",
+})
+
+import httpx
+
+from main import app
+from utils.executor import shutdown_pools
+
+# Per-request INFO logs would drown the report
+logging.disable(logging.INFO)
+
+
+def source_text(i):
+    return (f"Campaign {i}: we are launching eco-friendly notebooks for students and young professionals.\n"
+            f"Budget is ${50 + i}k over six weeks, with recycled paper and carbon-neutral shipping.\n")
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+async def run():
+    transport = httpx.ASGITransport(app=app)
+    semaphore = asyncio.Semaphore(args.concurrency)
+    latencies = []
+    failures = 0
+    fallbacks = 0
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        async def one(i):
+            nonlocal failures, fallbacks
+            async with semaphore:
+                start = time.perf_counter()
+                files = {"files": (f"notes_{i}.txt", source_text(i).encode(), "text/plain")}
+                response = await client.post("/brief-with-meetings", files=files, data={"bypass_cache": "true"})
+                latencies.append(time.perf_counter() - start)
+                if response.status_code != 200 or response.json()["brief"].startswith("Error"):
+                    failures += 1
+                elif not response.json()["actions"]:
+                    fallbacks += 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(args.requests)))
+        elapsed = time.perf_counter() - start
+        stats = (await client.get("/llm-stats")).json()
+
+    print(f"{args.requests} requests, concurrency {args.concurrency}, fake latency {args.latency_ms:g} ms "
+          f"(sigma {args.latency_sigma:g}), error rate {args.error_rate:g}, rpm limit {args.rpm or 'off'}")
+    print(f"throughput: {args.requests / elapsed:.2f} req/s")
+    print(f"latency:    p50 {percentile(latencies, 50):.2f} s, p95 {percentile(latencies, 95):.2f} s, "
+          f"max {max(latencies):.2f} s")
+    print(f"failed briefs: {failures}, fallback schedules: {fallbacks}")
+    for model, model_stats in stats.items():
+        waits = model_stats["wait_seconds"]
+        print(f"{model}: admitted {model_stats['admitted']}, queue wait p50 {waits['p50']} s, p95 {waits['p95']} s")
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(run())
+    finally:
+        shutdown_pools()
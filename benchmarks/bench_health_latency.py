@@ -0,0 +1,92 @@
+"""
+Measure /health latency while N uploads are being parsed.
+
+Usage (from the repo root):
+    python benchmarks/bench_health_latency.py --uploads 8 --pages 40
+
+The uploads are generated multi-page PDFs sent to /parse, so no OpenAI key is needed.
+"""
+import argparse
+import asyncio
+import io
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+
+import httpx
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfgen import canvas
+
+from main import app
+from utils.executor import shutdown_pools
+
+
+def make_pdf(pages):
+    buffer = io.BytesIO()
+    c = canvas.Canvas(buffer, pagesize=letter)
+    for page in range(pages):
+        y = 720
+        for line in range(40):
+            c.drawString(72, y, f"Page {page + 1} line {line + 1}: quarterly campaign performance notes")
+            y -= 16
+        c.showPage()
+    c.save()
+    return buffer.getvalue()
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def run(uploads, pages, interval):
+    pdf_bytes = make_pdf(pages)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        latencies = []
+
+        async def upload(i):
+            files = {"file": (f"deck_{i}.pdf", pdf_bytes, "application/pdf")}
+            response = await client.post("/parse", files=files)
+            response.raise_for_status()
+
+        async def probe(stop):
+            while not stop.is_set():
+                start = time.perf_counter()
+                response = await client.get("/health")
+                response.raise_for_status()
+                latencies.append((time.perf_counter() - start) * 1000)
+                await asyncio.sleep(interval)
+
+        stop = asyncio.Event()
+        probe_task = asyncio.create_task(probe(stop))
+        start = time.perf_counter()
+        await asyncio.gather(*(upload(i) for i in range(uploads)))
+        elapsed = time.perf_counter() - start
+        stop.set()
+        await probe_task
+
+    print(f"uploads in flight: {uploads} ({pages} pages each, {len(pdf_bytes) / 1024:.0f} KiB)")
+    print(f"upload wall time:  {elapsed:.2f}s")
+    print(f"/health samples:   {len(latencies)}")
+    if latencies:
+        print(f"/health p50:       {statistics.median(latencies):.2f} ms")
+        print(f"/health p99:       {percentile(latencies, 99):.2f} ms")
+        print(f"/health max:       {max(latencies):.2f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--uploads", type=int, default=8)
+    parser.add_argument("--pages", type=int, default=40)
+    parser.add_argument("--interval", type=float, default=0.01, help="seconds between /health probes")
+    args = parser.parse_args()
+    try:
+        asyncio.run(run(args.uploads, args.pages, args.interval))
+    finally:
+        shutdown_pools()
@@ -0,0 +1,153 @@
+"""
+Disk bytes written and peak memory when decoding uploaded audio and video.
+
+Usage (from the repo root):
+    python benchmarks/bench_media_io.py --seconds 600
+
+Generates a video (MP4, index at the end as most recorders write it) and
+an MP3, then runs each through the loader's decoding path in a fresh
+process and reports the bytes the process and its ffmpeg children sent
+to the block layer (/proc/self/io write_bytes), the peak RSS of the
+Python process (VmHWM) and of its largest ffmpeg child, and the bytes
+that would be uploaded for transcription.
+
+"legacy" reproduces the previous path: the upload written to a temp file,
+the audio track written out as WAV and read back. "current" is
+decode_audio plus Opus segment encoding, so it also pays for compression.
+"""
+import argparse
+import io
+import json
+import os
+import re
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+os.environ.setdefault("TRANSCRIPTION_BACKEND", "stub")
+
+
+def io_counters():
+    with open("/proc/self/io") as f:
+        return {key: int(value) for key, value in (line.split(": ") for line in f)}
+
+
+def peak_rss_mb():
+    with open("/proc/self/status") as f:
+        return int(re.search(r"VmHWM:\s+(\d+)", f.read()).group(1)) / 1024
+
+
+def make_corpus(directory, seconds):
+    import numpy as np
+    from moviepy.editor import ColorClip
+    from moviepy.audio.AudioClip import AudioArrayClip
+    from pydub import AudioSegment
+    from utils.media_io import encode_audio
+
+    t = np.linspace(0, seconds, seconds * 22050, endpoint=False)
+    # Speech-like bursts separated by pauses
+    tone = 0.3 * np.sin(2 * np.pi * 300 * t) * (np.sin(2 * np.pi * t / 6) > -0.3)
+    stereo = np.column_stack([tone, tone])
+
+    video_path = os.path.join(directory, "talk.mp4")
+    clip = ColorClip((640, 360), color=(20, 60, 120), duration=seconds).set_fps(5)
+    clip = clip.set_audio(AudioArrayClip(stereo, fps=22050))
+    clip.write_videofile(video_path, codec="libx264", audio_codec="aac", verbose=False, logger=None)
+
+    pcm = (tone * 32767).astype(np.int16).tobytes()
+    audio = AudioSegment(data=pcm, sample_width=2, frame_rate=22050, channels=1)
+    audio_path = os.path.join(directory, "call.mp3")
+    with open(audio_path, "wb") as f:
+        f.write(encode_audio(audio, "mp3", "libmp3lame", "64k").getvalue())
+    return {"video": video_path, "audio": audio_path}
+
+
+def legacy(kind, file_bytes):
+    from moviepy.editor import VideoFileClip
+    from pydub import AudioSegment
+    from utils.media_io import FFMPEG_BINARY
+
+    with tempfile.NamedTemporaryFile(suffix=".mp4" if kind == "video" else ".mp3", delete=False) as temp_input:
+        temp_input.write(file_bytes)
+    with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as temp_audio:
+        pass
+    try:
+        if kind == "video":
+            with VideoFileClip(temp_input.name) as video:
+                video.audio.write_audiofile(temp_audio.name, verbose=False, logger=None)
+        else:
+            # pydub decodes with ffmpeg, then the loader exported a 16 kHz mono WAV
+            subprocess.run([FFMPEG_BINARY, "-loglevel", "error", "-y", "-i", temp_input.name,
+                            "-ac", "1", "-ar", "16000", temp_audio.name], check=True)
+        audio = AudioSegment.from_file(temp_audio.name)
+        with open(temp_audio.name, "rb") as f:
+            uploaded = len(f.read())
+        return len(audio), uploaded
+    finally:
+        os.unlink(temp_input.name)
+        os.unlink(temp_audio.name)
+
+
+def current(kind, file_bytes):
+    from utils.media_io import decode_audio
+    from utils.transcription import StubTranscriber, transcribe_audio
+
+    uploaded = []
+
+    class SizeTranscriber(StubTranscriber):
+        def transcribe(self, audio_file):
+            uploaded.append(len(audio_file.getvalue()))
+            return self.text
+
+    audio = decode_audio(file_bytes)
+    transcribe_audio(audio, transcriber=SizeTranscriber())
+    return len(audio), sum(uploaded)
+
+
+def run_variant(variant, kind, path):
+    with open(path, "rb") as f:
+        file_bytes = bytearray(f.read())
+    before = io_counters()
+    start = time.perf_counter()
+    duration_ms, uploaded = (legacy if variant == "legacy" else current)(kind, file_bytes)
+    elapsed = time.perf_counter() - start
+    after = io_counters()
+    print(json.dumps({
+        "seconds": elapsed,
+        "duration_ms": duration_ms,
+        "write_bytes": after["write_bytes"] - before["write_bytes"],
+        "cancelled_write_bytes": after["cancelled_write_bytes"] - before["cancelled_write_bytes"],
+        "uploaded_bytes": uploaded,
+        # ru_maxrss survives exec, so it would report the parent's peak
+        "max_rss_mb": peak_rss_mb(),
+        "children_max_rss_mb": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024,
+    }))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=int, default=600)
+    parser.add_argument("--variant", help=argparse.SUPPRESS)
+    parser.add_argument("--kind", help=argparse.SUPPRESS)
+    parser.add_argument("--path", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.variant:
+        run_variant(args.variant, args.kind, args.path)
+        sys.exit(0)
+
+    with tempfile.TemporaryDirectory() as directory:
+        corpus = make_corpus(directory, args.seconds)
+        for kind, path in corpus.items():
+            print(f"{kind}: {os.path.getsize(path) / 1e6:.1f} MB, {args.seconds}s")
+            for variant in ("legacy", "current"):
+                output = subprocess.run([sys.executable, __file__, "--variant", variant, "--kind", kind,
+                                         "--path", path], capture_output=True, text=True, check=True).stdout
+                result = json.loads(output.strip().splitlines()[-1])
+                print(f"  {variant:<8} {result['seconds']:6.2f}s  disk written {result['write_bytes'] / 1e6:7.1f} MB"
+                      f"  upload {result['uploaded_bytes'] / 1e6:6.1f} MB"
+                      f"  peak RSS {result['max_rss_mb']:5.0f} MB (ffmpeg {result['children_max_rss_mb']:.0f} MB)")
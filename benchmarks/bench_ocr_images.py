@@ -0,0 +1,64 @@
+"""
+Image OCR cost per megapixel with and without preprocessing.
+
+Usage (from the repo root):
+    python benchmarks/bench_ocr_images.py --images 3 --megapixels 24
+
+Draws large synthetic text pages (phone-photo sized, slightly rotated),
+then times preprocess_for_ocr alone and the full ocr_image call with
+preprocessing off and on. The OCR timings are skipped when the tesseract
+binary is not installed.
+"""
+import argparse
+import os
+import shutil
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+
+from PIL import Image, ImageDraw
+
+from utils.file_loader import ocr_image
+from utils.image_preprocess import preprocess_for_ocr
+
+
+def make_image(megapixels, seed):
+    width = int((megapixels * 1_000_000 * 3 / 4) ** 0.5)
+    height = int(width * 4 / 3)
+    image = Image.new("RGB", (width, height), (235, 232, 225))
+    draw = ImageDraw.Draw(image)
+    line_height = max(12, height // 120)
+    for i, y in enumerate(range(line_height * 2, height - line_height * 2, line_height * 2)):
+        draw.text((width // 12, y), f"{i + 1}. Campaign {seed} reached {(seed * 13 + i) % 90}% of the target audience",
+                  fill=(30, 30, 30))
+    return image.rotate(2, fillcolor=(235, 232, 225))
+
+
+def timed(fn, images):
+    start = time.perf_counter()
+    for image in images:
+        fn(image)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--images", type=int, default=3)
+    parser.add_argument("--megapixels", type=float, default=24)
+    args = parser.parse_args()
+
+    images = [make_image(args.megapixels, seed) for seed in range(args.images)]
+    total_mp = sum(image.width * image.height for image in images) / 1_000_000
+
+    elapsed = timed(preprocess_for_ocr, images)
+    print(f"preprocess only      {elapsed:7.2f}s  {elapsed / total_mp * 1000:7.1f} ms/MP")
+
+    if shutil.which("tesseract") is None:
+        print("tesseract not installed, skipping OCR timings")
+        sys.exit(0)
+
+    for label, preprocess in (("ocr, raw image", False), ("ocr, preprocessed", True)):
+        elapsed = timed(lambda image: ocr_image(image, preprocess=preprocess), images)
+        print(f"{label:<20} {elapsed:7.2f}s  {elapsed / total_mp * 1000:7.1f} ms/MP")
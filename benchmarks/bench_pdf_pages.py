@@ -0,0 +1,69 @@
+"""
+PDF extraction throughput across process pool sizes.
+
+Usage (from the repo root):
+    python benchmarks/bench_pdf_pages.py --docs 3 --pages 200 --pools 1 2 4
+
+Generates a corpus of multi-page PDFs with reportlab, then runs load_pdf
+with each pool size in layout mode and fast (text-layer-only) mode.
+"""
+import argparse
+import io
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfgen import canvas
+
+from utils.file_loader import load_pdf
+
+
+def make_pdf(pages, seed):
+    buffer = io.BytesIO()
+    c = canvas.Canvas(buffer, pagesize=letter)
+    for page in range(pages):
+        y = 720
+        c.setFont("Helvetica-Bold", 14)
+        c.drawString(72, y, f"Deck {seed} - Slide {page + 1}")
+        c.setFont("Helvetica", 10)
+        for line in range(38):
+            y -= 17
+            c.drawString(72, y, f"{line + 1}. Regional revenue grew {(seed * 7 + page + line) % 40}% "
+                                f"with campaign {page % 9} in segment {line % 5}")
+        c.showPage()
+    c.save()
+    return buffer.getvalue()
+
+
+def run(corpus, pool_size, fast):
+    pages = 0
+    with ProcessPoolExecutor(max_workers=pool_size) as pool:
+        # Warm the workers so process start-up is not counted
+        list(pool.map(abs, range(pool_size)))
+        start = time.perf_counter()
+        for pdf_bytes in corpus:
+            text = load_pdf(pdf_bytes, fast=fast, executor=pool if pool_size > 1 else None)
+            pages += text.count("--- Page ")
+        elapsed = time.perf_counter() - start
+    return pages, elapsed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=3)
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--pools", type=int, nargs="+", default=[1, 2, 4])
+    args = parser.parse_args()
+
+    corpus = [make_pdf(args.pages, seed) for seed in range(args.docs)]
+    print(f"corpus: {args.docs} PDFs x {args.pages} pages")
+    print(f"{'mode':<8}{'workers':>8}{'seconds':>10}{'pages/s':>10}")
+    for fast in (False, True):
+        for pool_size in args.pools:
+            pages, elapsed = run(corpus, pool_size, fast)
+            print(f"{'fast' if fast else 'layout':<8}{pool_size:>8}{elapsed:>10.2f}{pages / elapsed:>10.1f}")
@@ -0,0 +1,74 @@
+"""
+Time of spreadsheet column statistics, per-column loop vs vectorized profile.
+
+Usage (from the repo root):
+    python benchmarks/bench_profile_columns.py --rows 100000 --columns 10 100 500
+
+Builds a numeric frame per column count and reports the time of the
+previous per-column summary (describe() on each numeric column) against
+TableSummary plus profile_lines, which also covers null rates,
+quantiles and every non-numeric column.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+
+import numpy as np
+import pandas as pd
+
+from utils.tabular import TableSummary, profile_lines
+
+
+def make_frame(rows, columns):
+    rng = np.random.default_rng(0)
+    frame = pd.DataFrame(rng.normal(1000, 250, (rows, columns)), columns=[f"metric_{i}" for i in range(columns)])
+    frame.iloc[::50, ::3] = np.nan
+    return frame
+
+
+def per_column_loop(frame):
+    # Previous load_csv numeric summary
+    lines = []
+    for col in frame.select_dtypes(include="number").columns:
+        desc = frame[col].describe()
+        lines.append(f"{col}: count={desc['count']}, mean={desc['mean']:.2f}, min={desc['min']}, max={desc['max']}")
+    return lines
+
+
+def vectorized_profile(frame, chunk_rows):
+    summary = TableSummary(max_columns=frame.shape[1])
+    for start in range(0, len(frame), chunk_rows):
+        summary.add(frame.iloc[start:start + chunk_rows])
+    return profile_lines(summary)
+
+
+def timed(function, *args, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--columns", type=int, nargs="+", default=[10, 100, 500])
+    parser.add_argument("--chunk-rows", type=int, default=50_000)
+    args = parser.parse_args()
+
+    print(f"{'columns':>8} {'loop s':>8} {'profile s':>10}")
+    for columns in args.columns:
+        frame = make_frame(args.rows, columns)
+        loop = timed(per_column_loop, frame)
+        profile = timed(vectorized_profile, frame, args.chunk_rows)
+        print(f"{columns:>8} {loop:>8.3f} {profile:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
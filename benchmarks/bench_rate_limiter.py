@@ -0,0 +1,68 @@
+"""
+Queue wait of interactive and batch LLM calls under a rate limit.
+
+Usage (from the repo root):
+    python benchmarks/bench_rate_limiter.py --rpm 600 --batch 200 --interactive 20
+
+Offers a burst of batch calls (summaries, transcription segments) and,
+while they queue, a trickle of interactive brief calls to one limited
+model. Runs once with priorities and once with every call at the same
+priority (first come, first served) and reports the wait of each class.
+No requests leave the machine; the limiter is exercised on its own.
+"""
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+
+from utils.rate_limiter import PRIORITY_BATCH, PRIORITY_INTERACTIVE, ModelLimiter
+
+
+def run(rpm, batch, interactive, spacing, prioritized):
+    limiter = ModelLimiter("gpt-3.5-turbo", rpm=rpm, tpm=0)
+    # Start with the burst budget spent, as at peak
+    while limiter.requests.level >= 1:
+        limiter.requests.take(1)
+    waits = {"batch": [], "interactive": []}
+
+    def call(kind, priority):
+        waits[kind].append(limiter.acquire(priority=priority if prioritized else PRIORITY_BATCH, timeout=600))
+
+    threads = [threading.Thread(target=call, args=("batch", PRIORITY_BATCH)) for _ in range(batch)]
+    for thread in threads:
+        thread.start()
+    for _ in range(interactive):
+        time.sleep(spacing)
+        thread = threading.Thread(target=call, args=("interactive", PRIORITY_INTERACTIVE))
+        thread.start()
+        threads.append(thread)
+    for thread in threads:
+        thread.join()
+    return waits
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rpm", type=int, default=600)
+    parser.add_argument("--batch", type=int, default=200)
+    parser.add_argument("--interactive", type=int, default=20)
+    parser.add_argument("--spacing", type=float, default=0.5, help="seconds between interactive calls")
+    args = parser.parse_args()
+
+    print(f"{'mode':>12} {'class':>12} {'p50 wait s':>11} {'p95 wait s':>11}")
+    for prioritized in (False, True):
+        waits = run(args.rpm, args.batch, args.interactive, args.spacing, prioritized)
+        for kind, samples in waits.items():
+            samples.sort()
+            p95 = samples[int(len(samples) * 0.95) - 1]
+            mode = "priority" if prioritized else "fifo"
+            print(f"{mode:>12} {kind:>12} {statistics.median(samples):>11.2f} {p95:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
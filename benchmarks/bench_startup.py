@@ -0,0 +1,80 @@
+"""
+Cold start of the backend: time and memory from launch to the first served request.
+
+Usage (from the repo root):
+    python benchmarks/bench_startup.py --runs 3 --prewarm "" all
+
+Starts uvicorn in a fresh process for each run and polls /health until it
+answers. Reports the time from launch to the first 200, the server's RSS
+at that moment, and its RSS after --settle seconds, when background
+prewarming (PREWARM_LOADERS) has finished.
+"""
+import argparse
+import os
+import re
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def rss_mb(pid):
+    with open(f"/proc/{pid}/status") as f:
+        return int(re.search(r"VmRSS:\s+(\d+)", f.read()).group(1)) / 1024
+
+
+def start_once(prewarm, settle):
+    port = free_port()
+    env = dict(os.environ, PREWARM_LOADERS=prewarm)
+    env.setdefault("OPENAI_API_KEY", "sk-benchmark")
+    start = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        while True:
+            if server.poll() is not None:
+                raise RuntimeError("server exited during startup")
+            try:
+                if httpx.get(f"http://127.0.0.1:{port}/health", timeout=1).status_code == 200:
+                    break
+            except httpx.TransportError:
+                pass
+            time.sleep(0.01)
+        ready = time.perf_counter() - start
+        ready_rss = rss_mb(server.pid)
+        time.sleep(settle)
+        return ready, ready_rss, rss_mb(server.pid)
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--prewarm", nargs="+", default=["", "all"])
+    parser.add_argument("--settle", type=float, default=5.0)
+    args = parser.parse_args()
+
+    print(f"{'prewarm':>10} {'first /health s':>16} {'RSS MB':>8} {'settled RSS MB':>15}")
+    for prewarm in args.prewarm:
+        results = [start_once(prewarm, args.settle) for _ in range(args.runs)]
+        ready, ready_rss, settled_rss = (statistics.median(values) for values in zip(*results))
+        print(f"{prewarm or 'off':>10} {ready:>16.2f} {ready_rss:>8.0f} {settled_rss:>15.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Peak memory and time of CSV summarization, full read vs chunked.
+
+Usage (from the repo root):
+    python benchmarks/bench_tabular_memory.py --mb 200
+
+Writes a synthetic campaign export of about --mb megabytes, then
+summarizes it in a fresh process per variant and reports wall time and
+peak RSS (VmHWM). Both variants start from the upload held in memory,
+as load_csv receives it. "full" is the previous load_csv, which decoded
+the whole file and read it into one DataFrame.
+"""
+import argparse
+import io
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+
+
+def peak_rss_mb():
+    with open("/proc/self/status") as f:
+        return int(re.search(r"VmHWM:\s+(\d+)", f.read()).group(1)) / 1024
+
+
+def write_csv(path, megabytes):
+    import numpy as np
+    import pandas as pd
+
+    rng = np.random.default_rng(0)
+    rows = 200_000
+    with open(path, "w", encoding="utf-8") as f:
+        first = True
+        while f.tell() < megabytes * 1024 * 1024:
+            pd.DataFrame({
+                "date": pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 365, rows), unit="D"),
+                "region": rng.choice(["North", "South", "East", "West"], rows),
+                "channel": rng.choice(["search", "social", "video", "email"], rows),
+                "spend": rng.integers(10, 5000, rows),
+                "impressions": rng.integers(1000, 10**6, rows),
+                "ctr": rng.random(rows).round(4),
+            }).to_csv(f, index=False, header=first)
+            first = False
+
+
+def full_read(file_bytes):
+    import pandas as pd
+
+    df = pd.read_csv(io.StringIO(file_bytes.decode("utf-8")))
+    df.head(10).to_string(index=False)
+    return len(df), [df[col].describe()["mean"] for col in df.select_dtypes(include=["number"]).columns]
+
+
+def chunked(file_bytes):
+    from utils.tabular import summarize_csv_stream
+
+    summary, _ = summarize_csv_stream(file_bytes)
+    return summary.rows, [summary.describe(col)[1] for col in summary.numeric_columns()]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mb", type=int, default=200)
+    parser.add_argument("--variant", help=argparse.SUPPRESS)
+    parser.add_argument("--path", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.variant:
+        file_bytes = bytearray(os.path.getsize(args.path))
+        with open(args.path, "rb") as f:
+            f.readinto(file_bytes)
+        loaded_mb = peak_rss_mb()
+        start = time.perf_counter()
+        rows, means = (full_read if args.variant == "full" else chunked)(file_bytes)
+        print(json.dumps({"seconds": time.perf_counter() - start, "rows": rows, "means": means,
+                          "loaded_mb": loaded_mb, "peak_mb": peak_rss_mb()}))
+        sys.exit(0)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "export.csv")
+        write_csv(path, args.mb)
+        print(f"csv: {os.path.getsize(path) / 1e6:.0f} MB")
+        for variant in ("full", "chunked"):
+            output = subprocess.run([sys.executable, __file__, "--variant", variant, "--path", path],
+                                    capture_output=True, text=True, check=True).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            print(f"  {variant:<8} {result['seconds']:6.2f}s  rows {result['rows']}"
+                  f"  peak RSS {result['peak_mb']:6.0f} MB ({result['peak_mb'] - result['loaded_mb']:.0f} MB over the upload)")
@@ -0,0 +1,61 @@
+"""
+Real-time factor (processing seconds per second of audio) per transcription backend.
+
+Usage (from the repo root):
+    python benchmarks/bench_transcription_rtf.py --file talk.mp3 --backends openai local
+
+Without --file a synthetic recording of tones and pauses is used, which
+is only meaningful for the stub backend and for segmenting overhead.
+Backends that cannot be loaded (no API key, faster-whisper or model
+files missing) are reported and skipped. Model load time is reported
+separately from the warm RTF.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+
+from pydub import AudioSegment
+from pydub.generators import Sine
+
+from utils.transcription import TRANSCRIBERS, transcribe_audio
+
+
+def synthetic_recording(seconds):
+    audio = AudioSegment.silent(duration=0, frame_rate=16000)
+    while len(audio) < seconds * 1000:
+        audio += Sine(220 + len(audio) % 400).to_audio_segment(duration=4000).set_frame_rate(16000)
+        audio += AudioSegment.silent(duration=700, frame_rate=16000)
+    return audio[:seconds * 1000].set_channels(1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--file", help="Audio file to transcribe")
+    parser.add_argument("--seconds", type=int, default=120, help="Length of the synthetic recording")
+    parser.add_argument("--backends", nargs="+", default=["stub", "openai", "local"])
+    parser.add_argument("--runs", type=int, default=2)
+    args = parser.parse_args()
+
+    audio = AudioSegment.from_file(args.file) if args.file else synthetic_recording(args.seconds)
+    duration = len(audio) / 1000.0
+    print(f"audio: {duration:.1f}s")
+
+    for name in args.backends:
+        start = time.perf_counter()
+        try:
+            transcriber = TRANSCRIBERS[name]()
+        except Exception as e:
+            print(f"{name:<8} skipped: {e}")
+            continue
+        load_seconds = time.perf_counter() - start
+
+        timings = []
+        for _ in range(args.runs):
+            start = time.perf_counter()
+            transcribe_audio(audio, transcriber=transcriber)
+            timings.append(time.perf_counter() - start)
+        best = min(timings)
+        print(f"{name:<8} load {load_seconds:6.2f}s  best {best:7.2f}s  RTF {best / duration:.3f}")
@@ -0,0 +1,100 @@
+"""
+Memory used by /parse for large uploads, and how much of an oversized
+upload the server reads before rejecting it.
+
+Usage (from the repo root):
+    python benchmarks/bench_upload_memory.py --size-mb 200
+
+Uploads a synthetic .mp4 of the given size (MAX_FILE_SIZE_MB is raised to
+fit it). The video loader fails on the random bytes, so no OpenAI key is
+needed; what is measured is the upload path.
+"""
+import argparse
+import asyncio
+import os
+import resource
+import sys
+import tracemalloc
+
+parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+parser.add_argument("--size-mb", type=int, default=200)
+parser.add_argument("--oversize-mb", type=int, default=2048, help="declared size of the rejected upload")
+args = parser.parse_args()
+
+os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+os.environ["MAX_FILE_SIZE_MB"] = str(args.size_mb + 1)
+os.environ["MAX_REQUEST_SIZE_MB"] = str(args.size_mb + 2)
+os.environ["PARSE_CACHE_ENABLED"] = "0"
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+
+import httpx
+
+from main import app
+from utils.executor import shutdown_pools
+
+
+def rss_mb():
+    # ru_maxrss is KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+async def measure_large_upload(client, size_mb):
+    payload = os.urandom(size_mb * 1024 * 1024)
+    files = {"file": ("recording.mp4", payload, "video/mp4")}
+    request = client.build_request("POST", "/parse", files=files)
+    # Build the multipart body up front so only the server side is traced
+    body = b"".join([chunk async for chunk in request.stream])
+    request = client.build_request("POST", "/parse", content=body, headers=dict(request.headers))
+    del payload
+
+    tracemalloc.start()
+    response = await client.send(request)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"upload size:            {size_mb} MiB")
+    print(f"response status:        {response.status_code}")
+    print(f"peak traced allocation: {peak / 1024 / 1024:.1f} MiB ({peak / len(body):.2f}x the upload)")
+    print(f"process max RSS:        {rss_mb():.1f} MiB")
+
+
+async def measure_rejection(client, declared_mb):
+    consumed = 0
+
+    async def body():
+        nonlocal consumed
+        head = (b'--x\r\nContent-Disposition: form-data; name="file"; filename="big.mp4"\r\n'
+                b'Content-Type: video/mp4\r\n\r\n')
+        consumed += len(head)
+        yield head
+        chunk = b"\0" * (1024 * 1024)
+        for _ in range(declared_mb):
+            consumed += len(chunk)
+            yield chunk
+
+    headers = {
+        "content-type": "multipart/form-data; boundary=x",
+        "content-length": str(declared_mb * 1024 * 1024),
+    }
+    response = await client.post("/parse", content=body(), headers=headers)
+    print(f"oversized upload:       {declared_mb} MiB declared -> {response.status_code}, "
+          f"{consumed / 1024 / 1024:.0f} MiB read by the server")
+
+    # Same upload without Content-Length (chunked), cut off at the limit
+    consumed = 0
+    response = await client.post("/parse", content=body(), headers={"content-type": headers["content-type"]})
+    print(f"chunked oversized:      {response.status_code}, {consumed / 1024 / 1024:.0f} MiB read before rejection")
+
+
+async def run():
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        await measure_large_upload(client, args.size_mb)
+        await measure_rejection(client, args.oversize_mb)
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(run())
+    finally:
+        shutdown_pools()
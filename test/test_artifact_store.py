@@ -0,0 +1,42 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+
+from utils.artifact_store import ArtifactStore
+
+
+def test_each_put_gets_its_own_id_but_shares_content(tmp_path):
+    store = ArtifactStore(root=str(tmp_path), ttl_seconds=60)
+    first = store.put(b"%PDF-1.3 brief", "brief_output.pdf", "application/pdf")
+    second = store.put(b"%PDF-1.3 brief", "brief_output.pdf", "application/pdf")
+
+    assert first != second
+    assert store.get(first)[0] == b"%PDF-1.3 brief"
+    assert len(os.listdir(tmp_path / "blobs")) == 1
+
+
+def test_expired_and_unknown_ids_are_not_served(tmp_path):
+    store = ArtifactStore(root=str(tmp_path), ttl_seconds=-1)
+    download_id = store.put(b"%PDF-1.3 old", "brief_output.pdf", "application/pdf")
+
+    assert store.get(download_id) is None
+    assert store.get("../../etc/passwd") is None
+    assert store.cleanup() == 1
+    assert os.listdir(tmp_path / "ids") == []
+
+
+def test_download_uses_the_stored_filename(tmp_path, monkeypatch):
+    os.environ.setdefault("OPENAI_API_KEY", "sk-test")
+    from fastapi.testclient import TestClient
+    import utils.artifact_store as artifact_store
+    from main import app
+
+    store = ArtifactStore(root=str(tmp_path), ttl_seconds=60)
+    monkeypatch.setattr(artifact_store, "_artifact_store", store)
+    download_id = store.put(b"%PDF-1.3 brief", "q3_launch.pdf", "application/pdf")
+
+    response = TestClient(app).get(f"/download-pdf/{download_id}")
+
+    assert response.status_code == 200
+    assert response.content == b"%PDF-1.3 brief"
+    assert response.headers["content-disposition"] == 'attachment; filename="q3_launch.pdf"'
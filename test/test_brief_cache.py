@@ -0,0 +1,75 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+
+import pytest
+
+from utils.brief_cache import BriefCache, MemoryBriefCache, SQLiteBriefCache, make_brief_cache_key
+
+
+def test_key_normalizes_whitespace_and_language():
+    a = make_brief_cache_key("Launch  eco notebooks\n", "English", "gpt-3.5-turbo", 0.4, 1)
+    b = make_brief_cache_key("Launch eco notebooks", " english ", "gpt-3.5-turbo", 0.4, 1)
+    c = make_brief_cache_key("Launch eco notebooks", "English", "gpt-3.5-turbo", 0.4, 2)
+    assert a == b
+    assert a != c
+
+
+def test_memory_cache_lru_and_ttl():
+    cache = MemoryBriefCache(max_items=2, ttl_seconds=60)
+    cache.set("a", "brief a")
+    cache.set("b", "brief b")
+    cache.get("a")
+    cache.set("c", "brief c")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "brief a"
+
+    expired = MemoryBriefCache(max_items=2, ttl_seconds=-1)
+    expired.set("a", "brief a")
+    assert expired.get("a") is None
+
+
+def test_sqlite_cache_persists_and_evicts(tmp_path):
+    path = str(tmp_path / "briefs.sqlite3")
+    cache = SQLiteBriefCache(path=path, max_items=2, ttl_seconds=60)
+    cache.set("a", "brief a")
+    cache.set("b", "brief b")
+    cache.set("c", "brief c")
+
+    reopened = SQLiteBriefCache(path=path, max_items=2, ttl_seconds=60)
+    assert len(reopened) == 2
+    assert reopened.get("c") == "brief c"
+    assert reopened.stats()["hits"] == 1
+
+
+def test_incomplete_backend_fails_at_construction():
+    class WriteOnlyCache(BriefCache):
+        def _set(self, key, value):
+            pass
+
+    with pytest.raises(TypeError):
+        WriteOnlyCache()
+
+
+def test_brief_prompt_uses_the_language_the_cache_is_keyed_on(monkeypatch):
+    os.environ.setdefault("OPENAI_API_KEY", "sk-test")
+    from types import SimpleNamespace
+    import agents.briefer_agent as briefer_agent
+
+    prompts = []
+
+    def fake_completion(messages, **kwargs):
+        prompts.append(messages[0]["content"])
+        message = SimpleNamespace(content=f"Brief {len(prompts)}")
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+    monkeypatch.setattr(briefer_agent, "chat_completion", fake_completion)
+    cache = MemoryBriefCache()
+    monkeypatch.setattr(briefer_agent, "get_brief_cache", lambda: cache)
+
+    first = briefer_agent.generate_brief("Launch eco notebooks", " Brazilian  Portuguese ")
+    second = briefer_agent.generate_brief("Launch eco notebooks", "brazilian portuguese")
+
+    assert first == second == "Brief 1"
+    assert "**in Brazilian Portuguese**" in prompts[0]
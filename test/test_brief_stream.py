@@ -0,0 +1,111 @@
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+os.environ.setdefault("OPENAI_API_KEY", "sk-test")
+
+import httpx
+import pytest
+
+import utils.executor as executor
+import utils.fake_llm as fake_llm
+import utils.llm_client as llm_client
+from agents.briefer_agent import stream_brief
+from utils.executor import iterate_in_thread
+
+SOURCE = "We are launching eco-friendly notebooks for students. They use recycled paper."
+
+
+@pytest.fixture
+def fake_provider(monkeypatch):
+    monkeypatch.setattr(llm_client, "LLM_PROVIDER", "fake")
+    monkeypatch.setattr(llm_client, "_client", None)
+    monkeypatch.setattr(llm_client, "LLM_BACKOFF_BASE", 0.001)
+    client = llm_client.get_client()
+    client.llm.latency_ms = 1
+    return client
+
+
+def stream_events(**data):
+    from main import app
+
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            files = {"files": ("notes.txt", SOURCE.encode(), "text/plain")}
+            response = await client.post("/brief-with-meetings/stream", files=files,
+                                         data={"bypass_cache": "true", **data})
+            return response.headers["content-type"], response.text
+
+    content_type, body = asyncio.run(run())
+    assert content_type.startswith("text/event-stream")
+    events = []
+    for block in body.strip().split("\n\n"):
+        name, data = block.split("\n")
+        events.append((name[len("event: "):], json.loads(data[len("data: "):])))
+    return events
+
+
+def test_events_arrive_in_pipeline_order(fake_provider):
+    events = stream_events()
+    names = [name for name, _ in events]
+
+    tokens = names.count("token")
+    assert tokens > 1
+    assert names == ["files"] + ["token"] * tokens + ["brief", "meetings", "actions", "token_usage", "pdf_ready", "done"]
+    data = dict(events)
+    assert "".join(payload["text"] for name, payload in events if name == "token").strip() == data["brief"]["brief"]
+    assert data["meetings"]["meetings"] and data["pdf_ready"]["download_id"]
+
+
+def test_failure_after_start_is_an_error_event(fake_provider):
+    fake_provider.llm.error_rate = 1.0
+    fake_provider.llm.error_status = 400
+
+    events = stream_events()
+
+    assert [name for name, _ in events] == ["files", "error"]
+    assert "400" in events[1][1]["detail"]
+
+
+def test_stopping_early_closes_the_model_stream(fake_provider, monkeypatch):
+    closed = []
+    monkeypatch.setattr(fake_llm._FakeStream, "close", lambda self: closed.append(True))
+
+    pieces = stream_brief(SOURCE, use_cache=False)
+    next(pieces)
+    pieces.close()
+
+    assert closed == [True]
+
+
+def test_consumer_does_not_wait_for_a_stalled_generator(monkeypatch):
+    monkeypatch.setattr(executor, "ITERATE_STOP_TIMEOUT", 0.1)
+    closed = threading.Event()
+
+    def stalling_pieces():
+        try:
+            yield "first"
+            # The upstream stream stalls after the client has gone
+            time.sleep(0.5)
+            yield "second"
+        finally:
+            closed.set()
+
+    async def consume_one():
+        pieces = iterate_in_thread(stalling_pieces)
+        first = await pieces.__anext__()
+        start = time.perf_counter()
+        await pieces.aclose()
+        return first, time.perf_counter() - start
+
+    first, close_seconds = asyncio.run(consume_one())
+
+    assert first == "first"
+    assert close_seconds < 0.4
+    # The generator is closed in its thread once the stalled item arrives
+    assert closed.wait(2)
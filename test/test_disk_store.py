@@ -0,0 +1,27 @@
+import sys
+import os
+import time
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+
+from utils.disk_store import SizeBoundedDirectory
+
+
+def test_reads_keep_entries_from_being_evicted(tmp_path):
+    directory = SizeBoundedDirectory(str(tmp_path), ".txt", max_bytes=250)
+    for i, key in enumerate(["a", "b"]):
+        assert directory.write(key, "x" * 100) == 0
+        os.utime(directory.path(key), (time.time() - 10 + i, time.time() - 10 + i))
+
+    # "a" is older, but reading it makes "b" the least recently used
+    assert directory.read("a") == "x" * 100
+    assert directory.write("c", "x" * 100) == 1
+
+    assert directory.read("b") is None
+    assert sorted(os.listdir(tmp_path)) == ["a.txt", "c.txt"]
+
+
+def test_zero_budget_keeps_everything(tmp_path):
+    directory = SizeBoundedDirectory(str(tmp_path), ".json", max_bytes=0)
+    for key in range(5):
+        assert directory.write(str(key), "{}" * 100) == 0
+    assert len(os.listdir(tmp_path)) == 5
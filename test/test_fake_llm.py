@@ -0,0 +1,96 @@
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+os.environ.setdefault("OPENAI_API_KEY", "sk-test")
+
+import httpx
+import openai
+import pytest
+
+import utils.llm_client as llm_client
+from agents.briefer_agent import generate_brief, stream_brief
+from agents.meeting_scheduler_agent import MeetingSchedulerAgent
+from mock_team_data import INFOSYS_TEAM
+from utils.fake_llm import FakeLLM, FakeOpenAI
+
+SOURCE = "We are launching eco-friendly notebooks for students. They use recycled paper."
+
+
+@pytest.fixture
+def fake_client(monkeypatch):
+    def install(**options):
+        client = FakeOpenAI(FakeLLM(**{"latency_ms": 1, "seed": 7, **options}))
+        monkeypatch.setattr(llm_client, "_client", client)
+        monkeypatch.setattr(llm_client, "LLM_BACKOFF_BASE", 0.001)
+        return client
+
+    return install
+
+
+def test_brief_has_every_section_and_streams_the_same_text(fake_client):
+    fake_client()
+
+    brief = generate_brief(SOURCE, "Spanish", use_cache=False)
+    streamed = list(stream_brief(SOURCE, "Spanish", use_cache=False))
+
+    for section in ("Objective", "Audience", "Messaging", "Content Suggestions", "KPIs"):
+        assert f"**{section}**" in brief
+    assert "eco-friendly notebooks" in brief and "Spanish" in brief
+    assert len(streamed) > 1
+    assert "".join(streamed) == brief
+
+
+def test_scheduler_json_is_valid_for_the_team(fake_client):
+    fake_client()
+    team = INFOSYS_TEAM[:4]
+
+    meetings, actions = MeetingSchedulerAgent().schedule_meetings_fast("Launch brief", team)
+
+    # The fallback schedule is a single kickoff with no actions
+    assert len(meetings) >= 2
+    assert len(actions) == 3
+    emails = {member.email for member in team}
+    assert all(set(meeting.attendees) <= emails for meeting in meetings)
+
+
+def test_injected_errors_are_retried_or_surface(fake_client):
+    client = fake_client(error_rate=0.3)
+    responses = [llm_client.chat_completion(model="gpt-3.5-turbo", messages=[{"role": "user", "content": "Hi"}])
+                 for _ in range(10)]
+    assert all(response.choices[0].message.content for response in responses)
+    assert client.llm.errors > 0
+
+    fake_client(error_rate=1.0, error_status=503)
+    with pytest.raises(openai.InternalServerError):
+        llm_client.chat_completion(model="gpt-3.5-turbo", messages=[{"role": "user", "content": "Hi"}])
+
+
+def test_latency_follows_the_configured_distribution():
+    llm = FakeLLM(latency_ms=200, latency_sigma=0.5, seed=1)
+    latencies = sorted(llm.draw()[0] for _ in range(2000))
+
+    assert 0.18 < latencies[1000] < 0.22
+    assert latencies[1900] > 0.4
+
+    fixed = FakeLLM(latency_ms=50, latency_sigma=0, seed=1)
+    assert {round(fixed.draw()[0], 6) for _ in range(10)} == {0.05}
+
+
+def test_brief_with_meetings_runs_offline(fake_client):
+    fake_client()
+    from main import app
+
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            files = {"files": ("notes.txt", SOURCE.encode(), "text/plain")}
+            return await client.post("/brief-with-meetings", files=files, data={"bypass_cache": "true"})
+
+    response = asyncio.run(run())
+
+    assert response.status_code == 200
+    body = response.json()
+    assert "**KPIs**" in body["brief"]
+    assert len(body["meetings"]) >= 2 and body["actions"]
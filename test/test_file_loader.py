@@ -0,0 +1,73 @@
+import sys
+import os
+import io
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+os.environ.setdefault("OPENAI_API_KEY", "sk-test")
+os.environ.setdefault("PARSE_CACHE_ENABLED", "0")
+
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfgen import canvas
+
+import utils.file_loader as file_loader
+from utils.file_loader import load_pdf
+
+
+def make_pdf(page_texts):
+    buffer = io.BytesIO()
+    c = canvas.Canvas(buffer, pagesize=letter)
+    for text in page_texts:
+        if text:
+            c.drawString(72, 720, text)
+        else:
+            # A "scanned" page: drawn shapes, no text layer
+            c.rect(72, 600, 200, 100, fill=1)
+        c.showPage()
+    c.save()
+    return buffer.getvalue()
+
+
+def test_sharded_extraction_keeps_page_order(monkeypatch):
+    monkeypatch.setattr(file_loader, "PDF_SHARD_PAGES", 2)
+    pdf_bytes = make_pdf([f"Slide {i}" for i in range(1, 8)])
+
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        sharded = load_pdf(pdf_bytes, executor=pool, ocr=False)
+
+    assert sharded == load_pdf(pdf_bytes, ocr=False)
+    assert sharded.index("Slide 2") < sharded.index("Slide 7")
+    assert load_pdf(pdf_bytes, max_pages=2, ocr=False).count("--- Page") == 2
+
+
+def test_single_shard_pdf_is_extracted_in_the_pool(monkeypatch):
+    import pdfplumber
+
+    def main_process_open(*args, **kwargs):
+        raise AssertionError("pdfplumber ran in the server process")
+
+    # Spawned workers import pdfplumber afresh, without the patch
+    monkeypatch.setattr(pdfplumber, "open", main_process_open)
+    pdf_bytes = make_pdf(["Short brief", "Second page"])
+
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+        text = load_pdf(pdf_bytes, executor=pool, ocr=False)
+
+    assert "Short brief" in text and "Second page" in text
+
+
+def test_textless_pages_go_through_ocr(monkeypatch):
+    ocr_calls = []
+
+    def fake_ocr(image, **kwargs):
+        ocr_calls.append(image.size)
+        return "Signed contract text"
+
+    monkeypatch.setattr(file_loader, "ocr_image", fake_ocr)
+    pdf_bytes = make_pdf(["Cover page", None, "Appendix"])
+
+    text = load_pdf(pdf_bytes, ocr=True)
+
+    assert len(ocr_calls) == 1
+    assert "--- Page 2 ---\n\nSigned contract text" in text
+    assert text.index("Cover page") < text.index("Signed contract text") < text.index("Appendix")
@@ -0,0 +1,50 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+
+import numpy as np
+from PIL import Image, ImageDraw
+
+from utils.image_preprocess import binarize, downscale, estimate_skew, split_into_tiles
+
+
+def lined_page(width=1000, height=4000, line_every=100):
+    image = Image.new("L", (width, height), 255)
+    draw = ImageDraw.Draw(image)
+    for y in range(50, height - 50, line_every):
+        draw.rectangle((60, y, width - 60, y + 20), fill=0)
+    return image
+
+
+def test_tiles_are_cut_on_blank_rows():
+    image = lined_page()
+    tiles = split_into_tiles(image, tile_height=1000)
+
+    assert len(tiles) > 1
+    assert sum(tile.height for tile in tiles) == image.height
+    for tile in tiles[:-1]:
+        # The last row of each tile is background, not part of a text line
+        assert np.asarray(tile)[-1].min() > 128
+
+
+def test_dark_slides_become_dark_text_on_white():
+    slide = Image.new("L", (400, 200), 30)
+    ImageDraw.Draw(slide).rectangle((50, 80, 350, 110), fill=220)
+
+    binary = np.asarray(binarize(slide))
+
+    assert set(np.unique(binary)) <= {0, 255}
+    assert (binary == 255).mean() > 0.5
+
+
+def test_skew_is_detected():
+    page = lined_page(width=800, height=800, line_every=60)
+    rotated = page.rotate(-3, fillcolor=255)
+    assert abs(estimate_skew(rotated) - 3) <= 1
+
+
+def test_large_photos_are_downscaled_not_upscaled():
+    photo = Image.new("L", (6000, 4000), 255)
+    small = Image.new("L", (300, 200), 255)
+    assert downscale(photo, dpi=300).width * downscale(photo, dpi=300).height <= 12_000_000
+    assert downscale(small, dpi=72).size == (300, 200)
@@ -0,0 +1,89 @@
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+os.environ.setdefault("OPENAI_API_KEY", "sk-test")
+
+import httpx
+import openai
+import pytest
+
+import utils.llm_client as llm_client
+from utils.llm_client import make_async_client, make_client, retry_delay, with_retries, with_retries_async
+
+COMPLETION = {
+    "id": "chatcmpl-test", "object": "chat.completion", "created": 0, "model": "gpt-3.5-turbo",
+    "choices": [{"index": 0, "message": {"role": "assistant", "content": "Brief ready"}, "finish_reason": "stop"}],
+}
+
+
+def flaky_transport(statuses):
+    """
+    Answers with each status in turn, then with a completion
+    """
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        if len(calls) <= len(statuses):
+            return httpx.Response(statuses[len(calls) - 1], json={"error": {"message": "busy"}})
+        return httpx.Response(200, json=COMPLETION)
+
+    return httpx.MockTransport(handler), calls
+
+
+@pytest.fixture(autouse=True)
+def fast_backoff(monkeypatch):
+    monkeypatch.setattr(llm_client, "LLM_BACKOFF_BASE", 0.001)
+
+
+def test_retries_rate_limits_and_server_errors():
+    transport, calls = flaky_transport([429, 503])
+    client = make_client(transport)
+
+    response = with_retries(client.chat.completions.create, model="gpt-3.5-turbo", messages=[])
+
+    assert response.choices[0].message.content == "Brief ready"
+    assert len(calls) == 3
+
+
+def test_client_errors_and_exhausted_retries_raise():
+    transport, calls = flaky_transport([400])
+    with pytest.raises(openai.BadRequestError):
+        with_retries(make_client(transport).chat.completions.create, model="gpt-3.5-turbo", messages=[])
+    assert len(calls) == 1
+
+    transport, calls = flaky_transport([500] * 5)
+    with pytest.raises(openai.InternalServerError):
+        with_retries(make_client(transport).chat.completions.create, model="gpt-3.5-turbo", messages=[],
+                     max_retries=2)
+    assert len(calls) == 3
+
+
+def test_async_client_retries():
+    transport, calls = flaky_transport([429])
+
+    async def run():
+        client = make_async_client(transport)
+        try:
+            return await with_retries_async(client.chat.completions.create, model="gpt-3.5-turbo", messages=[])
+        finally:
+            await client.close()
+
+    assert asyncio.run(run()).choices[0].message.content == "Brief ready"
+    assert len(calls) == 2
+
+
+def test_backoff_is_jittered_and_honors_retry_after(monkeypatch):
+    monkeypatch.setattr(llm_client, "LLM_BACKOFF_BASE", 1.0)
+    monkeypatch.setattr(llm_client, "LLM_BACKOFF_MAX", 10.0)
+
+    delays = [retry_delay(3) for _ in range(200)]
+    assert all(0 <= delay <= 4 for delay in delays)
+    assert len(set(delays)) > 100
+    assert all(retry_delay(20) <= 10 for _ in range(50))
+
+    response = httpx.Response(429, headers={"retry-after": "2"}, request=httpx.Request("POST", "https://api"))
+    error = openai.RateLimitError("busy", response=response, body=None)
+    assert retry_delay(1, error) == 2.0
@@ -0,0 +1,85 @@
+import io
+import os
+import subprocess
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+os.environ.setdefault("OPENAI_API_KEY", "sk-test")
+
+from PIL import Image
+
+from utils.loader_registry import detect_loader, get_file_type, resolve_loader, spec_for_name
+
+
+def png_bytes():
+    buffer = io.BytesIO()
+    Image.new("RGB", (8, 8), "white").save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def mp4_bytes(brand):
+    # ftyp box followed by an empty mdat box
+    return (24).to_bytes(4, "big") + b"ftyp" + brand + b"\x00\x00\x00\x00" + brand + b"isom" + b"\x00\x00\x00\x08mdat"
+
+
+def test_content_wins_over_extension():
+    spec, mime = detect_loader("report.pdf", png_bytes())
+
+    assert spec.file_type == "image"
+    assert mime == "image/png"
+
+
+def test_extension_breaks_container_ties():
+    assert detect_loader("call.m4a", mp4_bytes(b"isom"))[0].file_type == "audio"
+    assert detect_loader("call.mp4", mp4_bytes(b"isom"))[0].file_type == "video"
+    assert detect_loader("upload", mp4_bytes(b"isom"))[0].file_type == "video"
+    assert detect_loader("upload", mp4_bytes(b"M4A "))[0].file_type == "audio"
+
+
+def test_text_formats_are_sniffed():
+    table = b"region,spend\nNorth,10\nSouth,20\n"
+
+    assert detect_loader("export", table)[0].file_type == "csv"
+    assert detect_loader("notes", b"Launch moved to May.\nBudget approved.")[0].file_type == "text"
+    assert detect_loader("ids.csv", b"id\n1\n2\n")[0].file_type == "csv"
+    # Binary content never reaches a text parser because of its name
+    assert detect_loader("data.csv", bytes(range(256)) * 4) == (None, None)
+
+
+def test_unsupported_magic_reports_mime():
+    spec, mime = detect_loader("archive.txt", b"\x1f\x8b\x08\x00" + bytes(64))
+
+    assert spec is None
+    assert mime == "application/gzip"
+
+
+def test_file_type_and_lazy_loader_share_the_table():
+    assert get_file_type("Q3 Plan.XLSX") == "excel"
+    assert get_file_type("clip.webm") == "video"
+    assert get_file_type("notes.docx") == "unknown"
+
+    loader, version = resolve_loader(spec_for_name("notes.txt"))
+    assert loader.__name__ == "load_text"
+    assert version == 1
+
+
+def test_heavy_libraries_load_on_first_use():
+    # A fresh interpreter, since other tests have already imported these
+    script = (
+        "import sys\n"
+        "import main\n"
+        "heavy = ['pandas', 'moviepy.editor', 'pytesseract', 'pdfplumber']\n"
+        "print(*[name in sys.modules for name in heavy])\n"
+        "media = ['pydub', 'numpy', 'PIL', 'tiktoken']\n"
+        "print(*[name in sys.modules for name in media])\n"
+        "from utils.loader_registry import prewarm_loaders\n"
+        "prewarm_loaders('csv')\n"
+        "print(*[name in sys.modules for name in heavy])\n"
+    )
+    backend = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend'))
+    result = subprocess.run([sys.executable, "-c", script], cwd=backend, capture_output=True, text=True,
+                            env=dict(os.environ, PREWARM_LOADERS=""))
+
+    assert result.stdout.split("\n")[:3] == [
+        "False False False False", "False False False False", "True False False False",
+    ]
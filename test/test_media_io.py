@@ -0,0 +1,73 @@
+import sys
+import os
+import io
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+os.environ.setdefault("OPENAI_API_KEY", "sk-test")
+os.environ.setdefault("PARSE_CACHE_ENABLED", "0")
+
+import numpy as np
+from moviepy.audio.AudioClip import AudioArrayClip
+from moviepy.editor import ImageSequenceClip
+from pydub.generators import Sine
+
+import utils.file_loader as file_loader
+import utils.media_io as media_io
+import utils.transcription as transcription
+from utils.media_io import decode_audio, is_streamable
+from utils.transcription_store import TranscriptionStore
+
+
+def make_video(path, seconds=2, with_audio=True):
+    frames = [np.full((64, 64, 3), 40 * i, dtype=np.uint8) for i in range(seconds * 4)]
+    clip = ImageSequenceClip(frames, fps=4)
+    if with_audio:
+        t = np.linspace(0, seconds, seconds * 44100, endpoint=False)
+        tone = (0.3 * np.sin(2 * np.pi * 440 * t)).reshape(-1, 1)
+        clip = clip.set_audio(AudioArrayClip(np.hstack([tone, tone]), fps=44100))
+    clip.write_videofile(path, codec="libx264", audio=with_audio, audio_codec="aac", verbose=False, logger=None)
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def wav_bytes(seconds=3):
+    buffer = io.BytesIO()
+    Sine(440).to_audio_segment(duration=seconds * 1000).export(buffer, format="wav")
+    return buffer.getvalue()
+
+
+def test_mp4_needs_a_path_only_when_its_index_is_at_the_end():
+    faststart = b"\x00\x00\x00\x10ftypisom\x00\x00\x02\x00" + b"\x00\x00\x00\x08moov" + b"\x00\x00\x00\x08mdat"
+    index_last = b"\x00\x00\x00\x10ftypisom\x00\x00\x02\x00" + b"\x00\x00\x00\x08mdat" + b"\x00\x00\x00\x08moov"
+    assert is_streamable(faststart)
+    assert not is_streamable(index_last)
+    assert is_streamable(wav_bytes(1))
+
+
+def test_audio_is_decoded_from_memory_and_from_video(tmp_path):
+    audio = decode_audio(bytearray(wav_bytes()))
+    assert (audio.channels, audio.frame_rate) == (1, 16000)
+    assert abs(len(audio) - 3000) < 50
+
+    video_audio = decode_audio(make_video(str(tmp_path / "clip.mp4")))
+    assert abs(len(video_audio) - 2000) < 100
+
+    assert decode_audio(make_video(str(tmp_path / "silent.mp4"), with_audio=False)) is None
+
+
+def test_large_inputs_are_memory_mapped(monkeypatch):
+    monkeypatch.setattr(media_io, "MEDIA_MMAP_BYTES", 1024)
+    audio = decode_audio(wav_bytes())
+    assert not isinstance(audio.raw_data, bytes)
+    assert abs(len(audio) - 3000) < 50
+    assert transcription.find_pauses(audio) == []
+
+
+def test_load_audio_without_temp_files(tmp_path, monkeypatch):
+    monkeypatch.setattr(transcription, "_transcriber", transcription.StubTranscriber(text="Kickoff on Monday"))
+    monkeypatch.setattr(file_loader, "get_transcription_store", lambda: TranscriptionStore(store_dir=None))
+    monkeypatch.setattr(media_io, "MEDIA_TEMP_DIR", str(tmp_path))
+
+    text = file_loader.load_audio(wav_bytes())
+
+    assert "[00:00] Kickoff on Monday" in text
+    assert list(tmp_path.iterdir()) == []
@@ -1,15 +1,12 @@
 import sys
 import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
 
-from openai import OpenAI
-from dotenv import load_dotenv
+# Uses the shared client, so LLM_PROVIDER=fake runs this without a key
+from utils.llm_client import chat_completion
 
-load_dotenv()
-
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-
-response = client.chat.completions.create(
+response = chat_completion(
     model="gpt-3.5-turbo",
     messages=[
         {"role": "user", "content": "Tell me a joke."}
@@ -0,0 +1,48 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+
+from utils.parse_cache import ParseCache
+
+
+def test_memory_and_disk_tiers(tmp_path):
+    cache = ParseCache(cache_dir=str(tmp_path), memory_items=1, disk_bytes=1024 * 1024)
+    first = ParseCache.make_key(b"brand guidelines", "load_pdf", 1)
+    second = ParseCache.make_key(b"quarterly numbers", "load_excel", 1)
+
+    assert cache.get(first) is None
+    cache.set(first, "Brand voice: friendly")
+    cache.set(second, "Rows: 10")
+
+    # first was pushed out of the one-item memory tier but is still on disk
+    assert cache.get(first) == "Brand voice: friendly"
+    stats = cache.stats()
+    assert stats["misses"] == 1
+    assert stats["disk_hits"] == 1
+
+    assert cache.get(first) == "Brand voice: friendly"
+    assert cache.stats()["memory_hits"] == 1
+
+
+def test_key_changes_with_loader_version():
+    assert ParseCache.make_key(b"x", "load_pdf", 1) != ParseCache.make_key(b"x", "load_pdf", 2)
+
+
+def test_disk_tier_evicts_to_size_budget(tmp_path):
+    cache = ParseCache(cache_dir=str(tmp_path), memory_items=1, disk_bytes=250)
+    for i in range(5):
+        cache.set(f"key{i}", "x" * 100)
+
+    total = sum(f.stat().st_size for f in tmp_path.iterdir())
+    assert total <= 250
+    assert cache.stats()["evictions"] >= 3
+
+
+def test_lookup_returns_the_key_with_the_cached_text(tmp_path):
+    cache = ParseCache(cache_dir=str(tmp_path), memory_items=4, disk_bytes=1024 * 1024)
+    key, text = cache.lookup(b"brand guidelines", "load_pdf", 1)
+    assert text is None
+    assert key == ParseCache.make_key(b"brand guidelines", "load_pdf", 1)
+
+    cache.set(key, "Brand guidelines text")
+    assert cache.lookup(b"brand guidelines", "load_pdf", 1) == (key, "Brand guidelines text")
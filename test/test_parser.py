@@ -0,0 +1,29 @@
+import sys
+import os
+import asyncio
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+
+from agents.parser_agent import parse_files
+
+
+class FakeUpload:
+    def __init__(self, filename, content):
+        self.filename = filename
+        self.size = len(content)
+        self._content = content
+        self._offset = 0
+
+    async def read(self, size=-1):
+        end = len(self._content) if size < 0 else self._offset + size
+        chunk = self._content[self._offset:end]
+        self._offset += len(chunk)
+        return chunk
+
+
+def test_parse_files_keeps_upload_order():
+    uploads = [FakeUpload(f"notes_{i}.txt", f"File number {i}".encode()) for i in range(6)]
+
+    results = asyncio.run(parse_files(uploads))
+
+    assert [r["content"] for r in results] == [f"File number {i}" for i in range(6)]
+    assert all(r["parse_seconds"] >= 0 for r in results)
@@ -0,0 +1,50 @@
+import sys
+import os
+import asyncio
+import time
+import pytest
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+
+from utils.pipeline import Stage, StageError, run_stages
+
+
+def sleeper(value, seconds):
+    async def run(results):
+        await asyncio.sleep(seconds)
+        return value(results) if callable(value) else value
+    return run
+
+
+def test_independent_stages_run_in_parallel():
+    stages = [
+        Stage("brief", sleeper("Objective: grow", 0.05)),
+        Stage("pdf", sleeper(lambda r: r["brief"] + ".pdf", 0.2), depends_on=["brief"]),
+        Stage("schedule", sleeper(lambda r: ["kickoff"], 0.2), depends_on=["brief"]),
+    ]
+
+    start = time.perf_counter()
+    results, timings = asyncio.run(run_stages(stages))
+    elapsed = time.perf_counter() - start
+
+    assert results["pdf"] == "Objective: grow.pdf"
+    assert results["schedule"] == ["kickoff"]
+    assert elapsed < 0.4
+    assert set(timings) == {"brief", "pdf", "schedule"}
+
+
+def test_timeout_uses_fallback():
+    stages = [Stage("schedule", sleeper("late", 1), depends_on=["brief"], timeout=0.05,
+                    fallback=lambda results, error: "fallback meeting")]
+
+    results, timings = asyncio.run(run_stages(stages, initial={"brief": "b"}))
+
+    assert results["schedule"] == "fallback meeting"
+    assert timings["schedule"]["status"] == "fallback"
+
+
+def test_failure_without_fallback_raises():
+    async def boom(results):
+        raise RuntimeError("renderer crashed")
+
+    with pytest.raises(StageError):
+        asyncio.run(run_stages([Stage("pdf", boom)]))
@@ -0,0 +1,148 @@
+import asyncio
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+os.environ.setdefault("OPENAI_API_KEY", "sk-test")
+
+import httpx
+import pytest
+
+import utils.llm_client as llm_client
+import utils.rate_limiter as rate_limiter
+from utils.rate_limiter import (
+    PRIORITY_BATCH, PRIORITY_INTERACTIVE, ModelLimiter, QueueTimeout, RateLimiter, parse_rate_limits,
+)
+
+
+def test_parse_rate_limits():
+    assert parse_rate_limits("gpt-3.5-turbo=3500/90000, whisper-1=50") == {
+        "gpt-3.5-turbo": (3500, 90000), "whisper-1": (50, 0),
+    }
+
+
+class ManualClock:
+    """
+    Time that only moves when a test advances it
+    """
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, limiter, seconds):
+        self.now += seconds
+        with limiter.condition:
+            limiter.condition.notify_all()
+
+
+def wait_until(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.001)
+
+
+def test_requests_per_minute_are_paced():
+    clock = ManualClock()
+    # 5 requests per second, bursts of 50
+    limiter = ModelLimiter("gpt-3.5-turbo", rpm=300, tpm=0, clock=clock)
+    for _ in range(50):
+        assert limiter.acquire() == 0
+
+    assert limiter.wait_time() == pytest.approx(0.2)
+    clock.advance(limiter, 0.1)
+    assert limiter.wait_time() == pytest.approx(0.1)
+    clock.advance(limiter, 0.1)
+    assert limiter.acquire() == 0
+    assert limiter.stats()["admitted"] == 51
+
+
+def test_tokens_per_minute_are_paced_and_settled():
+    clock = ManualClock()
+    # 100k tokens per second, bursts of 1M
+    limiter = ModelLimiter("gpt-3.5-turbo", rpm=0, tpm=6_000_000, clock=clock)
+    limiter.acquire(tokens=1_000_000)
+
+    assert limiter.wait_time(10_000) == pytest.approx(0.1)
+
+    # The real call used far fewer tokens than estimated
+    limiter.settle(estimated_tokens=500_000, actual_tokens=1_000)
+    assert limiter.wait_time(100_000) == 0
+    assert limiter.acquire(tokens=100_000) == 0
+
+
+def test_interactive_calls_jump_the_queue():
+    clock = ManualClock()
+    # 5 requests per second, bursts of 50
+    limiter = ModelLimiter("gpt-3.5-turbo", rpm=300, tpm=0, clock=clock)
+    for _ in range(50):
+        limiter.acquire()
+
+    admitted = []
+
+    def call(name, priority):
+        limiter.acquire(priority=priority)
+        admitted.append(name)
+
+    batch = [threading.Thread(target=call, args=(f"batch-{i}", PRIORITY_BATCH)) for i in range(3)]
+    for thread in batch:
+        thread.start()
+    wait_until(lambda: limiter.stats()["waiting"] == {"batch": 3})
+
+    # No budget comes back until the clock moves, so the late interactive call is queued too
+    interactive = threading.Thread(target=call, args=("brief", PRIORITY_INTERACTIVE))
+    interactive.start()
+    wait_until(lambda: limiter.stats()["queue_depth"] == 4)
+
+    for expected in range(1, 5):
+        clock.advance(limiter, 0.2)
+        wait_until(lambda: len(admitted) == expected)
+    for thread in batch + [interactive]:
+        thread.join()
+
+    assert admitted[0] == "brief"
+    assert sorted(admitted[1:]) == ["batch-0", "batch-1", "batch-2"]
+    stats = limiter.stats()
+    assert stats["queue_depth"] == 0
+    assert stats["admitted"] == 54
+    assert stats["wait_seconds"]["max"] == pytest.approx(0.8)
+
+
+def test_queue_timeout_and_async_acquire():
+    limiter = ModelLimiter("whisper-1", rpm=6, tpm=0)
+    limiter.acquire()
+
+    with pytest.raises(QueueTimeout):
+        limiter.acquire(timeout=0.05)
+    assert limiter.stats()["timeouts"] == 1
+    assert limiter.stats()["queue_depth"] == 0
+
+    fast = ModelLimiter("gpt-3.5-turbo", rpm=6000, tpm=0)
+    assert asyncio.run(fast.acquire_async()) < 0.05
+
+
+def test_chat_completion_waits_for_budget_and_settles_usage(monkeypatch):
+    completion = {
+        "id": "chatcmpl-test", "object": "chat.completion", "created": 0, "model": "gpt-3.5-turbo",
+        "choices": [{"index": 0, "message": {"role": "assistant", "content": "ok"}, "finish_reason": "stop"}],
+        "usage": {"prompt_tokens": 20, "completion_tokens": 5, "total_tokens": 25},
+    }
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, json=completion))
+    limiter = RateLimiter(limits={"gpt-3.5-turbo": (6000, 600_000)})
+    monkeypatch.setattr(llm_client, "_client", llm_client.make_client(transport))
+    monkeypatch.setattr(rate_limiter, "_rate_limiter", limiter)
+
+    messages = [{"role": "user", "content": "Launch plan"}]
+    response = llm_client.chat_completion(model="gpt-3.5-turbo", messages=messages, max_tokens=500,
+                                          priority=PRIORITY_INTERACTIVE)
+
+    assert response.choices[0].message.content == "ok"
+    bucket = limiter.for_model("gpt-3.5-turbo").tokens
+    # Charged the estimate up front, then refunded down to the real 25 tokens
+    assert bucket.capacity - bucket.level < 30
+    assert limiter.stats()["gpt-3.5-turbo"]["admitted"] == 1
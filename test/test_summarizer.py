@@ -0,0 +1,66 @@
+import sys
+import os
+import asyncio
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+os.environ.setdefault("OPENAI_API_KEY", "sk-test")
+
+import agents.summarizer_agent as summarizer
+from agents.summarizer_agent import condense_for_brief, prepare_brief_input, split_into_chunks
+from utils.brief_cache import MemoryBriefCache
+from utils.token_budget import count_tokens
+
+
+def test_chunks_respect_token_budget_and_order():
+    text = "\n".join(f"Row {i}: revenue grew in region {i % 7}" for i in range(2000))
+    chunks = split_into_chunks(text, max_tokens=500)
+
+    assert len(chunks) > 1
+    assert all(count_tokens(chunk) <= 520 for chunk in chunks)
+    assert "\n".join(chunks) == text
+
+
+def test_condense_summarizes_long_input(monkeypatch):
+    calls = []
+
+    def fake_summarize(chunk, index, total, language="English"):
+        calls.append(index)
+        return f"summary {index}/{total}"
+
+    monkeypatch.setattr(summarizer, "summarize_chunk", fake_summarize)
+    text = "x" * 100_000
+
+    condensed = asyncio.run(condense_for_brief(text, token_limit=3000))
+
+    assert condensed.startswith("summary 1/")
+    assert count_tokens(condensed) <= 3000
+    assert sorted(calls) == list(range(1, len(calls) + 1))
+
+
+def test_short_input_passes_through():
+    assert asyncio.run(condense_for_brief("Launch eco notebooks", token_limit=3000)) == "Launch eco notebooks"
+
+
+def test_resubmitted_long_input_reuses_the_condensed_text(monkeypatch):
+    calls = []
+
+    def fake_summarize(chunk, index, total, language="English"):
+        calls.append(index)
+        # Sampled summaries differ from run to run
+        return f"summary {index}/{total} run {len(calls)}"
+
+    monkeypatch.setattr(summarizer, "summarize_chunk", fake_summarize)
+    cache = MemoryBriefCache()
+    monkeypatch.setattr(summarizer, "get_brief_cache", lambda: cache)
+    text = "x" * 100_000
+
+    first, first_report = asyncio.run(prepare_brief_input(text, "Spanish"))
+    summarized = len(calls)
+    second, second_report = asyncio.run(prepare_brief_input(text, "Spanish"))
+
+    assert first_report["condensed"]
+    assert (second, second_report) == (first, first_report)
+    assert len(calls) == summarized
+
+    refreshed, _ = asyncio.run(prepare_brief_input(text, "Spanish", use_cache=False))
+    assert refreshed != first
+    assert asyncio.run(prepare_brief_input(text, "Spanish"))[0] == refreshed
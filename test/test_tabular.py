@@ -0,0 +1,158 @@
+import sys
+import os
+import io
+from functools import partial
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+os.environ.setdefault("OPENAI_API_KEY", "sk-test")
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import utils.file_loader as file_loader
+import utils.tabular as tabular
+from utils.tabular import TableSummary, profile_header, profile_lines, summarize_csv_stream, summarize_excel_stream
+
+
+def full_read_csv(file_bytes):
+    """
+    load_csv as it was before streaming: the whole file in one DataFrame
+    """
+    df = pd.read_csv(io.StringIO(file_bytes.decode('utf-8')))
+    text_content = ["CSV Data Summary:", f"Rows: {len(df)}, Columns: {len(df.columns)}",
+                    f"Column Names: {', '.join(df.columns.tolist())}", "",
+                    "Sample Data (first 10 rows):", df.head(10).to_string(index=False)]
+    numeric_cols = df.select_dtypes(include=['number']).columns
+    if len(numeric_cols) > 0:
+        text_content += ["", "Numeric Column Summary:"]
+        for col in numeric_cols:
+            stats = df[col].describe()
+            text_content.append(f"{col}: Mean={stats['mean']:.2f}, Min={stats['min']:.2f}, Max={stats['max']:.2f}")
+    return "\n".join(text_content)
+
+
+def full_read_excel(file_bytes):
+    excel_data = pd.read_excel(io.BytesIO(file_bytes), sheet_name=None)
+    text_content = ["Excel File Summary:", f"Number of sheets: {len(excel_data)}", ""]
+    for sheet_name, df in excel_data.items():
+        text_content += [f"=== Sheet: {sheet_name} ===", f"Rows: {len(df)}, Columns: {len(df.columns)}",
+                         f"Column Names: {', '.join(df.columns.astype(str).tolist())}", "",
+                         "Sample Data (first 5 rows):", df.head(5).to_string(index=False)]
+        numeric_cols = df.select_dtypes(include=['number']).columns
+        if len(numeric_cols) > 0:
+            text_content += ["", "Numeric Summary:"]
+            for col in numeric_cols:
+                if not df[col].isna().all():
+                    stats = df[col].describe()
+                    text_content.append(f"{col}: Mean={stats['mean']:.2f}, Min={stats['min']:.2f}, Max={stats['max']:.2f}")
+        text_content.append("")
+    return "\n".join(text_content)
+
+
+def without_stats(text):
+    """
+    Drop the per-column statistics sections, which the profiler replaced
+    """
+    kept = []
+    skipping = False
+    for line in text.split("\n"):
+        if line.startswith(("Numeric Summary:", "Numeric Column Summary:", "Column Profile")):
+            skipping = True
+            kept.pop()
+            continue
+        if skipping and line == "":
+            skipping = False
+        if not skipping:
+            kept.append(line)
+    return "\n".join(kept)
+
+
+def campaign_frame(rows=60):
+    rng = np.random.default_rng(7)
+    frame = pd.DataFrame({
+        "region": rng.choice(["North", "South", "East"], rows),
+        "spend": rng.integers(100, 5000, rows),
+        "ctr": rng.random(rows).round(4),
+        "launched": rng.choice([True, False], rows),
+        # Integers until a gap late in the file, which makes the column float
+        "leads": rng.integers(0, 50, rows).astype(object),
+        # Numbers until text shows up in a later chunk
+        "code": [f"{i}.50" for i in range(rows)],
+        "empty": [None] * rows,
+    })
+    frame.loc[rows - 3, "leads"] = None
+    frame.loc[rows - 2, "code"] = "tbd"
+    return frame
+
+
+CSV_CASES = {
+    "mixed_types": campaign_frame().to_csv(index=False).encode("utf-8"),
+    "header_only": b"a,b,c\n",
+    "single_chunk": b"x,y\n1,2\n3,4.5\n",
+}
+
+
+@pytest.mark.parametrize("case", sorted(CSV_CASES))
+def test_csv_summary_matches_full_read(case, monkeypatch):
+    file_bytes = CSV_CASES[case]
+    monkeypatch.setattr(tabular, "summarize_csv_stream", partial(summarize_csv_stream, chunk_rows=7))
+    assert without_stats(file_loader.load_csv(bytearray(file_bytes))) == without_stats(full_read_csv(file_bytes))
+
+
+def test_excel_summary_matches_full_read(monkeypatch):
+    buffer = io.BytesIO()
+    with pd.ExcelWriter(buffer, engine="openpyxl") as writer:
+        campaign_frame().to_excel(writer, sheet_name="Campaigns", index=False)
+        pd.DataFrame({"owner": ["Ana", None, "Raj"], "budget": [1.5, 2, None]}).to_excel(
+            writer, sheet_name="Budget", index=False)
+        pd.DataFrame().to_excel(writer, sheet_name="Blank", index=False)
+    file_bytes = buffer.getvalue()
+
+    monkeypatch.setattr(tabular, "summarize_excel_stream", partial(summarize_excel_stream, chunk_rows=7))
+    assert without_stats(file_loader.load_excel(file_bytes)) == without_stats(full_read_excel(file_bytes))
+
+
+def test_bad_excel_reports_an_error_instead_of_none():
+    assert file_loader.load_excel(b"not a workbook").startswith("Error processing Excel:")
+
+
+def test_running_stats_match_pandas():
+    frame = campaign_frame(500)
+    summary, _ = summarize_csv_stream(frame.to_csv(index=False).encode("utf-8"), chunk_rows=64)
+    assert summary.rows == 500
+    count, mean, minimum, maximum = summary.describe("spend")
+    assert (count, minimum, maximum) == (500, frame["spend"].min(), frame["spend"].max())
+    assert mean == pytest.approx(frame["spend"].mean())
+    assert "code" not in summary.numeric_columns()
+
+
+def test_profile_covers_every_column_type():
+    frame = campaign_frame(300)
+    frame["day"] = pd.date_range("2024-01-01", periods=300).astype(str)
+    summary, _ = summarize_csv_stream(frame.to_csv(index=False).encode("utf-8"), chunk_rows=64)
+
+    lines = {line.split(" ")[0].rstrip(":"): line for line in profile_lines(summary)}
+
+    assert lines["spend"].startswith("spend (number): mean ")
+    assert "median" in lines["spend"] and "p75" in lines["spend"]
+    assert lines["region"].startswith("region (text): 3 unique, top: ")
+    assert lines["launched"].endswith("% true")
+    assert "<1% null" in lines["leads"]
+    assert lines["day"] == "day (date): 2024-01-01 to 2024-10-26"
+    assert lines["empty"] == "empty: empty"
+    assert profile_header(summary) == "Column Profile:"
+
+
+def test_tall_and_wide_tables_are_sampled():
+    summary = TableSummary(sample_size=100, max_columns=5)
+    rng = np.random.default_rng(1)
+    for _ in range(20):
+        summary.add(pd.DataFrame(rng.integers(0, 1000, (500, 8)), columns=[f"c{i}" for i in range(8)]))
+
+    assert summary.rows == 10_000
+    assert len(summary.sample) == 100
+    assert "100 sampled rows" in profile_header(summary)
+    lines = profile_lines(summary)
+    assert len(lines) == 6 and lines[-1] == "... 3 more columns not profiled"
+    # Exact statistics still cover every row
+    assert summary.describe("c0")[0] == 10_000
@@ -0,0 +1,53 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+
+from utils.token_budget import count_tokens, fit_to_budget
+
+
+def make_csv_summary(rows):
+    lines = [
+        "--- File: sales.csv ---",
+        "CSV Data Summary:",
+        f"Rows: {rows}, Columns: 3",
+        "Column Names: region, units, revenue",
+        "Sample Data (first 10 rows):",
+        "region units revenue",
+    ]
+    lines += [f"north {i} {i * 10}.0" for i in range(rows)]
+    lines += ["Numeric Column Summary:", "units: Mean=4.50, Min=0.00, Max=9.00"]
+    return "\n".join(lines)
+
+
+def test_text_within_budget_is_untouched():
+    text = make_csv_summary(3)
+    trimmed, report = fit_to_budget(text, 10_000)
+    assert trimmed == text
+    assert report["sections_dropped"] == 0
+
+
+def test_sample_tables_go_first():
+    text = make_csv_summary(400) + "\n--- File: brief.txt ---\nLaunch eco notebooks for students"
+    budget = count_tokens(text) // 4
+
+    trimmed, report = fit_to_budget(text, budget)
+
+    assert report["tokens_after"] <= budget
+    assert "Launch eco notebooks for students" in trimmed
+    assert "Numeric Column Summary:" in trimmed
+    assert "north 399" not in trimmed
+
+
+def test_non_ascii_text_is_not_undercounted():
+    assert count_tokens("市场营销活动简报" * 10) >= 40
+
+
+def test_counting_does_not_wait_for_a_tokenizer_being_loaded(monkeypatch):
+    from utils import token_budget
+    monkeypatch.setattr(token_budget, "_encodings", {})
+
+    with token_budget._encodings_lock:
+        # Another thread holds the lock while it loads; counting falls back to the estimate
+        assert token_budget._get_encoding("gpt-3.5-turbo") is None
+        assert count_tokens("creative brief " * 10) > 0
+    assert "gpt-3.5-turbo" not in token_budget._encodings
@@ -0,0 +1,137 @@
+import sys
+import os
+import threading
+import time
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+
+from pydub import AudioSegment
+from pydub.generators import Sine
+
+from utils.transcription import StubTranscriber, find_pauses, plan_segments, transcribe_audio
+
+
+def speech_with_pauses(parts_ms, pause_ms=800):
+    audio = AudioSegment.silent(duration=0, frame_rate=16000)
+    for i, length in enumerate(parts_ms):
+        if i:
+            audio += AudioSegment.silent(duration=pause_ms, frame_rate=16000)
+        audio += Sine(440).to_audio_segment(duration=length).set_frame_rate(16000)
+    return audio.set_channels(1)
+
+
+def test_pauses_are_found_between_tones():
+    audio = speech_with_pauses([2000, 2000, 2000])
+    pauses = find_pauses(audio)
+    assert len(pauses) == 2
+    assert abs(pauses[0][0] - 2000) <= 40 and abs(pauses[0][1] - 2800) <= 40
+
+
+def test_segments_are_cut_inside_pauses_and_bounded():
+    pauses = [(9000, 10000), (14000, 15000), (29000, 30000)]
+    segments = plan_segments(40000, pauses, max_ms=20000)
+
+    assert segments == [(0, 14500), (14500, 29500), (29500, 40000)]
+    # No pause before the limit: hard cut
+    assert plan_segments(25000, [], max_ms=10000) == [(0, 10000), (10000, 20000), (20000, 25000)]
+
+
+class CountingTranscriber(StubTranscriber):
+    def __init__(self):
+        super().__init__(delay=0.1)
+        self.active = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+        self.calls = 0
+
+    def transcribe(self, audio_file):
+        with self.lock:
+            self.active += 1
+            self.calls += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(self.delay)
+        with self.lock:
+            self.active -= 1
+        return f"words from {len(audio_file.getvalue())} bytes"
+
+
+def test_segments_are_transcribed_concurrently_with_timestamps():
+    audio = speech_with_pauses([2500] * 6)
+    transcriber = CountingTranscriber()
+
+    record = transcribe_audio(audio, transcriber=transcriber, concurrency=2, segment_seconds=3)
+
+    assert transcriber.calls == len(record["segments"]) >= 6
+    assert transcriber.peak == 2
+    starts = [segment["start"] for segment in record["segments"]]
+    assert starts == sorted(starts) and starts[0] == 0
+    assert all(round(segment["end"] - segment["start"], 3) <= 3 for segment in record["segments"])
+    assert abs(record["duration"] - 19.0) < 0.1
+
+
+def test_compressed_segments_are_smaller_than_wav():
+    audio = speech_with_pauses([5000])
+    wav_bytes = len(audio.raw_data)
+    record_sizes = []
+
+    class SizeTranscriber(StubTranscriber):
+        def transcribe(self, audio_file):
+            record_sizes.append(len(audio_file.getvalue()))
+            return "hello"
+
+    record = transcribe_audio(audio, transcriber=SizeTranscriber())
+    assert record["text"] == "hello"
+    assert record_sizes[0] < wav_bytes / 4
+
+
+def test_concurrent_calls_are_batched():
+    from utils.transcription import MicroBatcher
+
+    batches = []
+
+    def process(items):
+        batches.append(list(items))
+        return [item.upper() for item in items]
+
+    batcher = MicroBatcher(process, max_batch=4, max_wait=0.2)
+    results = {}
+    threads = [threading.Thread(target=lambda word=word: results.update({word: batcher.submit(word)}))
+               for word in ["a", "b", "c", "d", "e"]]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert results == {"a": "A", "b": "B", "c": "C", "d": "D", "e": "E"}
+    assert sorted(len(batch) for batch in batches) == [1, 4]
+
+
+def test_local_batch_results_go_back_to_their_recordings():
+    from types import SimpleNamespace
+    import numpy as np
+    from utils.transcription import BATCH_GAP_SECONDS, SAMPLE_RATE, LocalWhisperTranscriber
+
+    recordings = {"a.ogg": 3.0, "b.ogg": 1.5, "c.ogg": 4.0}
+
+    class FakePipeline:
+        def transcribe(self, audio, batch_size):
+            # One decoded segment in the middle of each recording
+            starts = [0.0, 3.0 + BATCH_GAP_SECONDS, 4.5 + 2 * BATCH_GAP_SECONDS]
+            return [SimpleNamespace(start=start + 0.5, text=f" words {i} ") for i, start in enumerate(starts)], None
+
+    transcriber = LocalWhisperTranscriber.__new__(LocalWhisperTranscriber)
+    transcriber.batch_size = 8
+    transcriber.pipeline = FakePipeline()
+    transcriber._decode_audio = lambda path, sampling_rate: np.zeros(int(recordings[path] * SAMPLE_RATE),
+                                                                     dtype=np.float32)
+
+    assert transcriber._transcribe_batch(list(recordings)) == ["words 0", "words 1", "words 2"]
+
+
+def test_loader_versions_follow_the_transcriber():
+    from utils.file_loader import LOADER_VERSIONS
+    from utils.transcription import transcriber_name
+
+    names = {transcriber_name(backend) for backend in ["openai", "local", "stub"]}
+    assert len(names) == 3
+    assert transcriber_name() in LOADER_VERSIONS["load_audio"]
+    assert transcriber_name() in str(LOADER_VERSIONS["load_video"])
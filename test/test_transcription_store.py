@@ -0,0 +1,79 @@
+import sys
+import os
+import threading
+import time
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+
+from utils.transcription_store import TranscriptionStore
+
+
+def test_concurrent_requests_share_one_transcription(tmp_path):
+    store = TranscriptionStore(store_dir=str(tmp_path))
+    key = store.make_key(b"same recording", "whisper-1")
+    calls = []
+
+    def transcribe():
+        calls.append(1)
+        time.sleep(0.2)
+        return {"text": "hello team", "duration": 12.5}
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(store.get_or_transcribe(key, transcribe)))
+               for _ in range(5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+    assert results == [{"text": "hello team", "duration": 12.5}] * 5
+    assert store.stats()["deduplicated"] == 4
+
+
+def test_transcript_survives_restart(tmp_path):
+    key = TranscriptionStore.make_key(b"call", "whisper-1")
+    TranscriptionStore(store_dir=str(tmp_path)).get_or_transcribe(key, lambda: {"text": "hi", "duration": 3.0})
+
+    reloaded = TranscriptionStore(store_dir=str(tmp_path))
+    record = reloaded.get_or_transcribe(key, lambda: {"text": "never called", "duration": 0})
+    assert record == {"text": "hi", "duration": 3.0}
+
+
+def test_disk_read_does_not_hold_the_store_lock(tmp_path, monkeypatch):
+    store = TranscriptionStore(store_dir=str(tmp_path))
+    slow_key = store.make_key(b"slow disk", "whisper-1")
+    store._write(slow_key, {"text": "stored", "duration": 1.0})
+    cached_key = store.make_key(b"in memory", "whisper-1")
+    store.get_or_transcribe(cached_key, lambda: {"text": "cached", "duration": 2.0})
+
+    read = store._read
+    reading = threading.Event()
+
+    def slow_read(key):
+        reading.set()
+        time.sleep(0.3)
+        return read(key)
+
+    monkeypatch.setattr(store, "_read", slow_read)
+    slow = threading.Thread(target=store.get_or_transcribe, args=(slow_key, lambda: None))
+    slow.start()
+    reading.wait()
+
+    start = time.perf_counter()
+    assert store.get_or_transcribe(cached_key, lambda: None)["text"] == "cached"
+    assert time.perf_counter() - start < 0.1
+    slow.join()
+    assert store.stats()["hits"] == 2
+
+
+def test_disk_tier_evicts_least_recently_used(tmp_path):
+    store = TranscriptionStore(store_dir=str(tmp_path), memory_items=0, disk_bytes=250)
+    keys = [store.make_key(f"recording {i}".encode(), "whisper-1") for i in range(3)]
+    for i, key in enumerate(keys):
+        store.get_or_transcribe(key, lambda: {"text": "x" * 80, "duration": float(i)})
+        # mtimes order the entries for eviction
+        os.utime(store._path(key), (time.time() + i, time.time() + i))
+
+    assert not os.path.exists(store._path(keys[0]))
+    assert os.path.exists(store._path(keys[2]))
+    assert store.stats()["evictions"] == 1
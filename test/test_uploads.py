@@ -0,0 +1,56 @@
+import sys
+import os
+import asyncio
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+os.environ.setdefault("OPENAI_API_KEY", "sk-test")
+
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+import main
+from agents.parser_agent import parse_files
+from utils.uploads import MAX_FILE_SIZE
+
+from test_parser import FakeUpload
+
+OVER_FILE_LIMIT = MAX_FILE_SIZE + 1024 * 1024
+
+
+def test_parse_rejects_files_over_the_single_file_limit():
+    client = TestClient(main.app)
+    response = client.post(
+        "/parse",
+        files={"file": ("notes.txt", b"a" * OVER_FILE_LIMIT, "text/plain")},
+        headers={"Origin": "http://localhost:3000"},
+    )
+
+    assert response.status_code == 413
+    # CORS wraps the size limit, so the browser can read the rejection
+    assert response.headers["access-control-allow-origin"] == "http://localhost:3000"
+
+
+def test_parse_files_accepts_files_over_the_single_file_limit():
+    upload = FakeUpload("recording.txt", b"a" * OVER_FILE_LIMIT)
+
+    results = asyncio.run(parse_files([upload]))
+
+    assert results[0]["success"]
+    assert len(results[0]["content"]) == OVER_FILE_LIMIT
+
+
+def test_multi_file_endpoint_is_not_held_to_the_single_file_limit(monkeypatch):
+    received = []
+
+    async def fake_combine(files):
+        received.append(len(await files[0].read()))
+        raise HTTPException(400, "stop after upload")
+
+    monkeypatch.setattr(main, "combine_uploaded_files", fake_combine)
+    client = TestClient(main.app)
+    response = client.post(
+        "/brief-with-meetings",
+        files={"files": ("recording.mp4", b"\0" * OVER_FILE_LIMIT, "video/mp4")},
+    )
+
+    assert response.status_code == 400
+    assert received == [OVER_FILE_LIMIT]
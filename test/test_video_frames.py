@@ -0,0 +1,107 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+os.environ.setdefault("OPENAI_API_KEY", "sk-test")
+os.environ.setdefault("PARSE_CACHE_ENABLED", "0")
+
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from moviepy.editor import ImageSequenceClip
+from PIL import Image, ImageDraw
+
+import utils.file_loader as file_loader
+import utils.video_frames as video_frames
+from utils.video_frames import dhash, hamming, merge_timeline, sample_frames, unique_frames
+
+
+def slide(label, shade):
+    image = Image.new("RGB", (320, 240), (shade, shade, shade))
+    draw = ImageDraw.Draw(image)
+    draw.rectangle((20 + label * 40, 40, 140 + label * 40, 200), fill=(255 - shade, 40 * label, 90))
+    return image
+
+
+def make_video(path, slides, seconds_each=2, fps=4):
+    frames = [np.asarray(image) for image in slides for _ in range(seconds_each * fps)]
+    ImageSequenceClip(frames, fps=fps).write_videofile(path, codec="libx264", audio=False,
+                                                       verbose=False, logger=None)
+
+
+def test_near_identical_frames_share_a_hash():
+    base = slide(1, 200)
+    noisy = Image.fromarray(np.clip(np.asarray(base, dtype=np.int16) + 3, 0, 255).astype(np.uint8))
+    assert hamming(dhash(base), dhash(noisy)) <= 6
+    assert hamming(dhash(base), dhash(slide(3, 40))) > 6
+
+
+def test_scene_sampling_keeps_each_slide_once(tmp_path):
+    path = str(tmp_path / "talk.mp4")
+    make_video(path, [slide(0, 220), slide(2, 60), slide(0, 220), slide(4, 140)])
+
+    frames = unique_frames(sample_frames(path, mode="scene"))
+
+    assert [round(seconds) for seconds, _ in frames] == [0, 2, 6]
+
+
+def test_interval_sampling_dedups_while_decoding(tmp_path, monkeypatch):
+    path = str(tmp_path / "talk.mp4")
+    make_video(path, [slide(0, 220), slide(2, 60), slide(0, 220), slide(4, 140)])
+    decoded = []
+    candidates = video_frames.candidate_frames
+
+    def counting_candidates(*args):
+        for frame in candidates(*args):
+            decoded.append(frame[0])
+            yield frame
+
+    monkeypatch.setattr(video_frames, "candidate_frames", counting_candidates)
+
+    frames = sample_frames(path, mode="interval", interval=0.5)
+    assert [round(seconds) for seconds, _ in frames] == [0, 2, 6]
+
+    decoded.clear()
+    frames = sample_frames(path, mode="interval", interval=0.5, max_frames=2)
+    assert [round(seconds) for seconds, _ in frames] == [0, 2]
+    # Decoding stopped at the second distinct slide instead of reading the whole video
+    assert max(decoded) == 2
+
+
+def test_frame_ocr_runs_in_the_executor(tmp_path, monkeypatch):
+    path = str(tmp_path / "talk.mp4")
+    make_video(path, [slide(0, 220), slide(2, 60)])
+    submitted = []
+
+    class RecordingExecutor(ThreadPoolExecutor):
+        def submit(self, fn, *args, **kwargs):
+            submitted.append(fn.__name__)
+            return super().submit(fn, *args, **kwargs)
+
+    monkeypatch.setattr(file_loader, "ocr_image", lambda image, **kwargs: "Agenda")
+    with RecordingExecutor(max_workers=2) as executor:
+        slides = file_loader._ocr_video_frames(path, executor)
+
+    assert submitted == ["ocr_video_frame", "ocr_video_frame"]
+    assert slides == [{"start": 0.0, "text": "Agenda"}]
+
+
+def test_slides_are_merged_into_the_timeline(tmp_path, monkeypatch):
+    path = str(tmp_path / "talk.mp4")
+    make_video(path, [slide(0, 220), slide(2, 60)])
+    with open(path, "rb") as f:
+        video_bytes = f.read()
+
+    texts = iter(["Q3 launch plan", "Budget: $40k"])
+    monkeypatch.setattr(file_loader, "VIDEO_FRAME_OCR", True)
+    monkeypatch.setattr(file_loader, "ocr_image", lambda image, **kwargs: next(texts))
+
+    text = file_loader.load_video(video_bytes)
+
+    assert "Timeline:" in text
+    assert "[00:00] Slide: Q3 launch plan\n[00:02] Slide: Budget: $40k" in text
+
+
+def test_speech_comes_before_slides_at_the_same_time():
+    timeline = merge_timeline([{"start": 0, "text": "Welcome"}], [{"start": 0, "text": "Agenda"},
+                                                                  {"start": 75, "text": "Goals"}])
+    assert timeline == "[00:00] Speech: Welcome\n[00:00] Slide: Agenda\n[01:15] Slide: Goals"